@@ -0,0 +1,156 @@
+"""
+Ilija Full_Autonomy_Edition – Admission Control
+================================================
+Begrenzt gleichzeitige Chat-Anfragen an den Kernel.
+
+Der Web-Server läuft multi-threaded, der Kernel ist es nicht:
+chat_history, state und recent_errors werden ohne Lock verändert – zwei
+Tabs derselben Session liefen gegeneinander. Und beliebig viele Sessions
+konnten den LLM-Provider gleichzeitig belasten.
+
+Zwei Stufen:
+  1. Pro Session ein Lock (Kernel.chat_lock) – Anfragen derselben Session
+     laufen nacheinander; wer länger als session_wait wartet, bekommt 429.
+  2. Global: höchstens max_in_flight Kernel-Aufrufe gleichzeitig, dahinter
+     eine Warteschlange von max_queue Plätzen (höchstens queue_wait Sekunden).
+     Ist beides voll → Saturated mit geschätztem Retry-After.
+
+Die Schätzung nutzt einen gleitenden Mittelwert der Bearbeitungszeit:
+  retry_after ≈ Ø-Dauer · (Wartende + 1) / max_in_flight
+
+Goal-Jobs laufen über denselben Controller: AdmittedProvider belegt pro
+LLM-Aufruf einen globalen Slot (ohne Session-Lock), check() lehnt neue
+Jobs ab, solange Slots und Warteschlange voll sind.
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+MAX_IN_FLIGHT = 4
+MAX_QUEUE     = 16
+QUEUE_WAIT    = 30.0    # Sekunden in der globalen Warteschlange
+SESSION_WAIT  = 60.0    # Sekunden Warten auf die eigene Session
+EWMA_ALPHA    = 0.2
+
+
+class Saturated(RuntimeError):
+    """Anfrage abgelehnt – retry_after in Sekunden für den Retry-After-Header."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Globale Obergrenze für gleichzeitige Kernel-Aufrufe mit begrenzter Warteschlange."""
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, max_queue: int = MAX_QUEUE,
+                 queue_wait: float = QUEUE_WAIT, session_wait: float = SESSION_WAIT):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue     = max(0, max_queue)
+        self.queue_wait    = queue_wait
+        self.session_wait  = session_wait
+        self.in_flight     = 0
+        self.waiting       = 0
+        self.rejected      = 0
+        self.avg_seconds   = 2.0   # Startwert bis echte Messungen vorliegen
+        self._cond = threading.Condition()
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.avg_seconds * (self.waiting + 1) / self.max_in_flight))
+
+    def _reject(self, message: str) -> Saturated:
+        with self._cond:
+            self.rejected += 1
+            return Saturated(message, self.retry_after())
+
+    @contextmanager
+    def admit(self, session_lock: Optional[threading.Lock] = None) -> Iterator[None]:
+        """
+        Session-Lock (falls angegeben) und einen globalen Slot belegen.
+        Raises: Saturated
+        """
+        if session_lock is not None and not session_lock.acquire(timeout=self.session_wait):
+            raise self._reject("Diese Session bearbeitet noch eine Anfrage")
+        try:
+            with self._cond:
+                if self.in_flight >= self.max_in_flight:
+                    if self.waiting >= self.max_queue:
+                        self.rejected += 1
+                        raise Saturated("Server ausgelastet", self.retry_after())
+                    self.waiting += 1
+                    try:
+                        admitted = self._cond.wait_for(lambda: self.in_flight < self.max_in_flight,
+                                                       self.queue_wait)
+                    finally:
+                        self.waiting -= 1
+                    if not admitted:
+                        self.rejected += 1
+                        raise Saturated("Server ausgelastet", self.retry_after())
+                self.in_flight += 1
+
+            started = time.time()
+            try:
+                yield
+            finally:
+                with self._cond:
+                    self.in_flight   -= 1
+                    self.avg_seconds += EWMA_ALPHA * (time.time() - started - self.avg_seconds)
+                    self._cond.notify()
+        finally:
+            if session_lock is not None:
+                session_lock.release()
+
+    def check(self) -> None:
+        """Vorab-Prüfung ohne zu warten. Raises: Saturated wenn Slots und Warteschlange voll sind."""
+        with self._cond:
+            if self.in_flight >= self.max_in_flight and self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise Saturated("Server ausgelastet", self.retry_after())
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight":     self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "waiting":       self.waiting,
+            "max_queue":     self.max_queue,
+            "rejected":      self.rejected,
+            "avg_seconds":   round(self.avg_seconds, 2),
+        }
+
+
+class AdmittedProvider:
+    """Hüllt einen Provider ein, sodass jeder chat()-Aufruf einen globalen Slot belegt."""
+
+    def __init__(self, provider, admission: AdmissionController):
+        self._provider = provider
+        self.admission = admission
+
+    def __getattr__(self, name):
+        return getattr(self._provider, name)
+
+    def chat(self, messages: List[Dict], force_json: bool = False) -> str:
+        with self.admission.admit():
+            return self._provider.chat(messages, force_json=force_json)
+
+
+# ── Singleton ──────────────────────────────────────────────────
+
+_admission: Optional[AdmissionController] = None
+_admission_lock = threading.Lock()
+
+def get_admission() -> AdmissionController:
+    """Prozessweiter Controller (CHAT_MAX_IN_FLIGHT, CHAT_MAX_QUEUE) für Chat und Goal-Jobs."""
+    global _admission
+    if _admission is None:
+        with _admission_lock:
+            if _admission is None:
+                _admission = AdmissionController(
+                    max_in_flight=int(os.getenv("CHAT_MAX_IN_FLIGHT", str(MAX_IN_FLIGHT))),
+                    max_queue=int(os.getenv("CHAT_MAX_QUEUE", str(MAX_QUEUE))),
+                )
+    return _admission
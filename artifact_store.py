@@ -0,0 +1,165 @@
+"""
+Ilija Full_Autonomy_Edition – Artifact Store
+=============================================
+Inhaltsadressierte Ablage für große Skill-Ergebnisse.
+
+Statt das komplette Ergebnis eines Skills (z.B. eine gescrapte Webseite)
+in session.history, Evaluator-Prompts und API-Antworten mitzuschleppen,
+wird es hier einmalig komprimiert auf Platte abgelegt.
+Die History enthält nur noch einen Handle plus eine kurze Vorschau.
+
+Eigenschaften:
+  - Adressiert über SHA-256 des Inhalts → identische Ergebnisse werden
+    nur einmal gespeichert (Deduplizierung)
+  - zlib-komprimiert
+  - Atomares Schreiben (tmp-Datei + os.replace)
+  - Kleine Ergebnisse bleiben inline (kein Handle)
+
+Struktur:
+  data/artifacts/
+    3f/3fa4c1...e9.z
+    a0/a07b22...41.z
+
+Verwendung:
+  from artifact_store import get_artifact_store
+  store = get_artifact_store()
+
+  preview, handle = store.put_result(text)   # handle ist None wenn inline
+  full = store.load(preview, handle)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR  = "data/artifacts"
+INLINE_LIMIT  = 500    # Ergebnisse bis zu dieser Länge bleiben inline
+PREVIEW_CHARS = 300    # Länge der Vorschau in History/API
+
+
+class ArtifactStore:
+    """Inhaltsadressierte, komprimierte Ablage für Skill-Ergebnisse."""
+
+    def __init__(self, root: str = ARTIFACT_DIR,
+                 inline_limit: int = INLINE_LIMIT,
+                 preview_chars: int = PREVIEW_CHARS):
+        self.root          = root
+        self.inline_limit  = inline_limit
+        self.preview_chars = preview_chars
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, handle: str) -> str:
+        return os.path.join(self.root, handle[:2], f"{handle}.z")
+
+    @staticmethod
+    def is_handle(value: Optional[str]) -> bool:
+        """Prüft ob ein String wie ein gültiger Handle aussieht."""
+        if not value or len(value) != 64:
+            return False
+        try:
+            int(value, 16)
+            return True
+        except ValueError:
+            return False
+
+    def put(self, text: str) -> str:
+        """
+        Legt einen Text ab und gibt seinen Handle zurück.
+        Existiert der Inhalt bereits, wird nichts geschrieben.
+        """
+        data   = text.encode("utf-8")
+        handle = hashlib.sha256(data).hexdigest()
+        path   = self._path(handle)
+
+        if os.path.exists(path):
+            return handle
+
+        with self._lock:
+            if os.path.exists(path):
+                return handle
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(zlib.compress(data, 6))
+                os.replace(tmp, path)
+            except Exception as e:
+                logger.error(f"Artefakt speichern fehlgeschlagen: {e}")
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        return handle
+
+    def get(self, handle: str) -> Optional[str]:
+        """Lädt den vollständigen Inhalt zu einem Handle (None wenn unbekannt)."""
+        if not self.is_handle(handle):
+            return None
+        try:
+            with open(self._path(handle), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Artefakt {handle[:12]} nicht lesbar: {e}")
+            return None
+
+    def exists(self, handle: str) -> bool:
+        return self.is_handle(handle) and os.path.exists(self._path(handle))
+
+    def preview(self, text: str) -> str:
+        """Kurze Vorschau eines Ergebnisses."""
+        if len(text) <= self.preview_chars:
+            return text
+        return text[:self.preview_chars] + f"… [+{len(text) - self.preview_chars} Zeichen]"
+
+    def put_result(self, result) -> Tuple[str, Optional[str]]:
+        """
+        Bereitet ein Skill-Ergebnis für die History auf.
+        Returns: (vorschau, handle) – handle ist None wenn das Ergebnis inline bleibt.
+        """
+        text = str(result)
+        if len(text) <= self.inline_limit:
+            return text, None
+        try:
+            return self.preview(text), self.put(text)
+        except Exception:
+            # Ohne Ablage lieber die Vorschau behalten als den Lauf abzubrechen
+            return self.preview(text), None
+
+    def load(self, preview: Optional[str], handle: Optional[str]) -> str:
+        """Vollständiger Inhalt – fällt auf die Vorschau zurück, falls kein Artefakt existiert."""
+        if handle:
+            full = self.get(handle)
+            if full is not None:
+                return full
+        return preview or ""
+
+    def stats(self) -> Dict:
+        """Anzahl und Gesamtgröße der abgelegten Artefakte."""
+        count = 0
+        size  = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".z"):
+                    count += 1
+                    size  += os.path.getsize(os.path.join(dirpath, name))
+        return {"artifacts": count, "bytes_on_disk": size}
+
+
+# ── Singleton ──────────────────────────────────────────────────
+
+_store: Optional[ArtifactStore] = None
+
+def get_artifact_store() -> ArtifactStore:
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+    return _store
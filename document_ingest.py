@@ -0,0 +1,177 @@
+"""
+Ilija Full_Autonomy_Edition – Document Ingest
+==============================================
+Streamende Textextraktion und Chunking für hochgeladene Dokumente.
+
+Bisher wurde ein PDF/DOCX komplett eingelesen und auf 8000 Zeichen
+gekürzt – alles ab den ersten Seiten fiel stillschweigend weg. Jetzt:
+
+  iter_blocks()  → Text seitenweise (PDF), absatzweise (DOCX) bzw. in
+                   Blöcken (Textdateien) – nie das ganze Dokument im Speicher
+  iter_chunks()  → fasst Blöcke zu Abschnitten von ~CHUNK_CHARS Zeichen
+                   mit Überlappung zusammen
+  ingest()       → reiht die Abschnitte in die Dokument-Sammlung ein
+                   (memory_service.get_document_store – getrennt vom
+                   Langzeitgedächtnis; source="document", doc_id, filename,
+                   chunk) und behält nur eine Vorschau für den Chat
+  relevant_chunks() → die zu einer Frage passenden Abschnitte eines Dokuments;
+                   wartet höchstens DOCUMENT_FLUSH_S auf noch nicht
+                   eingebettete Abschnitte, statt den Chat zu blockieren
+
+Der Kernel merkt sich die Dokumente einer Session und holt pro Frage
+die relevanten Abschnitte in den System-Prompt (Kernel.document_context).
+"""
+
+import logging
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+CHUNK_CHARS      = 1500
+CHUNK_OVERLAP    = 200
+PREVIEW_CHARS    = 8000    # bis zu dieser Größe geht das Dokument vollständig in den Chat
+MAX_CHUNKS       = 2000    # Obergrenze pro Dokument (~3 MB Text)
+READ_BLOCK       = 64 * 1024
+DOCUMENT_FLUSH_S = 2.0     # relevant_chunks: max. Wartezeit auf ausstehende Abschnitte
+
+TEXT_SUFFIXES = ('.txt', '.md', '.py', '.js', '.ts', '.json', '.csv',
+                 '.xml', '.html', '.yaml', '.yml', '.sh', '.ini')
+
+
+class DocumentError(ValueError):
+    """Dokument nicht lesbar bzw. Extraktion nicht verfügbar (Meldung für den Nutzer)."""
+
+
+def iter_blocks(file_path: str, filename: str) -> Iterator[str]:
+    """Textblöcke in Dokumentreihenfolge. Raises: DocumentError."""
+    suffix = Path(filename).suffix.lower()
+    if suffix == '.pdf':
+        try:
+            import PyPDF2
+            with open(file_path, 'rb') as f:
+                for page in PyPDF2.PdfReader(f).pages:
+                    yield page.extract_text() or ''
+            return
+        except ImportError:
+            pass
+        try:
+            import pdfplumber
+        except ImportError:
+            raise DocumentError('[PDF-Extraktion nicht verfügbar – pip install PyPDF2]')
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text() or ''
+                page.flush_cache()
+    elif suffix in ('.docx', '.doc'):
+        try:
+            import docx
+        except ImportError:
+            raise DocumentError('[Word-Extraktion nicht verfügbar – pip install python-docx]')
+        for paragraph in docx.Document(file_path).paragraphs:
+            yield paragraph.text
+    elif suffix in TEXT_SUFFIXES:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            while True:
+                block = f.read(READ_BLOCK)
+                if not block:
+                    break
+                yield block
+    else:
+        raise DocumentError(f"[Dateityp '{suffix}' nicht direkt lesbar – unterstützt: PDF, DOCX, TXT, MD, PY, JSON, CSV]")
+
+
+def _joined(text: str, block: str) -> str:
+    """Block so anhängen, wie er im Gesamttext stünde (Zeilenumbruch als Trenner)."""
+    return block if text.endswith("\n") or not text else "\n" + block
+
+
+def iter_chunks(blocks: Iterable[str], size: int = CHUNK_CHARS,
+                overlap: int = CHUNK_OVERLAP) -> Iterator[str]:
+    """Abschnitte von ~size Zeichen; geschnitten wird bevorzugt an Zeilen-/Satzgrenzen."""
+    buffer = ""
+    for block in blocks:
+        if not block.strip():
+            continue
+        buffer += _joined(buffer, block)
+        while len(buffer) >= size + overlap:
+            cut = max(buffer.rfind("\n", size // 2, size), buffer.rfind(". ", size // 2, size) + 1)
+            if cut <= 0:
+                cut = size
+            yield buffer[:cut].strip()
+            buffer = buffer[max(cut - overlap, 0):]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def ingest(file_path: str, filename: str, index: bool = True,
+           service=None) -> Dict:
+    """
+    Extrahiert und zerlegt ein Dokument; index=True reiht die Abschnitte in
+    die Dokument-Sammlung ein (Write-behind). Raises: DocumentError.
+    Returns: {"doc_id", "filename", "chunks", "chars", "preview", "complete", "indexed"}
+    """
+    from memory_service import build_metadata, get_document_store
+    service = (service or get_document_store()) if index else None
+    doc_id  = uuid.uuid4().hex[:12]
+    # Vorschau und Zeichenzahl aus dem Quelltext, nicht aus den Abschnitten –
+    # die überlappen sich und würden Passagen doppelt zählen/zeigen
+    source  = {"preview": "", "chars": 0, "last": ""}
+    count   = 0
+
+    def counted(blocks: Iterable[str]) -> Iterator[str]:
+        for block in blocks:
+            if block.strip():
+                piece = _joined(source["last"], block)
+                source["last"] = piece[-1:]   # nur das letzte Zeichen entscheidet über den Trenner
+                source["chars"] += len(piece)
+                if len(source["preview"]) < PREVIEW_CHARS:
+                    source["preview"] += piece[:PREVIEW_CHARS - len(source["preview"])]
+            yield block
+
+    for chunk in iter_chunks(counted(iter_blocks(file_path, filename))):
+        if count >= MAX_CHUNKS:
+            logger.warning(f"Dokument {filename}: mehr als {MAX_CHUNKS} Abschnitte – Rest ignoriert")
+            break
+        if service is not None:
+            service.enqueue(chunk, build_metadata(
+                source="document", importance=0.6,
+                doc_id=doc_id, filename=filename, chunk=count,
+            ))
+        count += 1
+
+    if not count:
+        raise DocumentError('[Dokument enthält keinen lesbaren Text]')
+    chars = source["chars"]
+    logger.info(f"Dokument {filename}: {count} Abschnitte, {chars} Zeichen"
+                f"{' → Dokument-Sammlung' if service is not None else ''}")
+    return {
+        "doc_id":   doc_id,
+        "filename": filename,
+        "chunks":   count,
+        "chars":    chars,
+        "preview":  source["preview"].strip(),
+        "complete": chars <= PREVIEW_CHARS,
+        "indexed":  service is not None,
+    }
+
+
+def relevant_chunks(doc_ids: List[str], question: str, k: int = 4,
+                    service=None) -> List[Dict]:
+    """
+    Die zur Frage passenden Abschnitte der angegebenen Dokumente.
+    Noch nicht eingebettete Abschnitte (großes Dokument gerade hochgeladen)
+    fehlen nach DOCUMENT_FLUSH_S – sie sind bei der nächsten Frage dabei.
+    """
+    if not doc_ids or not question.strip():
+        return []
+    from memory_service import get_document_store
+    service = service or get_document_store()
+    where   = {"doc_id": doc_ids[0]} if len(doc_ids) == 1 else {"doc_id": {"$in": list(doc_ids)}}
+    try:
+        return service.search(question, k=k, where=where, half_life_days=None,
+                              flush_timeout=DOCUMENT_FLUSH_S)
+    except Exception as e:
+        logger.warning(f"Dokument-Abschnitte nicht abrufbar: {e}")
+        return []
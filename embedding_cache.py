@@ -0,0 +1,203 @@
+"""
+Ilija Full_Autonomy_Edition – Embedding Cache
+==============================================
+Persistenter, begrenzter Cache für Text-Embeddings.
+
+Dieselben Texte werden immer wieder eingebettet – das Ziel in
+_get_memory_context, die feste Anfrage "Entwicklung Ziele Erfahrungen"
+der GoalEngine, identische Erinnerungen. Auf einer CPU-Maschine kostet
+jeder Transformer-Durchlauf spürbar Zeit; ein Cache-Treffer nur einen
+Dict-Zugriff.
+
+Aufbau:
+  - Schlüssel: 64-Bit-Präfix von SHA-256(modell + text)
+  - Vorne ein LRU im Speicher (lru_size Vektoren)
+  - Dahinter ein Ringpuffer als .npy-Memmap (capacity Zeilen,
+    float16 oder float32) – pro Modell eine Datei:
+      data/embedding_cache/all-MiniLM-L6-v2.float16.npy
+    Jede Zeile: (tag, seq, vec). Ist der Ring voll, wird die älteste
+    Zeile überschrieben.
+  - Beim Start wird der Index aus den Tags der Datei rekonstruiert.
+
+Absturzsicherheit: Die Zeilen eines Batches werden erst entwertet
+(tag = 0, ein flush), dann beschrieben und mit neuem Tag versehen
+(zweiter flush) – eine halb geschriebene Zeile ist daher nie unter einem
+alten Schlüssel sichtbar. Zwei msyncs pro Batch, nicht pro Vektor.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "data/embedding_cache"
+CAPACITY  = 20000    # Zeilen im Ringpuffer (384 Dim · float16 ≈ 15 MB)
+LRU_SIZE  = 2048
+
+
+class EmbeddingCache:
+    """Zweistufiger Cache (LRU + Memmap-Ringpuffer) für ein Embedding-Modell."""
+
+    def __init__(self, model_name: str, root: str = CACHE_DIR,
+                 capacity: int = CAPACITY, lru_size: int = LRU_SIZE,
+                 dtype: str = "float16"):
+        self.model_name = model_name
+        self.capacity   = capacity
+        self.lru_size   = lru_size
+        self.dtype      = np.dtype(dtype)
+        slug            = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.path       = os.path.join(root, f"{slug}.{self.dtype.name}.npy")
+        self.hits       = 0
+        self.misses     = 0
+        self._lru: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._slots: Dict[int, int] = {}   # tag → Zeile
+        self._table     = None             # Memmap, wird beim ersten put() angelegt
+        self._seq       = 0
+        self._lock      = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._open()
+
+    # ------------------------------------------------------------------
+    # Datei
+    # ------------------------------------------------------------------
+
+    def _row_dtype(self, dim: int) -> np.dtype:
+        return np.dtype([("tag", "<u8"), ("seq", "<u8"), ("vec", self.dtype, (dim,))])
+
+    def _open(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            table = np.lib.format.open_memmap(self.path, mode="r+")
+            if len(table) != self.capacity:
+                logger.info(f"EmbeddingCache: Kapazität geändert – {self.path} wird neu angelegt")
+                del table
+                os.remove(self.path)
+                return
+            tags = np.asarray(table["tag"])
+            for row in np.flatnonzero(tags):
+                self._slots[int(tags[row])] = int(row)
+            self._seq   = int(np.asarray(table["seq"]).max()) if len(table) else 0
+            self._table = table
+            logger.info(f"EmbeddingCache: {len(self._slots)} Embeddings aus {self.path} geladen")
+        except Exception as e:
+            logger.warning(f"EmbeddingCache: {self.path} unlesbar ({e}) – starte leer")
+            self._table = None
+            self._slots.clear()
+
+    def _create(self, dim: int) -> None:
+        self._table = np.lib.format.open_memmap(
+            self.path, mode="w+", dtype=self._row_dtype(dim), shape=(self.capacity,)
+        )
+        self._table.flush()
+
+    # ------------------------------------------------------------------
+    # Zugriff
+    # ------------------------------------------------------------------
+
+    def _tag(self, text: str) -> int:
+        digest = hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "little") or 1   # 0 = leere Zeile
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        tag = self._tag(text)
+        with self._lock:
+            vec = self._lru.get(tag)
+            if vec is not None:
+                self._lru.move_to_end(tag)
+                self.hits += 1
+                return vec
+            row = self._slots.get(tag)
+            if row is not None and int(self._table["tag"][row]) == tag:
+                vec = np.asarray(self._table["vec"][row], dtype=np.float32)
+                self._remember(tag, vec)
+                self.hits += 1
+                return vec
+            self.misses += 1
+            return None
+
+    def put(self, text: str, vector: Sequence[float]) -> None:
+        self.put_many([(text, vector)])
+
+    def put_many(self, items: Sequence[Tuple[str, Sequence[float]]]) -> None:
+        """Mehrere Embeddings ablegen – die Datei wird einmal pro Batch synchronisiert."""
+        with self._lock:
+            fresh: Dict[int, np.ndarray] = {}
+            for text, vector in items:
+                tag = self._tag(text)
+                vec = np.asarray(vector, dtype=np.float32)
+                self._remember(tag, vec)
+                if tag not in self._slots:
+                    fresh[tag] = vec
+            if not fresh:
+                return
+            dim = len(next(iter(fresh.values())))
+            if self._table is None:
+                self._create(dim)
+            elif self._table.dtype["vec"].shape[0] != dim:
+                logger.warning("EmbeddingCache: Dimension passt nicht zur Datei – nur im Speicher gecacht")
+                return
+
+            # Ring-Zeilen belegen (bei mehr Vektoren als Kapazität: nur die letzten)
+            rows = []
+            for tag in list(fresh)[-self.capacity:]:
+                self._seq += 1
+                rows.append((self._seq % self.capacity, self._seq, tag))
+
+            # 1. Zielzeilen entwerten
+            for row, _, _ in rows:
+                old = int(self._table["tag"][row])
+                if old:
+                    self._slots.pop(old, None)
+                self._table["tag"][row] = 0
+            self._table.flush()
+            # 2. beschreiben und mit neuem Tag versehen
+            for row, seq, tag in rows:
+                self._table["vec"][row] = fresh[tag]
+                self._table["seq"][row] = seq
+                self._table["tag"][row] = tag
+                self._slots[tag] = row
+            self._table.flush()
+
+    def _remember(self, tag: int, vec: np.ndarray) -> None:
+        self._lru[tag] = vec
+        self._lru.move_to_end(tag)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def embed(self, texts: List[str], compute) -> List[List[float]]:
+        """
+        Embeddings für texts – nur Cache-Fehltreffer gehen an compute(list) → Vektoren.
+        """
+        result: List[Optional[np.ndarray]] = [self.get(t) for t in texts]
+        # Gleiche Texte im Batch nur einmal berechnen
+        missing: Dict[str, List[int]] = {}
+        for i, vec in enumerate(result):
+            if vec is None:
+                missing.setdefault(texts[i], []).append(i)
+        if missing:
+            unique = list(missing)
+            fresh  = [np.asarray(vec, dtype=np.float32) for vec in compute(unique)]
+            self.put_many(list(zip(unique, fresh)))
+            for text, vec in zip(unique, fresh):
+                for i in missing[text]:
+                    result[i] = vec
+        return [vec.tolist() for vec in result]
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries":  len(self._slots),
+            "capacity": self.capacity,
+            "hits":     self.hits,
+            "misses":   self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "dtype":    self.dtype.name,
+        }
@@ -0,0 +1,83 @@
+"""
+Ilija Full_Autonomy_Edition – Event Bus
+========================================
+Prozessinterner Ereignis-Bus für Dashboard-Updates.
+
+Statt dass jedes offene Dashboard alle 5 s /api/stats abfragt, melden die
+Komponenten Änderungen selbst:
+
+  skills   → SkillManager nach jedem Reload (registry_version, Anzahl)
+  goals    → GoalEngine nach jedem Ergebnis (Zähler, Ø-Score)
+  session  → Web-Server nach einer Chat-Antwort (History, Zustand)
+  job      → Statuswechsel eines Goal-Jobs
+
+Nur Zustandsänderungen – Log-Zeilen haben ihren eigenen Puffer und Stream
+(log_tail.LogBroadcaster, /api/log/stream).
+
+Events werden nummeriert in einem Ringpuffer gehalten; wait() blockiert
+bis Neues vorliegt. Ist ein Leser so weit zurück, dass seine Events schon
+aus dem Puffer gefallen sind, bekommt er zuerst ein "resync"-Event – der
+Client holt dann den Snapshot neu. Session-bezogene Events tragen eine session_id und
+werden nur an diese Session ausgeliefert (siehe web_server /api/events).
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+BUFFER_SIZE = 1000
+RESYNC      = "resync"   # Leser hat Events verpasst → Snapshot neu laden
+
+Event = Tuple[int, str, Any, Optional[str]]   # (seq, topic, data, session_id)
+
+
+class EventBus:
+    """Nummerierte Events mit blockierendem Warten (mehrere Leser, ein Puffer)."""
+
+    def __init__(self, capacity: int = BUFFER_SIZE):
+        self.seq = 0
+        self._events: Deque[Event] = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+
+    def publish(self, topic: str, data: Any, session_id: Optional[str] = None) -> int:
+        with self._cond:
+            self.seq += 1
+            self._events.append((self.seq, topic, data, session_id))
+            self._cond.notify_all()
+            return self.seq
+
+    def wait(self, since: int, timeout: float = 15.0) -> List[Event]:
+        """
+        Events mit Nummer > since; wartet bis zu timeout (leer = Keepalive).
+        Fehlen Events zwischen since und dem ältesten gepufferten, steht
+        vorn ein ("resync", {"missed": n}) mit der Nummer direkt davor.
+        """
+        with self._cond:
+            if self.seq <= since:
+                self._cond.wait(timeout)
+            if self.seq <= since:
+                return []
+            events = [e for e in self._events if e[0] > since]
+            oldest = self._events[0][0]
+            if oldest > since + 1:
+                events.insert(0, (oldest - 1, RESYNC, {"missed": oldest - 1 - since}, None))
+            return events
+
+
+# ── Singleton ──────────────────────────────────────────────────
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBus()
+    return _bus
+
+
+def publish(topic: str, data: Any, session_id: Optional[str] = None) -> int:
+    """Kurzform für get_event_bus().publish(...)."""
+    return get_event_bus().publish(topic, data, session_id)
@@ -74,12 +74,10 @@ class EvolutionTracker:
                 logger.warning(f"Snapshots laden fehlgeschlagen: {e}")
 
     def _count_memory_entries(self) -> int:
-        """Zählt Einträge in ChromaDB."""
+        """Zählt Einträge in ChromaDB (geteilter Client, ohne Embedding-Modell)."""
         try:
-            import chromadb
-            client = chromadb.PersistentClient(path="memory/ilija_db")
-            collection = client.get_or_create_collection("globales_wissen")
-            return collection.count()
+            from memory_service import get_memory_service
+            return get_memory_service().count()
         except Exception:
             return 0
 
@@ -227,8 +225,11 @@ class EvolutionTracker:
 
             # Reflexion im Gedächtnis speichern
             try:
-                from skills.gedaechtnis import wissen_speichern
-                wissen_speichern(f"Selbstreflexion Tag {self.day_counter}: {reflection}")
+                from memory_service import get_memory_service, build_metadata
+                get_memory_service().enqueue(
+                    f"Selbstreflexion Tag {self.day_counter}: {reflection}",
+                    build_metadata("reflection", importance=0.8, day=self.day_counter),
+                )
             except Exception:
                 pass
 
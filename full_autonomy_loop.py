@@ -19,15 +19,19 @@ import logging
 import re
 import time
 import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Deque, Dict, List, Optional
 
+from artifact_store import get_artifact_store
 from skill_policy import get_policy, ExecutionMode, PolicyDecision
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_WINDOW = 8   # Letzte K Schritte im Detail, ältere nur als Digest
+
 
 # ---------------------------------------------------------------------------
 # Status-Typen
@@ -59,11 +63,34 @@ class PlanStep:
     params:      Dict[str, Any]
     reason:      str
     status:      StepStatus = StepStatus.PENDING
-    result:      Optional[str] = None
+    result:      Optional[str] = None   # Vorschau (vollständig nur wenn klein)
+    artifact:    Optional[str] = None   # Handle im ArtifactStore für große Ergebnisse
     error:       Optional[str] = None
     retries:     int = 0
 
 
+@dataclass
+class StepDigest:
+    """Verdichtete Zusammenfassung älterer Schritte – wird pro Schritt in O(1) fortgeschrieben."""
+    count:    int            = 0
+    failures: int            = 0
+    skills:   Dict[str, int] = field(default_factory=dict)
+
+    def add(self, entry: Dict) -> None:
+        self.count += 1
+        skill = entry.get("skill") or "direkt"
+        self.skills[skill] = self.skills.get(skill, 0) + 1
+        if str(entry.get("result", "")).lower().startswith("fehler"):
+            self.failures += 1
+
+    def render(self) -> str:
+        if not self.count:
+            return ""
+        top = sorted(self.skills.items(), key=lambda kv: -kv[1])[:6]
+        used = ", ".join(f"{name}×{n}" for name, n in top)
+        return f"  … {self.count} frühere Schritte ({self.failures} Fehler): {used}"
+
+
 @dataclass
 class GoalSession:
     goal:          str
@@ -74,6 +101,24 @@ class GoalSession:
     started_at:    str            = field(default_factory=lambda: datetime.now().isoformat())
     final_summary: Optional[str]  = None
     score:         float          = 0.0
+    recent_steps:  Deque[Dict]    = field(default_factory=lambda: deque(maxlen=SUMMARY_WINDOW))
+    digest:        StepDigest     = field(default_factory=StepDigest)
+
+    def record_step(self, entry: Dict) -> None:
+        """Hängt einen Schritt an die History an und pflegt das Zusammenfassungs-Fenster."""
+        self.history.append(entry)
+        if len(self.recent_steps) == self.recent_steps.maxlen:
+            self.digest.add(self.recent_steps[0])
+        self.recent_steps.append(entry)
+
+    def steps_summary(self, width: int = 120) -> str:
+        """Digest älterer Schritte + die letzten K Schritte im Detail (konstante Größe)."""
+        lines = [self.digest.render()] if self.digest.count else []
+        lines += [
+            f"  {e['step']+1}. {e['description']} → {str(e['result'])[:width]}"
+            for e in self.recent_steps
+        ]
+        return "\n".join(lines)
 
 
 # ---------------------------------------------------------------------------
@@ -162,11 +207,13 @@ class FullAutonomyLoop:
         max_iterations: int = 50,    # Hoch – aber nicht unendlich (Safety)
         verbose: bool = True,
         evolution_tracker=None,
+        on_event: Optional[Callable[[str, Dict], None]] = None,
     ):
         self.kernel            = kernel
         self.max_iterations    = max_iterations
         self.verbose           = verbose
         self.evolution_tracker = evolution_tracker
+        self.on_event          = on_event   # (art, daten) – z.B. Fortschritt für SSE
         self.session: Optional[GoalSession] = None
         self._abort_flag = False
         self._lock = threading.Lock()
@@ -194,9 +241,13 @@ class FullAutonomyLoop:
         if not plan:
             self.session.status   = LoopStatus.GOAL_FAILED
             self.session.final_summary = "Konnte keinen Plan erstellen."
+            self._emit("finished", self.get_status_dict())
             return self.session
 
         self.session.plan = plan
+        self._emit("plan", {"steps": [
+            {"index": p.index, "description": p.description, "skill": p.skill} for p in plan
+        ]})
         self._log(f"\n📋 Plan ({len(plan)} Schritte):")
         for step in plan:
             info = f"[{step.skill}]" if step.skill else "[direkt]"
@@ -206,7 +257,7 @@ class FullAutonomyLoop:
         self.session.status   = LoopStatus.EXECUTING
         current_idx  = 0
         replan_count = 0
-        step_results: Dict[int, str] = {}  # FIX: Ergebnisse zwischen Schritten
+        step_results: Dict[int, PlanStep] = {}  # FIX: Ergebnisse zwischen Schritten
 
         while current_idx < len(self.session.plan):
             if self._abort_flag:
@@ -228,29 +279,39 @@ class FullAutonomyLoop:
 
             # FIX: Params mit echten Vorgänger-Ergebnissen befüllen
             step.params = self._inject_previous_results(step.params, step_results)
-            result = self._execute_step(step)
-            step.result = result
-            step_results[step.index] = result  # FIX: Ergebnis merken
+            # Großes Ergebnis landet im ArtifactStore, im Schritt bleibt nur die Vorschau
+            step.result, step.artifact = get_artifact_store().put_result(self._execute_step(step))
+            step_results[step.index] = step  # FIX: Ergebnis merken
 
-            self.session.history.append({
+            self.session.record_step({
                 "step":        step.index,
                 "description": step.description,
                 "skill":       step.skill,
                 "params":      step.params,
-                "result":      result,
+                "result":      step.result,
+                "artifact":    step.artifact,
                 "iteration":   self.session.iteration,
                 "timestamp":   datetime.now().isoformat(),
             })
 
-            self._log(f"   📤 Ergebnis: {str(result)[:300]}")
+            self._log(f"   📤 Ergebnis: {step.result[:300]}")
+            self._emit("step", self.session.history[-1])
 
             # Phase 3: Evaluieren
             self.session.status = LoopStatus.EVALUATING
-            evaluation = self._evaluate(goal, step, result)
+            evaluation = self._evaluate(goal, step)
             progress   = evaluation.get("progress_percent", 0)
             score      = evaluation.get("score", 0)
 
             self._log(f"   🧠 Evaluation: {evaluation.get('next_action')} | {progress}% | {evaluation.get('assessment', '')[:100]}")
+            self._emit("evaluation", {
+                "step":        step.index,
+                "iteration":   self.session.iteration,
+                "next_action": evaluation.get("next_action"),
+                "progress":    progress,
+                "score":       score,
+                "assessment":  evaluation.get("assessment", ""),
+            })
 
             if evaluation.get("goal_reached"):
                 step.status = StepStatus.DONE
@@ -343,6 +404,7 @@ class FullAutonomyLoop:
             else:
                 self.evolution_tracker.record_error()
 
+        self._emit("finished", self.get_status_dict())
         return self.session
 
     def abort(self):
@@ -442,17 +504,14 @@ class FullAutonomyLoop:
                 self.evolution_tracker.record_error()
             return f"FEHLER: {e}"
 
-    def _evaluate(self, goal: str, step: PlanStep, result: str) -> Dict:
-        steps_summary = "\n".join(
-            f"  {e['step']+1}. {e['description']} → {str(e['result'])[:120]}"
-            for e in self.session.history
-        )
+    def _evaluate(self, goal: str, step: PlanStep) -> Dict:
+        steps_summary = self.session.steps_summary(width=120)
 
         system = EVALUATOR_SYSTEM_PROMPT.format(
             goal=goal,
             iteration=self.session.iteration,
             steps_summary=steps_summary or "(keine)",
-            last_result=str(result)[:4000],
+            last_result=self._load_result(step)[:4000],
         )
 
         messages = [
@@ -471,10 +530,7 @@ class FullAutonomyLoop:
     def _create_summary(self) -> str:
         if not self.session:
             return "Kein Lauf."
-        steps_summary = "\n".join(
-            f"  {e['step']+1}. {e['description']} → {str(e['result'])[:150]}"
-            for e in self.session.history
-        )
+        steps_summary = self.session.steps_summary(width=150)
         system = (
             f"Du bist Ilija. Fasse das Ergebnis zusammen.\n"
             f"Ziel: {self.session.goal}\nStatus: {self.session.status.value}\n"
@@ -513,11 +569,16 @@ class FullAutonomyLoop:
                     pass
         return None
 
-    def _inject_previous_results(self, params: Dict, step_results: Dict[int, str]) -> Dict:
+    def _load_result(self, step: PlanStep) -> str:
+        """Vollständiges Schritt-Ergebnis – wird erst bei Bedarf aus dem ArtifactStore geladen."""
+        return get_artifact_store().load(step.result, step.artifact)
+
+    def _inject_previous_results(self, params: Dict, step_results: Dict[int, PlanStep]) -> Dict:
         """Ersetzt ALLE Placeholder-Varianten durch echte Schritt-Ergebnisse."""
         if not params or not step_results:
             return params
-        last_result = str(list(step_results.values())[-1]) if step_results else ""
+        last_step = list(step_results.values())[-1]
+        last_result = None
         placeholder_patterns = [
             "OUTPUT_FROM_PREVIOUS_STEP", "OUTPUT_OF_PREVIOUS_STEP",
             "PREVIOUS_STEP_OUTPUT", "LAST_RESULT", "PREVIOUS_RESULT",
@@ -534,22 +595,33 @@ class FullAutonomyLoop:
             num_match = re.search(r"(?:OUTPUT_(?:FROM|OF)_STEP_|previous_skill_result\()(\d+)", value)
             if num_match:
                 idx = int(num_match.group(1))
-                new_params[key] = step_results.get(idx, last_result)
+                new_params[key] = self._load_result(step_results.get(idx, last_step))
                 replaced = True
             else:
                 for pat in placeholder_patterns:
                     if pat.lower() in value.lower():
+                        if last_result is None:
+                            last_result = self._load_result(last_step)
                         new_params[key] = last_result
                         replaced = True
                         break
             if not replaced:
                 # Erkennt beschreibende Platzhalter wie "Die ID aus Schritt 0"
                 if re.search(r"(schritt|step|aus|from|output|result|id)\s*[0-9]", value.lower()):
+                    if last_result is None:
+                        last_result = self._load_result(last_step)
                     new_params[key] = last_result
                 else:
                     new_params[key] = value
         return new_params
 
+    def _emit(self, kind: str, data: Dict) -> None:
+        if self.on_event:
+            try:
+                self.on_event(kind, data)
+            except Exception as e:
+                logger.debug(f"on_event Fehler: {e}")
+
     def _log(self, msg: str):
         if self.verbose:
             print(msg)
@@ -9,7 +9,7 @@ Betriebsmodus:
   Keine Nutzer-Interaktion vorgesehen (aber möglich über Web-Interface).
 
   Zyklus:
-    1. Neue Ziele generieren (Goal Engine)
+    1. Neue Ziele generieren (Goal Engine, im Hintergrund via GoalPrefetcher)
     2. Ziel ausführen (Full Autonomy Loop)
     3. Ergebnis bewerten und speichern (Evolution Tracker)
     4. Selbstreflexion (täglich)
@@ -21,10 +21,16 @@ Konfiguration über .env:
   GOOGLE_API_KEY        → Gemini als Fallback
   AUTONOMY_MODE         → "full" (Standard) oder "supervised"
   GOAL_BATCH_SIZE       → Anzahl Ziele pro Batch (Standard: 3)
-  CYCLE_PAUSE_SECONDS   → Pause zwischen Zyklen (Standard: 30)
+  CYCLE_PAUSE_SECONDS   → Pause zwischen Zyklen (Standard: 30; parallel: Abstand
+                          zwischen Starts = Pause / PARALLEL_GOALS)
   MAX_ITERATIONS        → Max Iterationen pro Ziel (Standard: 50)
   EVOLUTION_SNAPSHOT_HOURS → Stunden zwischen Snapshots (Standard: 24)
   WEB_INTERFACE         → "true" → Web-Dashboard starten
+  PARALLEL_GOALS        → Anzahl gleichzeitig ausgeführter Ziele (Standard: 1)
+  LLM_MAX_CONCURRENT    → Max. gleichzeitige LLM-Aufrufe aller Worker (Standard: PARALLEL_GOALS)
+  LLM_MIN_INTERVAL      → Mindestabstand zwischen LLM-Aufrufen in Sekunden (Standard: 0)
+  MEMORY_COMPACT_HOURS  → Stunden zwischen Gedächtnis-Verdichtungen, 0 = aus (Standard: 24)
+  MEMORY_COMPACT_LLM    → "true" → Cluster per LLM zusammenfassen (Standard: false)
 """
 
 import json
@@ -33,8 +39,10 @@ import os
 import signal
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from threading import Event
+from threading import Event, Lock, Thread
+from typing import Optional
 
 # .env laden
 try:
@@ -65,8 +73,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from kernel import Kernel
+from providers import RateLimitedProvider, RateLimiter
 from full_autonomy_loop import FullAutonomyLoop, LoopStatus
 from goal_engine import GoalEngine, GeneratedGoal
+from goal_prefetcher import GoalPrefetcher
 from evolution_tracker import EvolutionTracker
 
 
@@ -82,6 +92,11 @@ class Config:
     WEB_INTERFACE            = os.getenv("WEB_INTERFACE", "false").lower() == "true"
     PROVIDER                 = os.getenv("LLM_PROVIDER", "auto")
     MODE                     = os.getenv("AUTONOMY_MODE", "full")
+    PARALLEL_GOALS           = max(1, int(os.getenv("PARALLEL_GOALS", "1")))
+    LLM_MAX_CONCURRENT       = int(os.getenv("LLM_MAX_CONCURRENT", str(PARALLEL_GOALS)))
+    LLM_MIN_INTERVAL         = float(os.getenv("LLM_MIN_INTERVAL", "0"))
+    MEMORY_COMPACT_HOURS     = float(os.getenv("MEMORY_COMPACT_HOURS", "24"))
+    MEMORY_COMPACT_LLM       = os.getenv("MEMORY_COMPACT_LLM", "false").lower() == "true"
 
 
 # ---------------------------------------------------------------------------
@@ -115,6 +130,10 @@ class FullAutonomyOrchestrator:
         self.goals_failed  = 0
         self.start_time    = datetime.now()
         self.last_snapshot = time.time()
+        self.last_compaction = time.time()
+        self._compaction: Optional[Thread] = None
+        self._stats_lock   = Lock()
+        self.active_loops: dict = {}   # goal.id → FullAutonomyLoop (Multi-Goal-Betrieb)
 
         print(BANNER)
         logger.info("Full_Autonomy_Edition initialisiert")
@@ -122,8 +141,19 @@ class FullAutonomyOrchestrator:
         # Kernel + Loop + GoalEngine + Tracker
         logger.info(f"Lade Kernel (Provider: {Config.PROVIDER})...")
         self.kernel   = Kernel(provider=Config.PROVIDER, auto_load_skills=True)
+        if Config.PARALLEL_GOALS > 1:
+            # Alle Worker (und GoalEngine/Tracker) teilen sich ein Rate-Limit
+            self.kernel.provider = RateLimitedProvider(
+                self.kernel.provider,
+                RateLimiter(Config.LLM_MAX_CONCURRENT, Config.LLM_MIN_INTERVAL),
+            )
         self.tracker  = EvolutionTracker(self.kernel)
         self.goals    = GoalEngine(self.kernel, memory_path="data/goals.json")
+        self.prefetcher = GoalPrefetcher(
+            self.goals,
+            batch_size=Config.GOAL_BATCH_SIZE,
+            low_water=Config.GOAL_BATCH_SIZE * 2 + Config.PARALLEL_GOALS - 1,
+        )
         self.loop     = FullAutonomyLoop(
             kernel=self.kernel,
             max_iterations=Config.MAX_ITERATIONS,
@@ -144,62 +174,73 @@ class FullAutonomyOrchestrator:
         """Startet den Web-Server im Hintergrund."""
         try:
             import threading
-            from web_server import app
+            import web_server
+            from web_serving import serve
+            # Gleiche Skill-Registry wie der Orchestrator (kein zweiter Skill-Import)
+            web_server.use_skill_registry(self.kernel.manager)
             t = threading.Thread(
-                target=lambda: app.run(host="0.0.0.0", port=5000, debug=False),
-                daemon=True
+                target=lambda: serve(web_server.app, host="0.0.0.0", port=5000),
+                name="web", daemon=True
             )
             t.start()
             logger.info("Web-Interface gestartet: http://0.0.0.0:5000")
         except Exception as e:
             logger.warning(f"Web-Interface konnte nicht gestartet werden: {e}")
 
-    def _generate_new_goals(self) -> list:
-        """Neue Ziele generieren und in Queue einreihen."""
-        pending = [g for g in self.goals.past_goals if not g.completed]
-        if len(pending) >= Config.GOAL_BATCH_SIZE * 2:
-            logger.info(f"{len(pending)} Ziele bereits in Queue – keine neuen generiert")
-            return pending
-
-        logger.info(f"Generiere {Config.GOAL_BATCH_SIZE} neue Ziele...")
-        new_goals = self.goals.generate_goals(count=Config.GOAL_BATCH_SIZE, use_llm=True)
-        if new_goals:
-            self.goals.queue_goals(new_goals)
-            for g in new_goals:
-                logger.info(f"  Neues Ziel [{g.category.value}] (Prio {g.priority}): {g.goal}")
-
-        return [g for g in self.goals.past_goals if not g.completed]
-
-    def _execute_goal(self, goal: GeneratedGoal) -> None:
+    def _claim_goal(self, wait_timeout: float = 0) -> GeneratedGoal:
+        """
+        Nächstes Ziel beanspruchen. Die Generierung läuft im GoalPrefetcher –
+        hier wird nur gewartet, wenn die Queue tatsächlich leer ist.
+        """
+        mark = self.prefetcher.generation
+        goal = self.goals.get_next_goal()
+        if goal is None and wait_timeout > 0:
+            self.prefetcher.wait_for_goals(mark, timeout=wait_timeout)
+            goal = self.goals.get_next_goal()
+        # Bestand nachfüllen, während das Ziel läuft
+        self.prefetcher.wake()
+        return goal
+
+    def _execute_goal(self, goal: GeneratedGoal, loop: FullAutonomyLoop = None) -> None:
         """Führt ein einzelnes Ziel aus."""
         logger.info(f"\n{'='*65}")
         logger.info(f"ZIEL [{goal.category.value.upper()}] (Prio {goal.priority}): {goal.goal}")
         logger.info(f"Reasoning: {goal.reasoning}")
         logger.info(f"{'='*65}")
 
-        session = self.loop.run(goal.goal)
+        try:
+            session = (loop or self.loop).run(goal.goal)
+        except Exception:
+            # Ziel nicht verlieren – zurück in die Queue
+            self.goals.release_goal(goal)
+            raise
 
         # Ergebnis bewerten
         if session.status == LoopStatus.GOAL_REACHED:
-            self.goals_done += 1
+            with self._stats_lock:
+                self.goals_done += 1
             score = session.score or 8.0
             logger.info(f"✅ Ziel erreicht! Score: {score:.1f}/10")
             self.goals.record_outcome(goal, session.final_summary or "", score)
         else:
-            self.goals_failed += 1
+            with self._stats_lock:
+                self.goals_failed += 1
             logger.info(f"❌ Ziel nicht erreicht. Status: {session.status.value}")
             score = max(1.0, session.score or 2.0)
-            self.goals.record_outcome(goal, session.final_summary or "Fehlgeschlagen", score)
+            self.goals.record_outcome(goal, session.final_summary or "Fehlgeschlagen", score, success=False)
 
         # Zusammenfassung ins Gedächtnis
         try:
-            from skills.gedaechtnis import wissen_speichern
+            from memory_service import get_memory_service, build_metadata
             memory = (
                 f"Ziel ausgeführt: {goal.goal}. "
                 f"Status: {session.status.value}. "
                 f"Zusammenfassung: {(session.final_summary or '')[:300]}"
             )
-            wissen_speichern(memory)
+            get_memory_service().enqueue(memory, build_metadata(
+                "goal", goal_id=goal.id, category=goal.category.value,
+                importance=score / 10, status=session.status.value,
+            ))
         except Exception:
             pass
 
@@ -213,6 +254,30 @@ class FullAutonomyOrchestrator:
             logger.info(f"Selbstreflexion:\n{reflection}")
             self.last_snapshot = time.time()
             self._print_stats()
+        self._maybe_compact_memory()
+
+    def _maybe_compact_memory(self) -> None:
+        """Verdichtet das Langzeitgedächtnis im Hintergrund (alle MEMORY_COMPACT_HOURS)."""
+        if not Config.MEMORY_COMPACT_HOURS:
+            return
+        if self._compaction and self._compaction.is_alive():
+            return
+        if (time.time() - self.last_compaction) / 3600 < Config.MEMORY_COMPACT_HOURS:
+            return
+        self.last_compaction = time.time()
+
+        def compact():
+            try:
+                from memory_compaction import MemoryCompactor, llm_summarizer
+                from memory_service import get_memory_service
+                summarize = llm_summarizer(self.kernel.provider) if Config.MEMORY_COMPACT_LLM else None
+                report    = MemoryCompactor(get_memory_service(), summarize=summarize).run()
+                logger.info(f"🧹 Gedächtnis verdichtet: {report['before']} → {report['after']} Einträge")
+            except Exception as e:
+                logger.error(f"Gedächtnis-Verdichtung fehlgeschlagen: {e}", exc_info=True)
+
+        self._compaction = Thread(target=compact, name="memory-compaction", daemon=True)
+        self._compaction.start()
 
     def _print_stats(self) -> None:
         """Gibt aktuelle Statistiken aus."""
@@ -228,42 +293,27 @@ class FullAutonomyOrchestrator:
         print(f"   Skills geladen: {len(self.kernel.manager.loaded_tools)}")
         print(f"   Erfolgsrate:    {stats['success_rate']:.1f}%\n")
 
-    def run(self) -> None:
-        """Permanenter Hauptloop."""
-        # Graceful Shutdown
-        signal.signal(signal.SIGINT,  lambda s, f: self._stop.set())
-        signal.signal(signal.SIGTERM, lambda s, f: self._stop.set())
-
-        logger.info("🚀 Full_Autonomy_Edition gestartet. Ilija arbeitet jetzt autonom.")
-        logger.info(f"Konfiguration: batch={Config.GOAL_BATCH_SIZE} | "
-                    f"max_iter={Config.MAX_ITERATIONS} | "
-                    f"pause={Config.CYCLE_PAUSE_SECONDS}s")
-
+    def _run_sequential(self) -> None:
+        """Klassischer Modus: ein Ziel pro Zyklus."""
         while not self._stop.is_set():
             try:
                 self.cycle_count += 1
                 logger.info(f"\n{'─'*65}")
                 logger.info(f"ZYKLUS #{self.cycle_count} | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-                # Neue Ziele generieren wenn Queue leer/klein
-                pending = self._generate_new_goals()
-
-                if not pending:
-                    logger.warning("Keine Ziele verfügbar – warte 60s...")
-                    self._stop.wait(timeout=60)
-                    continue
-
-                # Nächstes Ziel holen (nach Priorität)
-                next_goal = self.goals.get_next_goal()
+                # Nächstes Ziel holen (nach Priorität) – ggf. auf den Prefetcher warten
+                next_goal = self._claim_goal(wait_timeout=60)
                 if not next_goal:
+                    logger.warning("Keine Ziele verfügbar – warte...")
                     self._stop.wait(timeout=Config.CYCLE_PAUSE_SECONDS)
                     continue
 
                 # Ziel ausführen
                 self._execute_goal(next_goal)
 
-                # Skills neu laden (falls neue erstellt wurden)
+                # Skills neu laden (falls neue erstellt wurden) → Skill-Lücken neu berechnen
                 self.kernel.load_skills()
+                self.prefetcher.wake(refresh_context=True)
 
                 # Snapshot prüfen
                 self._maybe_snapshot()
@@ -279,12 +329,112 @@ class FullAutonomyOrchestrator:
                 self.tracker.record_error()
                 self._stop.wait(timeout=60)   # Kurze Pause bei Fehler
 
+    def _run_worker(self, goal: GeneratedGoal) -> None:
+        """Ein Ziel in eigener Loop-Instanz mit isoliertem Kernel-Chat-Zustand ausführen."""
+        loop = FullAutonomyLoop(
+            kernel=self.kernel.worker_view(),
+            max_iterations=Config.MAX_ITERATIONS,
+            verbose=False,
+            evolution_tracker=self.tracker,
+        )
+        with self._stats_lock:
+            self.active_loops[goal.id] = loop
+        try:
+            self._execute_goal(goal, loop)
+        finally:
+            with self._stats_lock:
+                self.active_loops.pop(goal.id, None)
+
+    def _run_parallel(self) -> None:
+        """
+        Worker-Pool-Modus: bis zu PARALLEL_GOALS Ziele gleichzeitig.
+        Das Tempo steuert der Dispatcher: zwischen zwei Starts liegen
+        CYCLE_PAUSE_SECONDS / PARALLEL_GOALS Sekunden – Pool-Threads schlafen nie.
+        """
+        workers    = Config.PARALLEL_GOALS
+        running    = {}   # Future → GeneratedGoal
+        interval   = Config.CYCLE_PAUSE_SECONDS / max(1, workers)
+        next_start = 0.0  # frühester Zeitpunkt für den nächsten Start
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="goal") as pool:
+            while not self._stop.is_set():
+                try:
+                    # Freie Worker mit neuen Zielen füllen (sobald der Zeitplan es erlaubt)
+                    while (len(running) < workers and not self._stop.is_set()
+                           and time.time() >= next_start):
+                        # Beanspruchte Ziele überspringt der Scheduler selbst
+                        next_goal = self._claim_goal(wait_timeout=0 if running else 60)
+                        if not next_goal:
+                            break
+                        self.cycle_count += 1
+                        logger.info(f"ZYKLUS #{self.cycle_count} → Worker startet: {next_goal.goal[:80]}")
+                        running[pool.submit(self._run_worker, next_goal)] = next_goal
+                        next_start = time.time() + interval
+
+                    until_start = next_start - time.time()
+                    if not running:
+                        if until_start > 0:
+                            self._stop.wait(timeout=until_start)
+                        else:
+                            logger.warning("Keine Ziele verfügbar – warte...")
+                            self._stop.wait(timeout=Config.CYCLE_PAUSE_SECONDS)
+                        continue
+
+                    # Bei freiem Slot nur bis zum nächsten geplanten Start warten
+                    timeout = 5.0 if len(running) >= workers else max(0.1, min(5.0, until_start))
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        goal = running.pop(future)
+                        if future.exception():
+                            logger.error(f"Worker-Fehler bei '{goal.goal[:60]}': {future.exception()}")
+                            self.tracker.record_error()
+
+                    if done:
+                        # Skills neu laden (falls neue erstellt wurden) + Snapshot prüfen
+                        self.kernel.load_skills()
+                        self.prefetcher.wake(refresh_context=True)
+                        self._maybe_snapshot()
+
+                except Exception as e:
+                    logger.error(f"Orchestrator-Fehler (Zyklus #{self.cycle_count}): {e}", exc_info=True)
+                    self.tracker.record_error()
+                    self._stop.wait(timeout=60)
+
+            # Shutdown: laufende Ziele sauber abbrechen
+            with self._stats_lock:
+                for loop in self.active_loops.values():
+                    loop.abort()
+
+    def run(self) -> None:
+        """Permanenter Hauptloop."""
+        # Graceful Shutdown
+        signal.signal(signal.SIGINT,  lambda s, f: self._stop.set())
+        signal.signal(signal.SIGTERM, lambda s, f: self._stop.set())
+
+        logger.info("🚀 Full_Autonomy_Edition gestartet. Ilija arbeitet jetzt autonom.")
+        logger.info(f"Konfiguration: batch={Config.GOAL_BATCH_SIZE} | "
+                    f"max_iter={Config.MAX_ITERATIONS} | "
+                    f"pause={Config.CYCLE_PAUSE_SECONDS}s | "
+                    f"worker={Config.PARALLEL_GOALS}")
+
+        self.prefetcher.start()
+        if Config.PARALLEL_GOALS > 1:
+            self._run_parallel()
+        else:
+            self._run_sequential()
+        self.prefetcher.stop()
+
         # Shutdown
         logger.info("\n🛑 Full_Autonomy_Edition beendet.")
         self._print_stats()
 
         # Finaler Snapshot
         self.tracker.take_snapshot(goal_engine=self.goals)
+
+        # Ausstehende Gedächtnis-Einträge schreiben
+        from memory_service import get_memory_service
+        if not get_memory_service().flush(timeout=60):
+            logger.warning("Gedächtnis: nicht alle ausstehenden Einträge geschrieben")
         logger.info("Finaler Snapshot gespeichert. Auf Wiedersehen.")
 
 
@@ -308,6 +458,8 @@ def main():
                         help="Max Iterationen pro Ziel")
     parser.add_argument("--web",      action="store_true",
                         help="Web-Dashboard starten (Port 5000)")
+    parser.add_argument("--workers",  type=int, default=None,
+                        help="Anzahl parallel ausgeführter Ziele")
     args = parser.parse_args()
 
     # CLI-Argumente überschreiben Config
@@ -321,6 +473,10 @@ def main():
         os.environ["MAX_ITERATIONS"] = str(args.max_iter)
     if args.web:
         os.environ["WEB_INTERFACE"] = "true"
+    if args.workers:
+        os.environ["PARALLEL_GOALS"] = str(args.workers)
+        Config.PARALLEL_GOALS     = max(1, args.workers)
+        Config.LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", str(Config.PARALLEL_GOALS)))
 
     FullAutonomyOrchestrator().run()
 
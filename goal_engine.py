@@ -21,14 +21,37 @@ Ziel-Kategorien:
 import json
 import logging
 import random
+import threading
 import time
+from collections import Counter
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum, auto
 from typing import List, Optional, Dict, Any
 
+from event_bus import publish
+from goal_store import GoalStore
+from goal_scheduler import GoalScheduler, MAX_ATTEMPTS, QUOTA_WINDOW, retry_delay
+from goal_similarity import DUPLICATE_THRESHOLD, GoalSimilarityIndex, signature, similarity
+
 logger = logging.getLogger(__name__)
 
+REPEAT_COOLDOWN_DAYS = 7   # Ähnliches erfolgreiches Ziel → so lange nicht wiederholen
+MAX_SIMILAR_FAILURES = 4   # Fehlversuche über alle äquivalenten Ziele hinweg
+
+# Domäne → Skills, die sie abdecken (für die Skill-Lücken-Analyse)
+SKILL_DOMAINS = {
+    "Datei-IO": ("datei_lesen", "datei_schreiben", "datei_loeschen"),
+    "Web": ("webseiten_inhalt_lesen", "internet_suchen", "http_request"),
+    "System": ("cmd_ausfuehren", "prozess_starten", "umgebung_lesen"),
+    "Gedächtnis": ("wissen_speichern", "wissen_abrufen", "wissen_loeschen"),
+    "Analyse": ("text_analysieren", "daten_analysieren", "muster_erkennen"),
+    "Selbstentwicklung": ("skill_erstellen", "skill_testen", "skill_optimieren"),
+    "Kommunikation": ("moltbook_posten", "telegram_senden"),
+    "Zeit": ("zeitplan_erstellen", "erinnerung_setzen", "cron_job"),
+    "Metriken": ("performance_messen", "statistik_erstellen"),
+}
+
 
 class GoalCategory(Enum):
     SELF_EXPAND  = "self_expand"
@@ -50,6 +73,11 @@ class GeneratedGoal:
     completed:   bool = False
     outcome:     Optional[str] = None
     score:       Optional[float] = None
+    deadline:     Optional[str] = None   # ISO – danach wird das Ziel verworfen
+    attempts:     int = 0                # Fehlversuche bisher
+    not_before:   Optional[str] = None   # ISO – Retry-Back-off
+    last_started: Optional[str] = None
+    succeeded:    Optional[bool] = None
 
 
 GOAL_SYSTEM_PROMPT = """Du bist Ilijias Goal Engine. Du bist Ilija selbst, der seine nächsten Entwicklungsziele generiert.
@@ -83,10 +111,13 @@ Antworte NUR mit validem JSON:
       "goal": "Konkretes Ziel in einem Satz",
       "category": "self_expand|self_improve|explore|reflect|interact|create",
       "priority": 8,
-      "reasoning": "Warum dieses Ziel jetzt wichtig ist"
+      "reasoning": "Warum dieses Ziel jetzt wichtig ist",
+      "deadline_hours": null
     }
   ]
-}"""
+}
+
+deadline_hours nur setzen wenn das Ziel nach einigen Stunden wertlos wird (z.B. aktuelle News)."""
 
 
 GOAL_EXAMPLES = {
@@ -139,6 +170,15 @@ GOAL_EXAMPLES = {
 }
 
 
+@dataclass
+class GoalContext:
+    """Vorberechneter Kontext für den Ziel-Prompt (teuer: ChromaDB + Skill-Prompt)."""
+    skills_text:        str
+    skill_gaps:         str
+    knowledge_snippets: str
+    built_at:           float = field(default_factory=time.time)
+
+
 class GoalEngine:
     """
     Generiert autonome Selbstentwicklungsziele für Ilija.
@@ -149,80 +189,176 @@ class GoalEngine:
         self.kernel      = kernel
         self.memory_path = memory_path
         self.past_goals: List[GeneratedGoal] = []
+        self._by_id: Dict[str, GeneratedGoal] = {}
+        self.similarity  = GoalSimilarityIndex()
+        self.store       = GoalStore(memory_path)   # Snapshot + append-only Event-Log
+        self._lock = threading.RLock()   # Multi-Goal-Worker teilen sich die Engine
+        self.scheduler = GoalScheduler(on_expire=self._expire_goal)
+        self._context: Optional[GoalContext] = None   # von refresh_context() befüllt
+        # Laufende Zähler für stats() – werden bei Einreihen/Abschluss gepflegt
+        self._completed_count = 0
+        self._by_category: Counter = Counter()
+        self._score_sum   = 0.0
+        self._score_count = 0
+        self._skill_gaps: Optional[tuple] = None   # (names_version, Analyse)
         self._load_history()
+        self._init_scheduler()
 
     def _load_history(self) -> None:
-        """Lädt vergangene Ziele aus der Persistenz."""
-        import os
-        if os.path.exists(self.memory_path):
-            try:
-                with open(self.memory_path, encoding="utf-8") as f:
-                    data = json.load(f)
-                for g in data:
-                    self.past_goals.append(GeneratedGoal(
-                        id=g.get("id", ""),
-                        goal=g.get("goal", ""),
-                        category=GoalCategory(g.get("category", "explore")),
-                        priority=g.get("priority", 5),
-                        reasoning=g.get("reasoning", ""),
-                        created_at=g.get("created_at", ""),
-                        completed=g.get("completed", False),
-                        outcome=g.get("outcome"),
-                        score=g.get("score"),
-                    ))
-                logger.info(f"GoalEngine: {len(self.past_goals)} vergangene Ziele geladen")
-            except Exception as e:
-                logger.warning(f"Goal-History laden fehlgeschlagen: {e}")
-
-    def _save_history(self) -> None:
-        """Speichert alle Ziele persistent."""
-        import os
-        os.makedirs(os.path.dirname(self.memory_path) or ".", exist_ok=True)
+        """Lädt vergangene Ziele aus Snapshot + Event-Log."""
         try:
-            data = [
-                {
-                    "id": g.id,
-                    "goal": g.goal,
-                    "category": g.category.value,
-                    "priority": g.priority,
-                    "reasoning": g.reasoning,
-                    "created_at": g.created_at,
-                    "completed": g.completed,
-                    "outcome": g.outcome,
-                    "score": g.score,
-                }
-                for g in self.past_goals
-            ]
-            with open(self.memory_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            for g in self.store.load():
+                self.past_goals.append(GeneratedGoal(
+                    id=g.get("id", ""),
+                    goal=g.get("goal", ""),
+                    category=GoalCategory(g.get("category", "explore")),
+                    priority=g.get("priority", 5),
+                    reasoning=g.get("reasoning", ""),
+                    created_at=g.get("created_at", ""),
+                    completed=g.get("completed", False),
+                    outcome=g.get("outcome"),
+                    score=g.get("score"),
+                    deadline=g.get("deadline"),
+                    attempts=g.get("attempts", 0),
+                    not_before=g.get("not_before"),
+                    last_started=g.get("last_started"),
+                    succeeded=g.get("succeeded"),
+                ))
+            for g in self.past_goals:
+                self._index_goal(g)
+            logger.info(f"GoalEngine: {len(self.past_goals)} vergangene Ziele geladen")
         except Exception as e:
-            logger.error(f"Goal-History speichern fehlgeschlagen: {e}")
+            logger.warning(f"Goal-History laden fehlgeschlagen: {e}")
 
-    def _get_skill_gaps(self) -> str:
-        """Analysiert welche Fähigkeiten fehlen oder schwach sind."""
-        skills = list(self.kernel.manager.loaded_tools.keys())
-        domains_missing = []
-
-        domain_checks = {
-            "Datei-IO": ["datei_lesen", "datei_schreiben", "datei_loeschen"],
-            "Web": ["webseiten_inhalt_lesen", "internet_suchen", "http_request"],
-            "System": ["cmd_ausfuehren", "prozess_starten", "umgebung_lesen"],
-            "Gedächtnis": ["wissen_speichern", "wissen_abrufen", "wissen_loeschen"],
-            "Analyse": ["text_analysieren", "daten_analysieren", "muster_erkennen"],
-            "Selbstentwicklung": ["skill_erstellen", "skill_testen", "skill_optimieren"],
-            "Kommunikation": ["moltbook_posten", "telegram_senden"],
-            "Zeit": ["zeitplan_erstellen", "erinnerung_setzen", "cron_job"],
-            "Metriken": ["performance_messen", "statistik_erstellen"],
+    @staticmethod
+    def _goal_record(g: GeneratedGoal) -> Dict:
+        return {
+            "id": g.id,
+            "goal": g.goal,
+            "category": g.category.value,
+            "priority": g.priority,
+            "reasoning": g.reasoning,
+            "created_at": g.created_at,
+            "completed": g.completed,
+            "outcome": g.outcome,
+            "score": g.score,
+            "deadline": g.deadline,
+            "attempts": g.attempts,
+            "not_before": g.not_before,
+            "last_started": g.last_started,
+            "succeeded": g.succeeded,
         }
 
-        for domain, required_skills in domain_checks.items():
+    def _index_goal(self, g: GeneratedGoal) -> None:
+        self._by_id[g.id] = g
+        self.similarity.add(g.id, g.goal)
+        self._by_category[g.category.value] += 1
+        if g.completed:
+            self._completed_count += 1
+        if g.score is not None:
+            self._score_sum   += g.score
+            self._score_count += 1
+
+    def _set_score(self, goal: GeneratedGoal, score: Optional[float]) -> None:
+        """Score setzen und die Score-Summe für stats() nachführen."""
+        if goal.score is not None:
+            self._score_sum   -= goal.score
+            self._score_count -= 1
+        goal.score = score
+        if score is not None:
+            self._score_sum   += score
+            self._score_count += 1
+
+    def _mark_completed(self, goal: GeneratedGoal, succeeded: bool) -> None:
+        if not goal.completed:
+            self._completed_count += 1
+        goal.completed = True
+        goal.succeeded = succeeded
+
+    def _screen_candidate(self, text: str, priority: int, batch: list) -> bool:
+        """
+        Prüft ein neu generiertes Ziel gegen alle bisherigen Ziele.
+        Beinahe-Duplikate eines offenen Ziels werden hineingemergt (Priorität
+        übernehmen), kürzlich erfolgreiche oder wiederholt gescheiterte
+        Äquivalente verworfen. Returns True wenn das Ziel neu genug ist.
+        """
+        sig = signature(text)
+        if any(similarity(sig, other) >= DUPLICATE_THRESHOLD for other in batch):
+            return False
+
+        cutoff   = (datetime.now() - timedelta(days=REPEAT_COOLDOWN_DAYS)).isoformat()
+        failures = 0
+        with self._lock:
+            for goal_id, sim in self.similarity.similar(text, sig=sig):
+                g = self._by_id.get(goal_id)
+                if g is None:
+                    continue
+                if not g.completed:
+                    self._merge_duplicate(g, priority)
+                    logger.info(f"GoalEngine: Duplikat ({sim:.2f}) von offenem Ziel gemergt – {text[:60]}")
+                    return False
+                if g.succeeded and (g.last_started or g.created_at) >= cutoff:
+                    logger.info(f"GoalEngine: Kürzlich erledigt ({sim:.2f}) – verworfen: {text[:60]}")
+                    return False
+                failures += g.attempts
+
+        if failures >= MAX_SIMILAR_FAILURES:
+            logger.info(f"GoalEngine: {failures} Fehlversuche äquivalenter Ziele – verworfen: {text[:60]}")
+            return False
+
+        batch.append(sig)
+        return True
+
+    def _merge_duplicate(self, goal: GeneratedGoal, priority: int) -> None:
+        """Beinahe-Duplikat in offenes Ziel überführen: höhere Priorität gewinnt."""
+        if priority <= goal.priority:
+            return
+        goal.priority = priority
+        self.scheduler.requeue(goal)
+        self.store.append("merged", goal.id, {"priority": priority})
+
+    def _init_scheduler(self) -> None:
+        """Offene Ziele in den Scheduler laden und das Quoten-Fenster rekonstruieren."""
+        for g in self.past_goals:
+            if not g.completed:
+                self.scheduler.push(g)
+        started = sorted((g for g in self.past_goals if g.last_started), key=lambda g: g.last_started)
+        for g in started[-QUOTA_WINDOW:]:
+            self.scheduler.note_started(g.category.value)
+
+    def _expire_goal(self, goal: GeneratedGoal) -> None:
+        """Callback des Schedulers: Deadline verstrichen."""
+        self._mark_completed(goal, succeeded=False)
+        goal.outcome = "Deadline verpasst – nicht ausgeführt"
+        self.store.append("completed", goal.id, {
+            "completed": True, "succeeded": False, "outcome": goal.outcome,
+        })
+
+    def _get_skill_gaps(self) -> str:
+        """
+        Analysiert welche Fähigkeiten fehlen oder schwach sind.
+        Gecacht nach SkillManager.names_version – die steigt nur, wenn sich
+        die Menge der Skill-Namen ändert (nicht bei jedem Reload).
+        """
+        manager = self.kernel.manager
+        version = manager.names_version
+        cached  = self._skill_gaps
+        if cached and cached[0] == version:
+            return cached[1]
+        skills = manager.loaded_tools
+
+        domains_missing = []
+        for domain, required_skills in SKILL_DOMAINS.items():
             covered = sum(1 for s in required_skills if s in skills)
             if covered < len(required_skills) // 2:
                 domains_missing.append(f"{domain} (nur {covered}/{len(required_skills)} abgedeckt)")
 
         if domains_missing:
-            return "Lücken in: " + ", ".join(domains_missing)
-        return "Alle bekannten Domänen grundlegend abgedeckt"
+            gaps = "Lücken in: " + ", ".join(domains_missing)
+        else:
+            gaps = "Alle bekannten Domänen grundlegend abgedeckt"
+        self._skill_gaps = (version, gaps)
+        return gaps
 
     def _get_knowledge_snippets(self) -> str:
         """Holt relevante Gedächtnis-Snippets für Ziel-Generierung."""
@@ -233,6 +369,22 @@ class GoalEngine:
         except Exception:
             return "Gedächtnis nicht zugänglich."
 
+    def refresh_context(self) -> GoalContext:
+        """Berechnet Skill-Prompt, Skill-Lücken und Wissens-Snippets neu."""
+        context = GoalContext(
+            skills_text=self.kernel.manager.get_system_prompt_addition()[:2000],
+            skill_gaps=self._get_skill_gaps(),
+            knowledge_snippets=self._get_knowledge_snippets(),
+        )
+        self._context = context
+        return context
+
+    def context_age(self) -> float:
+        """Sekunden seit der letzten Kontext-Berechnung (inf wenn noch keine)."""
+        if self._context is None:
+            return float("inf")
+        return time.time() - self._context.built_at
+
     def _get_past_goals_summary(self) -> str:
         """Erstellt eine Zusammenfassung vergangener Ziele."""
         if not self.past_goals:
@@ -250,26 +402,27 @@ class GoalEngine:
         Generiert neue Selbstentwicklungsziele.
         Nutzt LLM für kontextbewusste Ziele, Fallback auf Vorlagen.
         """
-        # Schon vorhandene Ziel-Texte sammeln (Duplikate vermeiden)
-        existing = {g.goal.lower().strip() for g in self.past_goals if not g.completed}
+        # Signaturen der Ziele dieses Batches (Duplikate untereinander vermeiden)
+        batch: list = []
 
         if use_llm:
-            goals = self._generate_via_llm(count, existing)
+            goals = self._generate_via_llm(count, batch)
             if goals:
                 return goals
 
         # Fallback: Template-basierte Ziele
-        return self._generate_from_templates(count, existing)
+        return self._generate_from_templates(count, batch)
 
-    def _generate_via_llm(self, count: int, existing: set) -> List[GeneratedGoal]:
+    def _generate_via_llm(self, count: int, batch: list) -> List[GeneratedGoal]:
         """Nutzt das LLM zur kontextbewussten Ziel-Generierung."""
         try:
-            skills_text = self.kernel.manager.get_system_prompt_addition()
+            # Vorberechneten Kontext nutzen (GoalPrefetcher), sonst jetzt berechnen
+            context = self._context or self.refresh_context()
             prompt = GOAL_SYSTEM_PROMPT.format(
-                skills=skills_text[:2000],
+                skills=context.skills_text,
                 past_goals=self._get_past_goals_summary(),
-                knowledge_snippets=self._get_knowledge_snippets(),
-                skill_gaps=self._get_skill_gaps(),
+                knowledge_snippets=context.knowledge_snippets,
+                skill_gaps=context.skill_gaps,
                 count=count,
             )
 
@@ -286,18 +439,23 @@ class GoalEngine:
             goals = []
             for item in data.get("goals", []):
                 goal_text = item.get("goal", "").strip()
-                if not goal_text or goal_text.lower() in existing:
+                priority  = int(item.get("priority", 5))
+                if not goal_text or not self._screen_candidate(goal_text, priority, batch):
                     continue
 
+                deadline = None
+                if item.get("deadline_hours"):
+                    deadline = (datetime.now() + timedelta(hours=float(item["deadline_hours"]))).isoformat()
+
                 g = GeneratedGoal(
                     id=f"goal_{int(time.time())}_{random.randint(1000,9999)}",
                     goal=goal_text,
                     category=GoalCategory(item.get("category", "explore")),
-                    priority=int(item.get("priority", 5)),
+                    priority=priority,
                     reasoning=item.get("reasoning", ""),
+                    deadline=deadline,
                 )
                 goals.append(g)
-                existing.add(goal_text.lower())
 
             logger.info(f"GoalEngine: {len(goals)} Ziele via LLM generiert")
             return goals
@@ -306,7 +464,7 @@ class GoalEngine:
             logger.warning(f"LLM-Ziel-Generierung fehlgeschlagen: {e}")
             return []
 
-    def _generate_from_templates(self, count: int, existing: set) -> List[GeneratedGoal]:
+    def _generate_from_templates(self, count: int, batch: list) -> List[GeneratedGoal]:
         """Fallback: Ziele aus Vorlagen generieren."""
         goals = []
         categories = list(GoalCategory)
@@ -320,66 +478,116 @@ class GoalEngine:
             if not pool:
                 continue
 
-            text = random.choice(pool)
-            if text.lower() in existing:
+            text     = random.choice(pool)
+            priority = random.randint(4, 9)
+            if not self._screen_candidate(text, priority, batch):
                 continue
 
             g = GeneratedGoal(
                 id=f"goal_{int(time.time())}_{random.randint(1000,9999)}",
                 goal=text,
                 category=cat,
-                priority=random.randint(4, 9),
+                priority=priority,
                 reasoning="Template-basiert generiert (kein LLM verfügbar)",
             )
             goals.append(g)
-            existing.add(text.lower())
 
         logger.info(f"GoalEngine: {len(goals)} Ziele aus Templates generiert")
         return goals
 
-    def record_outcome(self, goal: GeneratedGoal, outcome: str, score: float) -> None:
-        """Speichert das Ergebnis eines abgeschlossenen Ziels."""
-        goal.completed = True
-        goal.outcome   = outcome
-        goal.score     = score
+    def record_outcome(self, goal: GeneratedGoal, outcome: str, score: float,
+                       success: bool = True) -> None:
+        """
+        Speichert das Ergebnis eines abgeschlossenen Ziels.
+        Fehlgeschlagene Ziele werden mit exponentiellem Back-off erneut eingereiht,
+        bis MAX_ATTEMPTS erreicht ist.
+        """
+        with self._lock:
+            goal.outcome = outcome
+            self._set_score(goal, score)
+            if not success:
+                goal.attempts += 1
+            if not success and goal.attempts < MAX_ATTEMPTS:
+                delay = retry_delay(goal.attempts)
+                goal.not_before = (datetime.now() + timedelta(seconds=delay)).isoformat()
+                self.scheduler.push(goal)
+                self.store.append("retry", goal.id, {
+                    "outcome": outcome, "score": score,
+                    "attempts": goal.attempts, "not_before": goal.not_before,
+                })
+                logger.info(f"GoalEngine: Retry {goal.attempts}/{MAX_ATTEMPTS} in {delay/60:.0f} min – {goal.goal[:60]}")
+            else:
+                self._mark_completed(goal, succeeded=success)
+                self.scheduler.complete(goal)
+                self.store.append("completed", goal.id, {
+                    "completed": True, "succeeded": success,
+                    "outcome": outcome, "score": score, "attempts": goal.attempts,
+                })
+
+        publish("goals", self.stats())
 
         # In Langzeit-Gedächtnis speichern
         try:
-            from skills.gedaechtnis import wissen_speichern
+            from memory_service import get_memory_service, build_metadata
             memory_text = (
                 f"Ziel abgeschlossen [{goal.category.value}]: {goal.goal}. "
                 f"Ergebnis: {outcome[:200]}. Score: {score:.1f}/10."
             )
-            wissen_speichern(memory_text)
+            get_memory_service().enqueue(memory_text, build_metadata(
+                "goal", goal_id=goal.id, category=goal.category.value,
+                importance=score / 10, score=score, success=success,
+            ))
         except Exception:
             pass
 
-        self._save_history()
-
-    def get_next_goal(self) -> Optional[GeneratedGoal]:
-        """Gibt das nächste unerledigte Ziel nach Priorität zurück."""
-        pending = [g for g in self.past_goals if not g.completed]
-        if not pending:
-            return None
-        return sorted(pending, key=lambda g: -g.priority)[0]
+    def get_next_goal(self, exclude: Optional[set] = None) -> Optional[GeneratedGoal]:
+        """
+        Beansprucht das nächste Ziel (Priorität + Aging, Quoten, Deadlines, Back-off).
+        Das Ziel bleibt beansprucht bis record_outcome() oder release_goal().
+        exclude: zusätzliche IDs die übersprungen werden sollen.
+        """
+        with self._lock:
+            goal = self.scheduler.pop(exclude)
+            if goal:
+                goal.last_started = datetime.now().isoformat()
+                self.store.append("started", goal.id, {"last_started": goal.last_started})
+            return goal
+
+    def release_goal(self, goal: GeneratedGoal) -> None:
+        """Gibt ein beanspruchtes Ziel ohne Ergebnis zurück in die Queue."""
+        with self._lock:
+            self.scheduler.release(goal)
+
+    def pending_goals(self) -> List[GeneratedGoal]:
+        """Alle unerledigten Ziele (wartend, im Back-off oder in Bearbeitung)."""
+        with self._lock:
+            return self.scheduler.pending()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self.scheduler)
+
+    def ready_count(self) -> int:
+        """Sofort startbare Ziele (ohne Back-off und ohne laufende)."""
+        with self._lock:
+            return self.scheduler.ready_count()
 
     def queue_goals(self, goals: List[GeneratedGoal]) -> None:
         """Fügt neue Ziele zur Queue hinzu und speichert sie."""
-        self.past_goals.extend(goals)
-        self._save_history()
+        with self._lock:
+            self.past_goals.extend(goals)
+            for g in goals:
+                self.scheduler.push(g)
+                self._index_goal(g)
+                self.store.append("created", g.id, self._goal_record(g))
 
     def stats(self) -> Dict:
-        """Statistiken über bisherige Ziele."""
-        total     = len(self.past_goals)
-        completed = sum(1 for g in self.past_goals if g.completed)
-        by_cat    = {}
-        for g in self.past_goals:
-            by_cat[g.category.value] = by_cat.get(g.category.value, 0) + 1
-
-        avg_score = 0.0
-        scores = [g.score for g in self.past_goals if g.score is not None]
-        if scores:
-            avg_score = sum(scores) / len(scores)
+        """Statistiken über bisherige Ziele (O(1) – aus laufenden Zählern)."""
+        with self._lock:
+            total     = len(self.past_goals)
+            completed = self._completed_count
+            by_cat    = dict(self._by_category)
+            avg_score = self._score_sum / self._score_count if self._score_count else 0.0
 
         return {
             "total":        total,
@@ -0,0 +1,252 @@
+"""
+Ilija Full_Autonomy_Edition – Goal Jobs
+========================================
+Asynchrone Ziel-Läufe für das Web-Interface.
+
+/api/goal führte bisher einen kompletten FullAutonomyLoop innerhalb des
+HTTP-Requests aus – ein Lauf mit 10 Iterationen blockierte einen
+Server-Thread minutenlang. Jetzt:
+
+  submit()  → legt einen Job an und gibt sofort die Job-ID zurück
+  Executor  → begrenzter Thread-Pool (GOAL_JOB_WORKERS), Rest wartet
+  Events    → plan / step / evaluation / finished aus dem Loop
+              (on_event) landen nummeriert im Job; wait_events() blockiert
+              bis Neues vorliegt – Grundlage für den SSE-Stream
+  cancel()  → wartender Job wird verworfen, laufender bricht nach dem
+              aktuellen Schritt ab (FullAutonomyLoop.abort)
+  Admission → LLM-Aufrufe der Jobs teilen sich die globalen Slots mit dem
+              Chat (admission.AdmittedProvider); sind die voll, lehnt
+              submit() neue Jobs mit Saturated ab
+
+Abgeschlossene Jobs bleiben bis MAX_JOBS abrufbar (älteste fliegen zuerst).
+"""
+
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+from admission import AdmissionController, AdmittedProvider, get_admission
+from event_bus import publish
+from full_autonomy_loop import FullAutonomyLoop, LoopStatus
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS    = 2
+MAX_PENDING    = 20     # wartende + laufende Jobs
+MAX_JOBS       = 200    # inkl. abgeschlossener Jobs
+MAX_EVENTS     = 500    # pro Job (älteste Events fallen heraus)
+MAX_ITERATIONS = 10
+MAX_GOAL_ITERATIONS = 50   # Obergrenze pro Job (wie der Safety-Standard des Loops)
+
+QUEUED    = "queued"
+RUNNING   = "running"
+DONE      = "done"
+FAILED    = "failed"
+CANCELLED = "cancelled"
+FINAL     = (DONE, FAILED, CANCELLED)
+
+
+class JobQueueFull(RuntimeError):
+    """Zu viele offene Jobs – neuer Job wird abgelehnt."""
+
+
+class GoalJob:
+    """Ein Ziel-Lauf samt Status, Ergebnis und nummerierten Fortschritts-Events."""
+
+    def __init__(self, goal: str, session_id: Optional[str] = None):
+        self.id           = secrets.token_hex(8)
+        self.goal         = goal
+        self.session_id   = session_id
+        self.status       = QUEUED
+        self.created_at   = time.time()
+        self.started_at: Optional[float]  = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str]   = None
+        self.result: Optional[Dict] = None
+        self.loop: Optional[FullAutonomyLoop] = None
+        self.cancel_requested = False
+        self.future           = None
+        self._seq    = 0
+        self._events: Deque[Tuple[int, str, Dict]] = deque(maxlen=MAX_EVENTS)
+        self._cond   = threading.Condition()
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def push(self, kind: str, data: Dict) -> None:
+        if self.cancel_requested and self.loop:
+            self.loop.abort()
+        with self._cond:
+            self._seq += 1
+            self._events.append((self._seq, kind, data))
+            self._cond.notify_all()
+
+    def wait_events(self, since: int = 0, timeout: float = 15.0) -> List[Tuple[int, str, Dict]]:
+        """Events mit Nummer > since; wartet bis zu timeout auf neue (leer = Keepalive)."""
+        with self._cond:
+            if self._seq <= since and not self.finished:
+                self._cond.wait(timeout)
+            return [e for e in self._events if e[0] > since]
+
+    def _set_status(self, status: str, **fields) -> None:
+        with self._cond:
+            self.status = status
+            for name, value in fields.items():
+                setattr(self, name, value)
+        self.push("status", {"status": status})
+        publish("job", {"job_id": self.id, "goal": self.goal, "status": status}, self.session_id)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL
+
+    # ------------------------------------------------------------------
+    # Darstellung
+    # ------------------------------------------------------------------
+
+    def status_dict(self) -> Dict:
+        info = {
+            "job_id":      self.id,
+            "goal":        self.goal,
+            "status":      self.status,
+            "created_at":  self.created_at,
+            "started_at":  self.started_at,
+            "finished_at": self.finished_at,
+            "error":       self.error,
+            "events":      self._seq,
+        }
+        if self.loop:
+            loop = self.loop.get_status_dict()
+            loop.pop("history", None)
+            info["loop"] = loop
+        return info
+
+
+class GoalJobManager:
+    """Begrenzter Executor für Ziel-Läufe aus dem Web-Interface."""
+
+    def __init__(self, workers: int = JOB_WORKERS, max_pending: int = MAX_PENDING,
+                 max_jobs: int = MAX_JOBS, admission: Optional[AdmissionController] = None):
+        self.workers     = workers
+        self.max_pending = max_pending
+        self.max_jobs    = max_jobs
+        self.admission   = admission
+        self._pool  = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="goal-job")
+        self._jobs: "OrderedDict[str, GoalJob]" = OrderedDict()
+        self._lock  = threading.Lock()
+
+    def submit(self, kernel, goal: str, session_id: Optional[str] = None,
+               max_iterations: int = MAX_ITERATIONS) -> GoalJob:
+        """Reiht einen Ziel-Lauf ein. Raises: JobQueueFull, Saturated."""
+        max_iterations = max(1, min(int(max_iterations), MAX_GOAL_ITERATIONS))
+        if self.admission is not None:
+            self.admission.check()
+        job = GoalJob(goal, session_id)
+        with self._lock:
+            if sum(1 for j in self._jobs.values() if not j.finished) >= self.max_pending:
+                raise JobQueueFull(f"Zu viele offene Jobs (max. {self.max_pending})")
+            self._jobs[job.id] = job
+            self._prune_locked()
+        job.future = self._pool.submit(self._run, job, kernel, max_iterations)
+        logger.info(f"Goal-Job {job.id} eingereiht: {goal[:80]}")
+        return job
+
+    def _prune_locked(self) -> None:
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [j.id for j in self._jobs.values() if j.finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: GoalJob, kernel, max_iterations: int) -> None:
+        if job.cancel_requested:
+            job._set_status(CANCELLED, finished_at=time.time())
+            return
+        # Eigene Kernel-Sicht: der Lauf teilt Skills/Provider, nicht den Chat-Zustand
+        view = kernel.worker_view()
+        if self.admission is not None:
+            view.provider = AdmittedProvider(view.provider, self.admission)
+        job.loop = FullAutonomyLoop(view, max_iterations=max_iterations,
+                                    verbose=False, on_event=job.push)
+        job._set_status(RUNNING, started_at=time.time())
+        try:
+            session = job.loop.run(job.goal)
+        except Exception as e:
+            logger.error(f"Goal-Job {job.id} Fehler: {e}", exc_info=True)
+            job._set_status(FAILED, error=str(e), finished_at=time.time())
+            return
+
+        job.result = {
+            "status":      session.status.value,
+            "goal":        session.goal,
+            "summary":     session.final_summary,
+            "iterations":  session.iteration,
+            "steps_total": len(session.plan),
+            "steps_done":  sum(1 for s in session.plan if s.status.value == "done"),
+            "score":       session.score,
+            "history":     session.history,
+            "provider":    kernel.provider_name,
+        }
+        # Ergebnis in den Chat-Verlauf der Session übernehmen
+        with kernel.chat_lock:
+            kernel.chat_history.append({"role": "user",      "content": f"[Autonomy Loop] {job.goal}"})
+            kernel.chat_history.append({"role": "assistant", "content": session.final_summary or ""})
+        status = CANCELLED if session.status == LoopStatus.ABORTED else DONE
+        job._set_status(status, finished_at=time.time())
+        logger.info(f"Goal-Job {job.id} beendet: {session.status.value}")
+
+    # ------------------------------------------------------------------
+    # Abfragen / Steuerung
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: str) -> Optional[GoalJob]:
+        return self._jobs.get(job_id)
+
+    def latest_for_session(self, session_id: Optional[str]) -> Optional[GoalJob]:
+        if not session_id:
+            return None
+        with self._lock:
+            for job in reversed(self._jobs.values()):
+                if job.session_id == session_id:
+                    return job
+        return None
+
+    def cancel(self, job_id: str) -> Optional[GoalJob]:
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancel_requested = True
+        if job.future is not None and job.future.cancel():
+            job._set_status(CANCELLED, finished_at=time.time())
+        elif job.loop:
+            job.loop.abort()
+        return job
+
+    def stats(self) -> Dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "workers": self.workers,
+            "queued":  sum(1 for j in jobs if j.status == QUEUED),
+            "running": sum(1 for j in jobs if j.status == RUNNING),
+            "stored":  len(jobs),
+        }
+
+
+# ── Singleton ──────────────────────────────────────────────────
+
+_manager: Optional[GoalJobManager] = None
+_manager_lock = threading.Lock()
+
+def get_goal_jobs() -> GoalJobManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = GoalJobManager(workers=int(os.getenv("GOAL_JOB_WORKERS", str(JOB_WORKERS))),
+                                          admission=get_admission())
+    return _manager
@@ -0,0 +1,139 @@
+"""
+Ilija Full_Autonomy_Edition – Goal Prefetcher
+==============================================
+Hält die Ziel-Queue im Hintergrund gefüllt.
+
+Bisher lief die Ziel-Generierung (LLM-Aufruf, ChromaDB-Abfrage,
+Skill-Prompt) synchron am Anfang jedes Zyklus – das ausführende Ziel
+musste darauf warten. Der Prefetcher erledigt das in einem eigenen Thread:
+
+  - Fällt die Zahl sofort startbarer Ziele unter low_water, wird ein neuer Batch
+    erzeugt und eingereiht – bevor der Executor danach fragt.
+  - Der Generierungs-Kontext (Skill-Lücken, Wissens-Snippets, Skill-Prompt)
+    wird im eigenen Takt vorberechnet (GoalEngine.refresh_context).
+  - Der Executor ruft nur get_next_goal(); ist die Queue wirklich leer,
+    wartet er mit wait_for_goals() auf den nächsten Batch.
+
+Verwendung:
+  prefetcher = GoalPrefetcher(engine, batch_size=3, low_water=6)
+  prefetcher.start()
+  ...
+  mark = prefetcher.generation
+  goal = engine.get_next_goal()
+  if goal is None:
+      prefetcher.wait_for_goals(mark, timeout=60)
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_REFRESH_S = 10 * 60   # Kontext spätestens so oft neu berechnen
+IDLE_POLL_S       = 30        # Prüfintervall ohne expliziten Weckruf
+ERROR_BACKOFF_S   = 60
+
+
+class GoalPrefetcher:
+    """Hintergrund-Produzent für Ziele (ein Daemon-Thread)."""
+
+    def __init__(self, engine, batch_size: int = 3, low_water: int = 6,
+                 context_refresh: float = CONTEXT_REFRESH_S, use_llm: bool = True):
+        self.engine          = engine
+        self.batch_size      = batch_size
+        self.low_water       = low_water
+        self.context_refresh = context_refresh
+        self.use_llm         = use_llm
+        self.generation      = 0             # Zählt Batch-Läufe (auch leere/fehlgeschlagene)
+        self._wake           = threading.Event()
+        self._stop           = threading.Event()
+        self._cond           = threading.Condition()
+        self._context_dirty  = True
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Steuerung
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="goal-prefetch", daemon=True)
+        self._thread.start()
+        logger.info(f"GoalPrefetcher gestartet (Batch {self.batch_size}, Mindestbestand {self.low_water})")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def wake(self, refresh_context: bool = False) -> None:
+        """Bestand sofort prüfen (z.B. nachdem ein Ziel beansprucht wurde)."""
+        if refresh_context:
+            self._context_dirty = True
+        self._wake.set()
+
+    def wait_for_goals(self, since: int, timeout: float) -> bool:
+        """
+        Blockiert bis nach `since` ein Batch-Lauf abgeschlossen wurde – auch
+        ein leerer; der Aufrufer prüft die Queue danach selbst.
+        `since` vor get_next_goal() aus self.generation lesen – sonst kann
+        ein zwischendurch eingereihter Batch verpasst werden.
+        """
+        self.wake()
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self.generation != since or self._stop.is_set(), timeout
+            )
+
+    # ------------------------------------------------------------------
+    # Produzent
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._context_dirty or self.engine.context_age() > self.context_refresh:
+                    self._context_dirty = False
+                    self.engine.refresh_context()
+                self._top_up()
+                wait_s = IDLE_POLL_S
+            except Exception as e:
+                logger.error(f"GoalPrefetcher-Fehler: {e}", exc_info=True)
+                wait_s = ERROR_BACKOFF_S
+
+            self._wake.wait(timeout=wait_s)
+            self._wake.clear()
+
+    def _top_up(self) -> None:
+        started = time.time()
+        try:
+            # Nur sofort startbare Ziele zählen – Back-off- und laufende Ziele
+            # helfen einem wartenden Executor nicht.
+            ready = self.engine.ready_count()
+            if ready >= self.low_water:
+                return
+
+            new_goals = self.engine.generate_goals(count=self.batch_size, use_llm=self.use_llm)
+            if not new_goals:
+                logger.info("GoalPrefetcher: Batch ohne neue Ziele")
+                return
+
+            self.engine.queue_goals(new_goals)
+            for g in new_goals:
+                logger.info(f"  Neues Ziel [{g.category.value}] (Prio {g.priority}): {g.goal}")
+            logger.info(
+                f"GoalPrefetcher: {len(new_goals)} Ziele vorab generiert "
+                f"({time.time() - started:.1f}s, bereit vorher {ready})"
+            )
+        finally:
+            # Immer melden (auch ohne Batch) – sonst blockiert wait_for_goals bis zum Timeout
+            with self._cond:
+                self.generation += 1
+                self._cond.notify_all()
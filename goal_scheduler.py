@@ -0,0 +1,241 @@
+"""
+Ilija Full_Autonomy_Edition – Goal Scheduler
+=============================================
+Heap-basierte Auswahl des nächsten Ziels.
+
+Bausteine:
+  Aging       → Wartende Ziele gewinnen pro Stunde an Priorität.
+                Da alle Ziele gleich schnell altern, ist der Schlüssel
+                (rate · erstellt_um − priorität) zeitunabhängig → ein normaler
+                Heap reicht, kein Umsortieren nötig.
+  Quoten      → Eine Kategorie darf im Fenster der letzten QUOTA_WINDOW
+                Auswahlen höchstens CATEGORY_QUOTA Anteil haben
+                (solange andere Kategorien bereitstehen).
+  Deadlines   → Ziele deren Deadline innerhalb von DEADLINE_HORIZON liegt
+                werden zuerst gewählt (EDF); abgelaufene werden verworfen.
+  Back-off    → Fehlgeschlagene Ziele warten exponentiell länger
+                (RETRY_BASE_S · 2^(versuche-1), max. RETRY_MAX_S).
+
+Alle Operationen sind O(log n) – ungültige Heap-Einträge werden lazy
+beim Herausnehmen übersprungen.
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AGING_PER_HOUR   = 0.5          # Prioritätspunkte pro Stunde Wartezeit
+DEADLINE_HORIZON = 2 * 3600     # Sekunden vor Deadline → Ziel wird vorgezogen
+QUOTA_WINDOW     = 20           # Anzahl letzter Auswahlen für die Quote
+CATEGORY_QUOTA   = 0.4          # Max. Anteil einer Kategorie im Fenster
+MAX_ATTEMPTS     = 3            # Danach gilt ein Ziel endgültig als gescheitert
+RETRY_BASE_S     = 600
+RETRY_MAX_S      = 24 * 3600
+
+
+def to_ts(value: Optional[str], default: Optional[float] = None) -> Optional[float]:
+    """ISO-Zeitstempel → Unix-Zeit (default bei leerem/ungültigem Wert)."""
+    if not value:
+        return default
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return default
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponentielles Back-off für den n-ten Fehlversuch."""
+    return min(RETRY_MAX_S, RETRY_BASE_S * 2 ** max(0, attempts - 1))
+
+
+class GoalScheduler:
+    """
+    Prioritäts-Queue für offene Ziele.
+    Erwartet Objekte mit id, category (Enum), priority, created_at,
+    deadline und not_before (ISO-Strings oder None).
+    """
+
+    def __init__(self, on_expire: Optional[Callable] = None,
+                 aging_per_hour: float = AGING_PER_HOUR,
+                 quota: float = CATEGORY_QUOTA,
+                 window: int = QUOTA_WINDOW):
+        self.on_expire  = on_expire
+        self.aging_rate = aging_per_hour / 3600.0
+        self.quota      = quota
+        self._seq       = itertools.count()
+        self._token: Dict[str, int] = {}          # id → Token des gültigen Eintrags
+        self._queued: Dict[str, object] = {}      # bereit oder verzögert
+        self._in_flight: Dict[str, object] = {}
+        self._ready: Dict[str, List[Tuple]] = {}  # Kategorie → Heap (key, token, id)
+        self._deadlines: List[Tuple] = []         # (deadline_ts, token, id)
+        self._delayed: List[Tuple] = []           # (not_before_ts, token, id)
+        self._recent: deque = deque(maxlen=window)
+        self._recent_counts: Counter = Counter()
+
+    # ------------------------------------------------------------------
+    # Einfügen / Entfernen
+    # ------------------------------------------------------------------
+
+    def push(self, goal, now: Optional[float] = None) -> None:
+        """Reiht ein Ziel ein (bzw. neu ein – alte Einträge werden ungültig)."""
+        now   = now or time.time()
+        token = next(self._seq)
+        self._token[goal.id]  = token
+        self._queued[goal.id] = goal
+        self._in_flight.pop(goal.id, None)
+
+        not_before = to_ts(getattr(goal, "not_before", None))
+        if not_before and not_before > now:
+            heapq.heappush(self._delayed, (not_before, token, goal.id))
+        else:
+            self._make_ready(goal, token, now)
+
+    def _make_ready(self, goal, token: int, now: float) -> None:
+        created = to_ts(goal.created_at, now)
+        key     = self.aging_rate * created - goal.priority
+        heapq.heappush(self._ready.setdefault(goal.category.value, []), (key, token, goal.id))
+        deadline = to_ts(getattr(goal, "deadline", None))
+        if deadline:
+            heapq.heappush(self._deadlines, (deadline, token, goal.id))
+
+    def _valid(self, entry: Tuple) -> bool:
+        _, token, goal_id = entry
+        return goal_id in self._queued and self._token.get(goal_id) == token
+
+    def complete(self, goal) -> None:
+        """Ziel ist erledigt (egal ob erfolgreich) – aus allen Strukturen entfernen."""
+        self._in_flight.pop(goal.id, None)
+        self._queued.pop(goal.id, None)
+        self._token.pop(goal.id, None)
+
+    def release(self, goal) -> None:
+        """Beanspruchtes Ziel ohne Ergebnis zurückgeben (z.B. nach Absturz)."""
+        if goal.id in self._in_flight:
+            self.push(goal)
+
+    def requeue(self, goal) -> None:
+        """Wartendes Ziel nach Prioritätsänderung neu einsortieren (in Bearbeitung: nichts tun)."""
+        if goal.id in self._queued:
+            self.push(goal)
+
+    def note_started(self, category: str) -> None:
+        """Trägt eine Auswahl ins Quoten-Fenster ein."""
+        if len(self._recent) == self._recent.maxlen:
+            old = self._recent[0]
+            self._recent_counts[old] -= 1
+        self._recent.append(category)
+        self._recent_counts[category] += 1
+
+    # ------------------------------------------------------------------
+    # Auswahl
+    # ------------------------------------------------------------------
+
+    def pop(self, exclude: Optional[set] = None, now: Optional[float] = None):
+        """Nächstes Ziel beanspruchen (None wenn nichts bereit ist)."""
+        now     = now or time.time()
+        exclude = exclude or set()
+
+        # Fällige Retry-Ziele freigeben
+        while self._delayed and self._delayed[0][0] <= now:
+            entry = heapq.heappop(self._delayed)
+            if self._valid(entry):
+                self._make_ready(self._queued[entry[2]], entry[1], now)
+
+        goal = self._pop_deadline(exclude, now) or self._pop_fair(exclude)
+        if goal is None:
+            return None
+
+        self._queued.pop(goal.id, None)
+        self._token.pop(goal.id, None)
+        self._in_flight[goal.id] = goal
+        self.note_started(goal.category.value)
+        return goal
+
+    def _pop_deadline(self, exclude: set, now: float):
+        skipped = []
+        chosen  = None
+        while self._deadlines:
+            entry = self._deadlines[0]
+            if not self._valid(entry):
+                heapq.heappop(self._deadlines)
+                continue
+            deadline, _, goal_id = entry
+            if deadline < now:
+                heapq.heappop(self._deadlines)
+                goal = self._queued[goal_id]
+                self.complete(goal)
+                logger.info(f"GoalScheduler: Deadline verpasst – {goal.goal[:60]}")
+                if self.on_expire:
+                    self.on_expire(goal)
+                continue
+            if deadline - now > DEADLINE_HORIZON:
+                break
+            if goal_id in exclude:
+                skipped.append(heapq.heappop(self._deadlines))
+                continue
+            chosen = self._queued[goal_id]
+            break
+        for entry in skipped:
+            heapq.heappush(self._deadlines, entry)
+        return chosen
+
+    def _top(self, category: str, exclude: set, skipped: List[Tuple]) -> Optional[Tuple]:
+        heap = self._ready.get(category)
+        while heap:
+            entry = heap[0]
+            if not self._valid(entry):
+                heapq.heappop(heap)
+            elif entry[2] in exclude:
+                skipped.append((category, heapq.heappop(heap)))
+            else:
+                return entry
+        return None
+
+    def _pop_fair(self, exclude: set):
+        skipped: List[Tuple] = []
+        tops = []
+        for category in self._ready:
+            entry = self._top(category, exclude, skipped)
+            if entry:
+                tops.append((entry, category))
+        for category, entry in skipped:
+            heapq.heappush(self._ready[category], entry)
+        if not tops:
+            return None
+
+        # Bester Kandidat, dessen Kategorie ihre Quote noch nicht ausgeschöpft hat.
+        # Der Heap-Eintrag bleibt liegen und wird nach dem Beanspruchen lazy verworfen.
+        tops.sort()
+        window = len(self._recent) or 1
+        chosen = tops[0][0]
+        for entry, category in tops:
+            if self._recent_counts[category] / window < self.quota:
+                chosen = entry
+                break
+        return self._queued[chosen[2]]
+
+    # ------------------------------------------------------------------
+    # Auskunft
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._queued) + len(self._in_flight)
+
+    def ready_count(self, now: Optional[float] = None) -> int:
+        """Wartende Ziele ohne laufendes Back-off (in Bearbeitung zählt nicht)."""
+        now     = now or time.time()
+        delayed = sum(1 for entry in self._delayed if entry[0] > now and self._valid(entry))
+        return len(self._queued) - delayed
+
+    def pending(self) -> List:
+        """Alle offenen Ziele (wartend, verzögert oder in Bearbeitung)."""
+        return list(self._queued.values()) + list(self._in_flight.values())
+
+    def in_flight(self) -> List:
+        return list(self._in_flight.values())
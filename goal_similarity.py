@@ -0,0 +1,118 @@
+"""
+Ilija Full_Autonomy_Edition – Goal Similarity Index
+====================================================
+Erkennt semantisch fast identische Ziele per MinHash/LSH.
+
+Beispiel – diese beiden Ziele sollen als Duplikat gelten:
+  "Stabilen Datenfluss zwischen Loop-Schritten sicherstellen"
+  "Stabilen Datenfluss zwischen (autonomen) Loop-Schritten sicherstellen"
+
+Verfahren:
+  1. Text normalisieren (klein, Umlaute, Satzzeichen raus)
+  2. Zeichen-4-Gramme als Shingles
+  3. MinHash-Signatur mit NUM_PERM Hashfunktionen
+  4. LSH: Signatur in BANDS Bänder zerlegen → Kandidaten-Buckets
+  5. Ähnlichkeit der Kandidaten = Anteil übereinstimmender Signatur-Werte
+     (Schätzer für die Jaccard-Ähnlichkeit)
+
+Abfrage und Einfügen kosten O(NUM_PERM) plus Kandidaten – unabhängig von
+der Gesamtzahl vergangener Ziele.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Set, Tuple
+
+NUM_PERM  = 64
+BANDS     = 16          # 16 Bänder × 4 Zeilen → Kandidaten ab ~0.5 Jaccard
+SHINGLE_K = 4
+DUPLICATE_THRESHOLD = 0.7
+
+_PRIME = (1 << 31) - 1   # klein halten → schnelle Int-Arithmetik
+_UMLAUTE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def _coefficients(n: int) -> List[Tuple[int, int]]:
+    """Deterministische (a, b)-Paare für die Hash-Permutationen."""
+    coeffs = []
+    for i in range(n):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % (_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "big") % _PRIME
+        coeffs.append((a, b))
+    return coeffs
+
+
+_COEFFS = _coefficients(NUM_PERM)
+
+
+def normalize(text: str) -> str:
+    text = text.lower().translate(_UMLAUTE)
+    text = re.sub(r"[^a-z0-9 ]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def shingles(text: str, k: int = SHINGLE_K) -> Set[int]:
+    norm = normalize(text)
+    if len(norm) <= k:
+        grams = {norm}
+    else:
+        grams = {norm[i:i + k] for i in range(len(norm) - k + 1)}
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "big") % _PRIME
+        for g in grams
+    }
+
+
+def signature(text: str) -> Tuple[int, ...]:
+    """MinHash-Signatur eines Textes."""
+    hashes = shingles(text) or {0}
+    return tuple(
+        min([(a * h + b) % _PRIME for h in hashes])
+        for a, b in _COEFFS
+    )
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Geschätzte Jaccard-Ähnlichkeit zweier Signaturen."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class GoalSimilarityIndex:
+    """LSH-Index über alle bisherigen Ziele (ID → Signatur)."""
+
+    def __init__(self, bands: int = BANDS):
+        self.bands = bands
+        self.rows  = NUM_PERM // bands
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+
+    def _band_keys(self, sig: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, goal_id: str, text: str) -> Tuple[int, ...]:
+        sig = signature(text)
+        self._signatures[goal_id] = sig
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, set()).add(goal_id)
+        return sig
+
+    def similar(self, text: str, threshold: float = DUPLICATE_THRESHOLD,
+                sig: Tuple[int, ...] = None) -> List[Tuple[str, float]]:
+        """Alle indizierten Ziele mit Ähnlichkeit ≥ threshold, bestes zuerst."""
+        sig = sig or signature(text)
+        candidates: Set[str] = set()
+        for key in self._band_keys(sig):
+            candidates |= self._buckets.get(key, set())
+        matches = [
+            (goal_id, similarity(sig, self._signatures[goal_id]))
+            for goal_id in candidates
+        ]
+        return sorted(
+            [(gid, sim) for gid, sim in matches if sim >= threshold],
+            key=lambda m: -m[1],
+        )
+
+    def __len__(self) -> int:
+        return len(self._signatures)
@@ -0,0 +1,160 @@
+"""
+Ilija Full_Autonomy_Edition – Goal Store
+=========================================
+Append-only Persistenz für Ziele.
+
+Statt bei jeder Änderung die komplette data/goals.json neu zu schreiben,
+wird jede Änderung als eine Zeile an ein Event-Log angehängt (O(1)).
+Periodisch wird das Log in einen Snapshot verdichtet.
+
+Dateien:
+  data/goals.json           ← Snapshot (JSON-Liste, kompatibel zum alten Format)
+  data/goals.events.jsonl   ← Event-Log seit dem letzten Snapshot
+
+Event-Format (eine Zeile pro Event):
+  {"e": "created",   "id": "goal_…", "data": {…vollständiger Datensatz…}}
+  {"e": "started",   "id": "goal_…", "data": {"last_started": …}}
+  {"e": "retry",     "id": "goal_…", "data": {"outcome": …, "score": …, "attempts": …, "not_before": …}}
+  {"e": "completed", "id": "goal_…", "data": {"completed": true, "succeeded": …, "outcome": …, "score": …}}
+  {"e": "merged",    "id": "goal_…", "data": {"priority": …}}
+
+Jedes Event setzt nur Felder – das Wiederholen eines Events ist daher
+harmlos. Stürzt der Prozess zwischen Snapshot-Tausch und Log-Kürzung ab,
+wird das Log beim nächsten Start einfach erneut angewendet.
+Eine abgeschnittene letzte Zeile (Absturz mitten im Schreiben) wird ignoriert.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+COMPACT_EVERY = 500   # Events bis zur nächsten Verdichtung
+
+
+class GoalStore:
+    """Snapshot + Event-Log mit In-Memory-Index nach Ziel-ID."""
+
+    def __init__(self, snapshot_path: str = "data/goals.json",
+                 compact_every: int = COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        base, _ = os.path.splitext(snapshot_path)
+        self.log_path      = f"{base}.events.jsonl"
+        self.compact_every = compact_every
+        self.index: Dict[str, Dict] = {}      # id → Datensatz (Einfügereihenfolge)
+        self._tail_events  = 0
+        self._lock         = threading.Lock()
+        os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Laden
+    # ------------------------------------------------------------------
+
+    def load(self) -> List[Dict]:
+        """Snapshot lesen, Log-Tail anwenden. Returns: alle Datensätze."""
+        self.index.clear()
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, encoding="utf-8") as f:
+                    for record in json.load(f):
+                        self.index[record.get("id", "")] = record
+            except Exception as e:
+                logger.warning(f"Goal-Snapshot laden fehlgeschlagen: {e}")
+
+        self._tail_events = 0
+        if os.path.exists(self.log_path):
+            self._truncate_torn_tail()
+            with open(self.log_path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._apply(json.loads(line))
+                        self._tail_events += 1
+                    except Exception:
+                        logger.warning(f"Goal-Log: Zeile {line_no} unlesbar – übersprungen")
+
+        if self._tail_events >= self.compact_every:
+            self.compact()
+        return list(self.index.values())
+
+    def _truncate_torn_tail(self) -> None:
+        """Entfernt eine halb geschriebene letzte Zeile, damit neue Events nicht daran kleben."""
+        with open(self.log_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            # Rückwärts bis zum letzten Zeilenende suchen
+            pos = size
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                nl = chunk.rfind(b"\n")
+                if nl != -1:
+                    pos += nl + 1
+                    break
+            f.truncate(pos)
+            logger.warning(f"Goal-Log: unvollständige letzte Zeile entfernt ({size - pos} Bytes)")
+
+    def _apply(self, event: Dict) -> None:
+        goal_id = event["id"]
+        data    = event.get("data", {})
+        if event["e"] == "created" or goal_id not in self.index:
+            self.index[goal_id] = dict(data, id=goal_id)
+        else:
+            self.index[goal_id].update(data)
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    def append(self, event_type: str, goal_id: str, data: Dict) -> None:
+        """Hängt ein Event an (flush + fsync) und aktualisiert den Index."""
+        event = {"e": event_type, "id": goal_id, "data": data}
+        line  = json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                logger.error(f"Goal-Event schreiben fehlgeschlagen: {e}")
+                return
+            self._apply(event)
+            self._tail_events += 1
+            if self._tail_events >= self.compact_every:
+                self._compact_locked()
+
+    def compact(self) -> None:
+        """Index als neuen Snapshot schreiben und das Log leeren."""
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        tmp = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(list(self.index.values()), f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            # Erst nach erfolgreichem Tausch kürzen – ein Absturz dazwischen ist unkritisch
+            open(self.log_path, "w").close()
+            logger.info(f"GoalStore: {self._tail_events} Events in Snapshot verdichtet ({len(self.index)} Ziele)")
+            self._tail_events = 0
+        except Exception as e:
+            logger.error(f"Goal-Snapshot schreiben fehlgeschlagen: {e}")
+
+    def get(self, goal_id: str) -> Optional[Dict]:
+        return self.index.get(goal_id)
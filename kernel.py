@@ -15,6 +15,7 @@ import logging
 import os
 import re
 import sys
+import threading
 import time
 
 # ChromaDB Telemetrie deaktivieren (verhindert PostHog-Spam im Terminal)
@@ -39,11 +40,13 @@ from skill_registry import PROTECTED_SKILLS, SkillStatus, get_skill_status
 # Logging (einmalig konfigurieren)                                     #
 # ------------------------------------------------------------------ #
 
+# KERNEL_LOG_FILE: Pfad der Log-Datei (leer → nur Konsole, z.B. in Tests)
+_log_file = os.getenv("KERNEL_LOG_FILE", "offenes_leuchten.log")
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)-8s %(name)s – %(message)s",
     handlers=[
-        logging.FileHandler("offenes_leuchten.log", encoding="utf-8"),
+        *([logging.FileHandler(_log_file, encoding="utf-8")] if _log_file else []),
         logging.StreamHandler(sys.stdout),
     ],
 )
@@ -137,20 +140,27 @@ class Kernel:
         ],
     }
 
-    def __init__(self, provider: str = "auto", auto_load_skills: bool = True) -> None:
-        self.provider_name, self.provider = select_provider(provider)
-        self.manager             = SkillManager()
+    def __init__(self, provider: str = "auto", auto_load_skills: bool = True,
+                 manager: Optional[SkillManager] = None,
+                 provider_pair: Optional[Tuple[str, LLMProvider]] = None) -> None:
+        # manager/provider_pair: geteilte Registry bzw. Provider (Web-Sessions) –
+        # dann bleibt pro Kernel nur der Chat-Zustand
+        self.provider_name, self.provider = provider_pair or select_provider(provider)
+        self.manager             = manager or SkillManager()
         self.state               = AgentState.IDLE
         self.chat_history:       list = []
         self.last_user_input     = ""
         self.max_history         = 10
+        self.max_documents       = 5
         self.consecutive_errors  = 0
         self.max_errors          = 3
         self.recent_errors: deque = deque(maxlen=5)
         self.loop_threshold      = 3
         self.reload_counter      = 0
+        self.documents: Dict[str, str] = {}   # doc_id → Dateiname (hochgeladene Dokumente)
+        self.chat_lock           = threading.Lock()   # serialisiert chat() je Session (Web)
 
-        if auto_load_skills:
+        if auto_load_skills and manager is None:
             self.load_skills()
 
     # ---------------------------------------------------------------- #
@@ -166,6 +176,10 @@ class Kernel:
             logger.error(f"load_skills Fehler: {e}")
             return 0
 
+    def worker_view(self) -> "WorkerKernel":
+        """Leichtgewichtige Kernel-Sicht für einen parallelen Goal-Worker."""
+        return WorkerKernel(self)
+
     # ---------------------------------------------------------------- #
     # Self-Knowledge (kein LLM nötig)                                   #
     # ---------------------------------------------------------------- #
@@ -215,6 +229,26 @@ class Kernel:
             f"VERFÜGBARE SKILLS:\n{skills}"
         )
 
+    def add_document(self, doc_id: str, filename: str) -> None:
+        """Merkt sich ein indiziertes Dokument – seine Abschnitte fließen in spätere Antworten ein."""
+        self.documents[doc_id] = filename
+        while len(self.documents) > self.max_documents:
+            self.documents.pop(next(iter(self.documents)))
+
+    def document_context(self, question: str) -> str:
+        """Zur Frage passende Abschnitte der Session-Dokumente (leer ohne Dokumente)."""
+        if not self.documents:
+            return ""
+        from document_ingest import relevant_chunks
+        chunks = relevant_chunks(list(self.documents), question)
+        if not chunks:
+            return ""
+        parts = [
+            f"[{c['metadata'].get('filename', '?')} · Abschnitt {c['metadata'].get('chunk', '?')}]\n{c['text']}"
+            for c in chunks
+        ]
+        return "\n\nRELEVANTE DOKUMENT-ABSCHNITTE:\n" + "\n\n".join(parts)
+
     # ---------------------------------------------------------------- #
     # Response-Parsing                                                   #
     # ---------------------------------------------------------------- #
@@ -363,7 +397,8 @@ class Kernel:
             self.chat_history.append({"role": "assistant", "content": answer})
             return {"response": answer, "intent": intent, "skill": None, "thought": None, "error": False}
 
-        messages = [{"role": "system", "content": self.build_system_prompt(intent)}]
+        system   = self.build_system_prompt(intent) + self.document_context(user_message)
+        messages = [{"role": "system", "content": system}]
         messages += self.chat_history[-self.max_history:]
 
         force_json = intent in ("TASK", "USER_QUESTION")
@@ -550,6 +585,31 @@ class Kernel:
                 self.consecutive_errors += 1
 
 
+# ------------------------------------------------------------------ #
+# Worker-Sicht (Multi-Goal-Betrieb)                                    #
+# ------------------------------------------------------------------ #
+
+class WorkerKernel:
+    """
+    Kernel-Sicht pro parallel laufendem Ziel.
+    Eigener Chat-Zustand (History, State, Fehler), aber SkillManager und
+    Provider (inkl. Rate-Limiter) werden mit dem Basis-Kernel geteilt.
+    """
+
+    def __init__(self, base: Kernel) -> None:
+        self.base               = base
+        self.manager            = base.manager
+        self.provider           = base.provider
+        self.provider_name      = base.provider_name
+        self.state              = AgentState.IDLE
+        self.chat_history: list = []
+        self.recent_errors: deque = deque(maxlen=5)
+
+    def load_skills(self) -> int:
+        # Reload läuft im geteilten SkillManager (serialisiert + atomarer Tausch)
+        return self.base.load_skills()
+
+
 # ------------------------------------------------------------------ #
 # Einstiegspunkt                                                       #
 # ------------------------------------------------------------------ #
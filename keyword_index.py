@@ -0,0 +1,120 @@
+"""
+Ilija Full_Autonomy_Edition – Keyword Index
+============================================
+Invertierter Index mit BM25-Scoring für das Gedächtnis.
+
+Vektor-Suche findet Bedeutungen, aber schlecht exakte Begriffe:
+Skill-Namen (webseiten_inhalt_lesen), Agenten-Namen, IDs. Dieser Index
+läuft neben der Chroma-Sammlung mit und liefert die Keyword-Seite der
+hybriden Suche (siehe MemoryService.search).
+
+Tokenisierung:
+  - klein, Umlaute → ae/oe/ue/ss
+  - Bezeichner mit Unterstrich werden zusätzlich in ihre Teile zerlegt
+    ("wissen_abrufen" → wissen_abrufen, wissen, abrufen)
+  - häufige deutsche/englische Füllwörter werden ignoriert
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Tuple
+
+BM25_K1 = 1.5
+BM25_B  = 0.75
+
+_UMLAUTE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_TOKEN   = re.compile(r"[a-z0-9][a-z0-9_\-.]*[a-z0-9]|[a-z0-9]")
+STOPWORDS = frozenset("""
+    der die das den dem des ein eine einen einem einer eines und oder aber
+    ist sind war waren wird werden wurde hat haben mit von zu zum zur im in
+    an am auf aus bei fuer nach ueber unter vor nicht auch als wie so es er
+    sie wir ich du man sich dass da nur noch schon mehr sehr kann
+    the a an and or of to in on for is are was be with by at from it this that
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower().translate(_UMLAUTE)):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        if "_" in token or "-" in token:
+            tokens.extend(p for p in re.split(r"[_\-]+", token) if p and p not in STOPWORDS)
+    return tokens
+
+
+class KeywordIndex:
+    """BM25 über Dokument-ID → Text. Einfügen/Entfernen O(Tokens des Dokuments)."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b  = b
+        self._postings: Dict[str, Dict[str, int]] = {}   # Term → {doc_id: tf}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, text: str) -> None:
+        terms = Counter(tokenize(text))
+        with self._lock:
+            if doc_id in self._doc_terms:
+                self._remove_locked(doc_id)
+            self._doc_terms[doc_id] = terms
+            self._doc_len[doc_id]   = sum(terms.values())
+            self._total_len += self._doc_len[doc_id]
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if not terms:
+            return
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k Dokumente nach BM25, bestes zuerst."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._doc_terms)
+            if not n or not terms:
+                return []
+            avgdl  = self._total_len / n
+            scores: Dict[str, float] = {}
+            for term in terms:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    denom = tf + self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / denom
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def coverage(self, query: str, doc_id: str) -> float:
+        """Anteil der Suchbegriffe, die im Dokument vorkommen (0..1)."""
+        terms = set(tokenize(query))
+        doc   = self._doc_terms.get(doc_id)
+        if not terms or not doc:
+            return 0.0
+        return sum(1 for t in terms if t in doc) / len(terms)
@@ -0,0 +1,124 @@
+"""
+Ilija Full_Autonomy_Edition – Log Tail
+=======================================
+Log-Anzeige fürs Dashboard, unabhängig von der Größe der Log-Datei.
+
+Bisher las /api/log bei jedem Poll die komplette Datei (readlines()[-60:]).
+Jetzt:
+
+  tail_lines()     → liest blockweise vom Dateiende rückwärts, bis genug
+                     Zeilen beisammen sind – O(angeforderte Zeilen)
+  read_from()      → inkrementell ab einem Byte-Offset, den der Client
+                     mitführt; bei Rotation/Kürzung Neustart am Ende
+  LogBroadcaster   → logging.Handler, der neue Zeilen nummeriert in einem
+                     Ringpuffer hält; wait() blockiert bis Neues kommt
+                     (Grundlage für den SSE-Stream /api/log/stream; Log-Zeilen
+                     laufen bewusst nicht über den EventBus – ein Log-Schwall
+                     würde dessen Ringpuffer leeren)
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+BLOCK_SIZE  = 8192
+MAX_READ    = 256 * 1024   # höchstens so viele Bytes pro inkrementellem Abruf
+BUFFER_SIZE = 500          # Zeilen im Broadcast-Ringpuffer
+LOG_FORMAT  = "%(asctime)s %(levelname)-8s %(name)s – %(message)s"
+
+
+def _decode(data: bytes) -> List[str]:
+    return [line.rstrip("\r") for line in data.decode("utf-8", errors="replace").split("\n") if line.strip()]
+
+
+def tail_lines(path: str, n: int = 60) -> Tuple[List[str], int]:
+    """
+    Letzte n Zeilen einer Datei.
+    Returns: (zeilen, offset) – offset = Ende der letzten vollständigen Zeile,
+    Startpunkt für read_from().
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos  = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    # Unvollständige letzte Zeile auslassen – read_from() liefert sie später ganz
+    cut = data.rfind(b"\n") + 1
+    return _decode(data[:cut])[-n:], pos + cut
+
+
+def read_from(path: str, offset: int, n: int = 60) -> Tuple[List[str], int, bool]:
+    """
+    Neue vollständige Zeilen ab offset.
+    Returns: (zeilen, neuer_offset, reset) – reset=True wenn die Datei rotiert
+    bzw. gekürzt wurde und stattdessen das Ende (tail_lines) geliefert wird.
+    """
+    size = os.path.getsize(path)
+    if offset > size or offset < 0:
+        lines, end = tail_lines(path, n)
+        return lines, end, True
+    if offset == size:
+        return [], offset, False
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(MAX_READ)
+    # Nur bis zur letzten vollständigen Zeile – der Rest kommt beim nächsten Abruf
+    cut = data.rfind(b"\n") + 1
+    if cut == 0:
+        return [], offset, False
+    return _decode(data[:cut]), offset + cut, False
+
+
+class LogBroadcaster(logging.Handler):
+    """Hält neue Log-Zeilen nummeriert vor und weckt wartende Stream-Clients."""
+
+    def __init__(self, capacity: int = BUFFER_SIZE, level: int = logging.INFO):
+        super().__init__(level)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.seq = 0
+        self._lines: Deque[Tuple[int, str]] = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Request-Logs des Web-Servers würden das Dashboard nur fluten
+        if record.name.startswith("werkzeug"):
+            return
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._cond:
+            for part in line.splitlines() or [""]:
+                self.seq += 1
+                self._lines.append((self.seq, part))
+            self._cond.notify_all()
+
+    def wait(self, since: int, timeout: float = 15.0) -> List[Tuple[int, str]]:
+        """Zeilen mit Nummer > since; wartet bis zu timeout (leer = Keepalive)."""
+        with self._cond:
+            if self.seq <= since:
+                self._cond.wait(timeout)
+            return [item for item in self._lines if item[0] > since]
+
+
+# ── Singleton ──────────────────────────────────────────────────
+
+_broadcaster: Optional[LogBroadcaster] = None
+_broadcaster_lock = threading.Lock()
+
+def get_log_broadcaster() -> LogBroadcaster:
+    """Einmalig am Root-Logger registrierter Broadcaster."""
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = LogBroadcaster()
+                logging.getLogger().addHandler(_broadcaster)
+    return _broadcaster
@@ -0,0 +1,200 @@
+"""
+Ilija Full_Autonomy_Edition – Memory Compaction
+================================================
+Verdichtet das Langzeitgedächtnis (Sammlung globales_wissen).
+
+Der Orchestrator schreibt zu jedem Ziel, jedem Ergebnis und jeder
+Reflexion einen Eintrag – dauerhaft. Viele davon sind fast identisch
+("Ziel abgeschlossen [explore]: Recherchiere aktuelle KI-Entwicklungen…").
+Das verlangsamt Abfragen und verdrängt brauchbare Treffer aus den Top-k.
+
+Ablauf eines Laufs:
+  1. Alle Einträge samt Embeddings seitenweise laden
+  2. Pro Quelle (goal, reflection, …) gierig clustern: Kosinus-Ähnlichkeit
+     ≥ threshold zum Cluster-Anführer (ältester Eintrag)
+  3. Je Cluster einen konsolidierten Eintrag erzeugen – per LLM
+     zusammengefasst (optional) oder neuester Text + Häufigkeit
+  4. Originale nach data/memory_archive.jsonl archivieren, dann löschen
+  5. Bericht: Größe vorher/nachher, Cluster, archivierte Einträge
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PATH      = "data/memory_archive.jsonl"
+SIMILARITY        = 0.92     # Kosinus-Ähnlichkeit ab der Einträge verschmolzen werden
+PAGE_SIZE         = 500
+BLOCK_SIZE        = 256      # Zeilen pro Ähnlichkeits-Block (Speicher ~ BLOCK_SIZE · n)
+MAX_SUMMARY_CHARS = 1200
+CONSOLIDATED_NOTE = re.compile(r"(?:\s*\(konsolidiert aus \d+ ähnlichen Einträgen\))+\s*$")
+
+
+class MemoryCompactor:
+    """Clustert fast identische Erinnerungen und ersetzt sie durch einen Eintrag."""
+
+    def __init__(self, service, threshold: float = SIMILARITY,
+                 summarize: Optional[Callable[[List[str]], str]] = None,
+                 archive_path: str = ARCHIVE_PATH):
+        self.service      = service
+        self.threshold    = threshold
+        self.summarize    = summarize
+        self.archive_path = archive_path
+
+    # ------------------------------------------------------------------
+    # Laden
+    # ------------------------------------------------------------------
+
+    def _load_all(self) -> Dict[str, List]:
+        """Alle Einträge; Embeddings als eine float32-Matrix (seitenweise gestapelt)."""
+        import numpy as np
+
+        data   = {"ids": [], "documents": [], "metadatas": [], "embeddings": None}
+        blocks = []
+        rows   = []
+        for item in self.service.iter_all(batch=PAGE_SIZE,
+                                          include=("documents", "metadatas", "embeddings")):
+            data["ids"].append(item["id"])
+            data["documents"].append(item["text"])
+            data["metadatas"].append(item["metadata"])
+            rows.append(item["embedding"])
+            if len(rows) == PAGE_SIZE:
+                blocks.append(np.stack(rows))
+                rows = []
+        if rows:
+            blocks.append(np.stack(rows))
+        data["embeddings"] = (np.concatenate(blocks) if blocks
+                              else np.zeros((0, 0), dtype=np.float32))
+        return data
+
+    # ------------------------------------------------------------------
+    # Clustern
+    # ------------------------------------------------------------------
+
+    def _cluster(self, vectors, order: List[int]) -> List[List[int]]:
+        """Gierig: ältester freier Eintrag wird Anführer, alle ähnlichen kommen dazu."""
+        import numpy as np
+
+        x = np.asarray(vectors[order], dtype=np.float32)
+        x /= np.linalg.norm(x, axis=1, keepdims=True) + 1e-12
+        free     = np.ones(len(order), dtype=bool)
+        clusters = []
+        for start in range(0, len(order), BLOCK_SIZE):
+            sims = x[start:start + BLOCK_SIZE] @ x.T
+            for offset, row in enumerate(sims):
+                leader = start + offset
+                if not free[leader]:
+                    continue
+                members = np.flatnonzero(free & (row >= self.threshold))
+                free[members] = False
+                if len(members) > 1:
+                    clusters.append([order[m] for m in members])
+        return clusters
+
+    # ------------------------------------------------------------------
+    # Konsolidieren
+    # ------------------------------------------------------------------
+
+    def _consolidate(self, texts: List[str], metas: List[Dict]) -> Tuple[str, Dict]:
+        newest = max(range(len(metas)), key=lambda i: float(metas[i].get("ts", 0) or 0))
+        # Bereits konsolidierte Mitglieder zählen mit ihrer ursprünglichen Anzahl
+        merged = sum(max(1, int(m.get("consolidated", 1) or 1)) for m in metas)
+        text   = None
+        if self.summarize:
+            try:
+                text = (self.summarize(texts) or "").strip()[:MAX_SUMMARY_CHARS] or None
+            except Exception as e:
+                logger.warning(f"MemoryCompactor: LLM-Zusammenfassung fehlgeschlagen: {e}")
+        if text is None:
+            base = CONSOLIDATED_NOTE.sub("", texts[newest])   # Vermerk früherer Läufe nicht verschachteln
+            text = f"{base} (konsolidiert aus {merged} ähnlichen Einträgen)"
+
+        meta = dict(metas[newest])
+        meta["importance"]   = max(float(m.get("importance", 0.5)) for m in metas)
+        meta["consolidated"] = merged
+        meta["first_ts"]     = min(float(m.get("first_ts", m.get("ts", 0)) or 0) for m in metas)
+        return text, meta
+
+    def _archive(self, records: List[Dict]) -> None:
+        os.makedirs(os.path.dirname(self.archive_path) or ".", exist_ok=True)
+        with open(self.archive_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ------------------------------------------------------------------
+    # Lauf
+    # ------------------------------------------------------------------
+
+    def run(self, dry_run: bool = False) -> Dict:
+        """Führt einen Verdichtungslauf aus. Returns: Bericht."""
+        started = time.time()
+        self.service.flush()
+        data   = self._load_all()
+        before = len(data["ids"])
+        report = {"before": before, "after": before, "clusters": 0,
+                  "archived": 0, "dry_run": dry_run, "seconds": 0.0}
+        if before < 2:
+            return report
+
+        # Nur innerhalb einer Quelle verschmelzen; älteste zuerst (stabile Anführer)
+        by_source: Dict[str, List[int]] = {}
+        for i, meta in enumerate(data["metadatas"]):
+            by_source.setdefault((meta or {}).get("source", "legacy"), []).append(i)
+
+        clusters = []
+        for indices in by_source.values():
+            if len(indices) < 2:
+                continue
+            indices.sort(key=lambda i: float((data["metadatas"][i] or {}).get("ts", 0) or 0))
+            clusters.extend(self._cluster(data["embeddings"], indices))
+
+        report["clusters"] = len(clusters)
+        for members in clusters:
+            texts = [data["documents"][i] or "" for i in members]
+            metas = [data["metadatas"][i] or {} for i in members]
+            ids   = [data["ids"][i] for i in members]
+            if dry_run:
+                report["archived"] += len(ids)
+                continue
+
+            text, meta  = self._consolidate(texts, metas)
+            new_id      = self.service.add_one(text, meta)
+            archived_at = datetime.now().isoformat(timespec="seconds")
+            self._archive([
+                {"id": i, "text": t, "metadata": m, "merged_into": new_id, "archived_at": archived_at}
+                for i, t, m in zip(ids, texts, metas)
+            ])
+            self.service.delete(ids)
+            report["archived"] += len(ids)
+
+        report["after"]   = before - report["archived"] + len(clusters)
+        report["seconds"] = round(time.time() - started, 2)
+        logger.info(
+            f"MemoryCompactor: {report['before']} → {report['after']} Einträge "
+            f"({report['clusters']} Cluster, {report['archived']} archiviert, {report['seconds']}s)"
+        )
+        return report
+
+
+def llm_summarizer(provider) -> Callable[[List[str]], str]:
+    """Zusammenfassung eines Clusters über einen LLM-Provider (chat-Schnittstelle)."""
+    def summarize(texts: List[str]) -> str:
+        joined = "\n".join(f"- {t[:400]}" for t in texts[:20])
+        messages = [
+            {"role": "system", "content": (
+                "Fasse die folgenden, fast identischen Gedächtnis-Einträge zu EINEM "
+                "Eintrag zusammen. Behalte Fakten, Zahlen, Namen und Ergebnisse. "
+                "Antworte nur mit dem Eintrag, ohne Einleitung."
+            )},
+            {"role": "user", "content": joined},
+        ]
+        return provider.chat(messages)
+    return summarize
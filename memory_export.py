@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Ilija Full_Autonomy_Edition – Memory Export / Import
+=====================================================
+Streamt das Langzeitgedächtnis als JSONL heraus bzw. wieder hinein
+(Backup, Migration auf einen neuen Rechner / ein neues Modell).
+
+Eine Zeile pro Eintrag:
+  {"id": "…", "text": "…", "metadata": {…}}               ← Standard
+  {"id": "…", "text": "…", "metadata": {…}, "embedding": […]}  ← --embeddings
+
+Beide Richtungen arbeiten seitenweise (MemoryService.iter_all bzw.
+Batches beim Import) – der Speicherbedarf hängt nicht von der Größe des
+Gedächtnisses ab. Endet der Pfad auf .gz, wird gzip verwendet.
+
+Verwendung:
+  python memory_export.py export backup/gedaechtnis.jsonl.gz
+  python memory_export.py export backup/mit_vektoren.jsonl --embeddings
+  python memory_export.py import backup/gedaechtnis.jsonl.gz
+"""
+
+import gzip
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH = 256
+
+
+def _open(path: str, mode: str, gz: bool):
+    if gz:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def export_jsonl(service, path: str, include_embeddings: bool = False,
+                 where: Optional[Dict] = None) -> int:
+    """Schreibt alle (bzw. gefilterten) Einträge nach path. Returns: Anzahl."""
+    include = ("documents", "metadatas") + (("embeddings",) if include_embeddings else ())
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp   = f"{path}.tmp"
+    count = 0
+    try:
+        with _open(tmp, "w", gz=path.endswith(".gz")) as f:
+            for item in service.iter_all(where=where, include=include):
+                if "embedding" in item:
+                    item["embedding"] = item["embedding"].tolist()   # numpy-Zeile → JSON
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                count += 1
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    logger.info(f"Gedächtnis-Export: {count} Einträge → {path}")
+    return count
+
+
+def import_jsonl(service, path: str, batch: int = IMPORT_BATCH) -> int:
+    """
+    Liest Einträge aus path und fügt sie per upsert ein (gleiche ID → ersetzt).
+    Mitgelieferte Embeddings werden übernommen, sonst neu berechnet.
+    Returns: Anzahl importierter Einträge.
+    """
+    count   = 0
+    pending: List[Dict] = []
+
+    def flush() -> None:
+        nonlocal count
+        if not pending:
+            return
+        with_vec = [r for r in pending if r.get("embedding")]
+        without  = [r for r in pending if not r.get("embedding")]
+        for group, embeddings in ((with_vec, True), (without, False)):
+            if not group:
+                continue
+            service.upsert(
+                documents=[r.get("text") or "" for r in group],
+                metadatas=[r.get("metadata") or {"type": "memory"} for r in group],
+                ids=[r["id"] for r in group],
+                embeddings=[r["embedding"] for r in group] if embeddings else None,
+            )
+        count += len(pending)
+        pending.clear()
+
+    with _open(path, "r", gz=path.endswith(".gz")) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Gedächtnis-Import: Zeile {line_no} unlesbar – übersprungen")
+                continue
+            if "id" not in record:
+                continue
+            pending.append(record)
+            if len(pending) >= batch:
+                flush()
+    flush()
+    logger.info(f"Gedächtnis-Import: {count} Einträge ← {path}")
+    return count
+
+
+def main() -> int:
+    import argparse
+    from memory_service import get_memory_service
+
+    parser = argparse.ArgumentParser(description="Langzeitgedächtnis exportieren / importieren")
+    sub    = parser.add_subparsers(dest="command", required=True)
+    exp    = sub.add_parser("export", help="Gedächtnis als JSONL schreiben")
+    exp.add_argument("path")
+    exp.add_argument("--embeddings", action="store_true", help="Vektoren mit exportieren")
+    exp.add_argument("--source", default=None, help="nur Einträge dieser Quelle")
+    imp    = sub.add_parser("import", help="JSONL ins Gedächtnis einspielen")
+    imp.add_argument("path")
+    imp.add_argument("--batch", type=int, default=IMPORT_BATCH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-8s %(message)s")
+    service = get_memory_service()
+    if args.command == "export":
+        where = {"source": args.source} if args.source else None
+        export_jsonl(service, args.path, include_embeddings=args.embeddings, where=where)
+    else:
+        import_jsonl(service, args.path, batch=args.batch)
+        service.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,574 @@
+"""
+Ilija Full_Autonomy_Edition – Memory Service
+=============================================
+Ein gemeinsamer ChromaDB-Zugang für den ganzen Prozess.
+
+Bisher baute skills/gedaechtnis.py beim Import ein Embedding-Modell und
+einen PersistentClient – und load_skills() importiert das Modul bei jedem
+Reload neu. wissen_komplett_abrufen und der EvolutionTracker legten je
+einen weiteren Client (+ Modell) an.
+
+Jetzt:
+  - Dieses Modul liegt außerhalb von skills/ und wird daher nie neu
+    importiert → der Singleton überlebt jeden Skill-Reload.
+  - Client wird beim ersten Zugriff geöffnet, das Embedding-Modell erst
+    wenn tatsächlich eingebettet wird (speichern / suchen).
+  - Reine Zählungen brauchen kein Modell.
+  - Embeddings laufen über einen EmbeddingCache (Speichern und Suchen):
+    bekannte Texte kosten einen Lookup statt eines Transformer-Durchlaufs.
+  - Schreiben per enqueue() ist write-behind: Dokumente werden gesammelt
+    (WRITE_BATCH Stück oder WRITE_FLUSH_MS) und mit einem Modell-Aufruf
+    und einem col.add eingefügt. Der Aufrufer bekommt sofort die ID.
+    query() und flush() warten auf noch ausstehende Einträge.
+  - search() ist hybrid: Vektor-Treffer und BM25-Treffer (KeywordIndex,
+    beim ersten Aufruf aus der Sammlung aufgebaut und danach mitgeführt)
+    werden per Reciprocal Rank Fusion kombiniert und optional nach
+    Abdeckung der Suchbegriffe nachsortiert. Ergebnis: Datensätze mit Scores.
+  - Jeder Eintrag trägt echte Metadaten (build_metadata): Zeitstempel,
+    Quelle, Ziel-ID, Kategorie, Wichtigkeit. search() und find() filtern
+    darauf vorab (Chroma-where); search() gewichtet zusätzlich nach Alter
+    (Halbwertszeit) und Wichtigkeit.
+  - Hochgeladene Dokumente liegen in einer eigenen Sammlung
+    (get_document_store, DOCUMENT_COLLECTION) – ihre Abschnitte verdrängen
+    im normalen Recall keine Erinnerungen. Client, Modell und Cache werden
+    mit dem Haupt-Dienst geteilt.
+  - stats() zeigt ob das Modell warm (geladen) oder kalt ist.
+
+Verwendung:
+  from memory_service import get_memory_service
+  memory = get_memory_service()
+  doc_id = memory.enqueue("text", build_metadata("goal", goal_id="goal_…", importance=0.7))
+  hits = memory.search("suchbegriff", k=3)   # [{"id", "text", "score", ...}]
+  last = memory.find({"source": "goal"}, since_days=7)   # ohne Embedding
+  seite = memory.page(offset=0, limit=50)                 # Blättern ohne Embeddings
+  for eintrag in memory.iter_all(): ...                   # seitenweise, konstanter Speicher
+"""
+
+import atexit
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DB_PATH             = "./memory/ilija_db"
+EMBEDDING_MODEL     = "all-MiniLM-L6-v2"
+COLLECTION_NAME     = "globales_wissen"   # Langzeitgedächtnis
+DOCUMENT_COLLECTION = "dokumente"         # Abschnitte hochgeladener Dokumente (document_ingest)
+WRITE_BATCH         = 32                  # Dokumente pro Einfüge-Batch
+WRITE_FLUSH_MS      = 500                 # Max. Wartezeit bis ein Batch geschrieben wird
+
+SEARCH_CANDIDATES   = 20     # Kandidaten pro Teilsuche (Vektor / BM25)
+RRF_K               = 60     # Dämpfung der Reciprocal Rank Fusion
+MAX_VECTOR_DISTANCE = 1.8    # Vektor-Treffer darüber gelten als Rauschen
+MIN_RELATIVE_SCORE  = 0.25   # Treffer unter diesem Anteil des besten Scores verwerfen
+HALF_LIFE_DAYS      = 30     # Recency-Decay: nach so vielen Tagen halbe Gewichtung
+PAGE_LIMIT          = 500    # Obergrenze pro Seite (page / iter_all)
+FIND_WINDOWS_DAYS   = (1, 7, 30, 365)   # find(): Zeitfenster, von jetzt rückwärts erweitert
+LEGACY_SCAN         = PAGE_LIMIT        # find(): max. Einträge für Alt-Einträge ohne "ts"
+DEFAULT_INCLUDE     = ("documents", "metadatas")   # Embeddings nur auf Anfrage
+
+SOURCES = ("goal", "reflection", "moltbook", "user", "skill", "document")
+
+
+def build_metadata(source: str = "skill", goal_id: Optional[str] = None,
+                   category: Optional[str] = None, importance: float = 0.5,
+                   **extra) -> Dict:
+    """
+    Strukturierte Metadaten für einen Gedächtnis-Eintrag.
+    None-Werte werden weggelassen (Chroma erlaubt nur str/int/float/bool).
+    """
+    now  = time.time()
+    meta = {
+        "type":       "memory",
+        "source":     source,
+        "ts":         now,
+        "created_at": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+        "importance": max(0.0, min(1.0, float(importance))),
+        "goal_id":    goal_id,
+        "category":   category,
+        **extra,
+    }
+    return {k: v for k, v in meta.items() if v is not None}
+
+
+def _where(where: Optional[Dict], since_days: Optional[float],
+           before: Optional[float] = None, now: Optional[float] = None) -> Optional[Dict]:
+    """
+    Kombiniert einen Chroma-where-Filter mit einer Zeitgrenze
+    (ts >= now - since_days, optional ts < before).
+    """
+    clauses = []
+    if where and any(k.startswith("$") for k in where):
+        clauses.append(where)
+    elif where:
+        # {"a": 1, "b": 2} ist für Chroma kein gültiger Filter → in $and zerlegen
+        clauses.extend({k: v} for k, v in where.items())
+    if since_days is not None:
+        clauses.append({"ts": {"$gte": (now or time.time()) - since_days * 86400}})
+    if before is not None:
+        clauses.append({"ts": {"$lt": before}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _entry_ts(meta: Dict) -> float:
+    """
+    Zeitstempel eines Eintrags: "ts" bzw. bei Alt-Einträgen (vor build_metadata)
+    das Feld "timestamp" – als Zahl oder ISO-Datum. 0.0 wenn keins lesbar ist.
+    """
+    value = meta.get("ts")
+    if isinstance(value, (int, float)):
+        return float(value)
+    legacy = meta.get("timestamp")
+    if legacy in (None, ""):
+        return 0.0
+    try:
+        return float(legacy)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(legacy)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class MemoryService:
+    """Lazy geladener, geteilter ChromaDB-Client samt Embedding-Funktion."""
+
+    def __init__(self, db_path: str = DB_PATH,
+                 model_name: str = EMBEDDING_MODEL,
+                 collection_name: str = COLLECTION_NAME,
+                 shared: Optional["MemoryService"] = None):
+        self.db_path         = db_path
+        self.model_name      = model_name
+        self.collection_name = collection_name
+        self.shared          = shared   # liefert Client, Modell und Cache (nur eine Kopie pro Prozess)
+        self._client         = None
+        self._ef             = None
+        self._collection     = None
+        self._model_load_s: Optional[float] = None
+        self._cache          = None
+        self._keywords       = None
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        # Write-behind-Queue
+        self._pending: List[Tuple[str, str, Dict]] = []   # (id, dokument, metadaten)
+        self._writing        = 0
+        self._write_cond     = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self.written         = 0
+        self.write_errors    = 0
+
+    def client(self):
+        """PersistentClient (öffnet die DB beim ersten Aufruf)."""
+        if self.shared is not None:
+            return self.shared.client()
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import chromadb
+                    self._client = chromadb.PersistentClient(path=self.db_path)
+        return self._client
+
+    def embedding_function(self):
+        """SentenceTransformer-Embedding – wird genau einmal pro Prozess geladen."""
+        if self.shared is not None:
+            return self.shared.embedding_function()
+        if self._ef is None:
+            with self._lock:
+                if self._ef is None:
+                    from chromadb.utils import embedding_functions
+                    started  = time.time()
+                    self._ef = embedding_functions.SentenceTransformerEmbeddingFunction(
+                        model_name=self.model_name
+                    )
+                    self._model_load_s = time.time() - started
+                    logger.info(f"MemoryService: Embedding-Modell geladen ({self._model_load_s:.1f}s)")
+        return self._ef
+
+    def collection(self):
+        """
+        Die gemeinsame Sammlung. Ohne eigene Embedding-Funktion – Vektoren
+        liefert embed(), daher lädt dieser Zugriff das Modell nicht.
+        """
+        if self._collection is None:
+            client = self.client()
+            with self._lock:
+                if self._collection is None:
+                    self._collection = client.get_or_create_collection(
+                        name=self.collection_name, embedding_function=None
+                    )
+        return self._collection
+
+    def embedding_cache(self):
+        """EmbeddingCache für das aktuelle Modell (None wenn nicht verfügbar)."""
+        if self.shared is not None:
+            return self.shared.embedding_cache()
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    try:
+                        from embedding_cache import EmbeddingCache
+                        self._cache = EmbeddingCache(self.model_name)
+                    except Exception as e:
+                        logger.warning(f"MemoryService: Embedding-Cache nicht verfügbar ({e})")
+                        self._cache = False
+        return self._cache or None
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings über den Cache – nur unbekannte Texte laden/nutzen das Modell."""
+        compute = lambda batch: [list(v) for v in self.embedding_function()(batch)]
+        cache   = self.embedding_cache()
+        if cache is None:
+            return compute(texts)
+        return cache.embed(texts, compute)
+
+    def add(self, documents: List[str], metadatas: List[Dict], ids: List[str]) -> None:
+        self.collection().add(
+            documents=documents, metadatas=metadatas, ids=ids,
+            embeddings=self.embed(documents),
+        )
+        self._index_add(ids, documents)
+
+    def add_one(self, document: str, metadata: Dict) -> str:
+        """Synchron einfügen (ohne Write-behind). Returns: die neue ID."""
+        doc_id = str(uuid.uuid4())
+        self.add([document], [metadata], [doc_id])
+        return doc_id
+
+    def delete(self, ids: List[str]) -> None:
+        """Einträge aus Sammlung und Keyword-Index entfernen."""
+        if not ids:
+            return
+        self.collection().delete(ids=ids)
+        # Unter _index_lock: ein laufender Aufbau liest den Eintrag evtl. noch
+        # aus der Sammlung – entfernt wird erst danach
+        with self._index_lock:
+            if self._keywords is not None:
+                for doc_id in ids:
+                    self._keywords.remove(doc_id)
+
+    def upsert(self, documents: List[str], metadatas: List[Dict], ids: List[str],
+               embeddings: Optional[List] = None) -> None:
+        """Einfügen oder ersetzen (Import/Migration). Fehlende Embeddings werden berechnet."""
+        self.collection().upsert(
+            documents=documents, metadatas=metadatas, ids=ids,
+            embeddings=embeddings if embeddings is not None else self.embed(documents),
+        )
+        self._index_add(ids, documents)
+
+    def _index_add(self, ids: List[str], documents: List[str]) -> None:
+        """
+        Neue Einträge in den Keyword-Index. Die Prüfung läuft unter _index_lock:
+        während des ersten Aufbaus wartet der Schreiber und trägt danach ein –
+        sonst fehlten Einträge, die nach dem Lesen ihrer Seite geschrieben wurden.
+        """
+        with self._index_lock:
+            if self._keywords is not None:
+                for doc_id, document in zip(ids, documents):
+                    self._keywords.add(doc_id, document)
+
+    def keyword_index(self):
+        """
+        BM25-Index über alle Dokumente (einmalig pro Prozess aus der Sammlung
+        aufgebaut). Ohne flush – noch ausstehende Einträge trägt add() nach
+        dem Aufbau ein (der Writer wartet so lange auf _index_lock).
+        """
+        if self._keywords is None:
+            with self._index_lock:
+                if self._keywords is None:
+                    from keyword_index import KeywordIndex
+                    index   = KeywordIndex()
+                    started = time.time()
+                    for item in self.iter_all(batch=PAGE_LIMIT, include=("documents",), flush=False):
+                        index.add(item["id"], item["text"] or "")
+                    self._keywords = index
+                    logger.info(f"MemoryService: Keyword-Index aufgebaut ({len(index)} Dokumente, "
+                                f"{time.time() - started:.1f}s)")
+        return self._keywords
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    def enqueue(self, document: str, metadata: Optional[Dict] = None) -> str:
+        """Dokument zum Speichern vormerken. Returns: die ID (sofort)."""
+        doc_id = str(uuid.uuid4())
+        if metadata is None:
+            metadata = build_metadata()
+        elif "ts" not in metadata:
+            metadata = {**build_metadata(), **metadata}
+        with self._write_cond:
+            self._pending.append((doc_id, document, metadata))
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="memory-writer", daemon=True)
+                self._writer.start()
+            self._write_cond.notify_all()
+        return doc_id
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._write_cond:
+                self._write_cond.wait_for(lambda: self._pending)
+                # Kurz sammeln, bis der Batch voll ist oder WRITE_FLUSH_MS vergangen sind
+                self._write_cond.wait_for(lambda: len(self._pending) >= WRITE_BATCH,
+                                          timeout=WRITE_FLUSH_MS / 1000)
+                batch = self._pending[:WRITE_BATCH]
+                del self._pending[:WRITE_BATCH]
+                self._writing = len(batch)
+
+            try:
+                ids, documents, metadatas = (list(col) for col in zip(*batch))
+                self.add(documents, metadatas, ids)
+                self.written += len(batch)
+            except Exception as e:
+                self.write_errors += len(batch)
+                logger.error(f"MemoryService: {len(batch)} Einträge nicht gespeichert: {e}")
+            finally:
+                with self._write_cond:
+                    self._writing = 0
+                    self._write_cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Wartet bis alle vorgemerkten Dokumente geschrieben sind."""
+        with self._write_cond:
+            self._write_cond.notify_all()
+            return self._write_cond.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def query(self, text: str, n_results: int = 3) -> Dict:
+        # Eigene, noch ausstehende Schreibvorgänge sollen gefunden werden
+        if self._pending or self._writing:
+            self.flush()
+        return self.collection().query(
+            query_embeddings=self.embed([text]), n_results=n_results,
+        )
+
+    def search(self, text: str, k: int = 3, rerank: bool = True,
+               candidates: int = SEARCH_CANDIDATES,
+               where: Optional[Dict] = None, since_days: Optional[float] = None,
+               half_life_days: Optional[float] = HALF_LIFE_DAYS,
+               flush_timeout: Optional[float] = 30.0) -> List[Dict]:
+        """
+        Hybride Suche (Vektor + BM25). Returns: bis zu k Datensätze
+        {"id", "text", "metadata", "score", "distance", "bm25"}, bester zuerst.
+        where/since_days filtern vorab; half_life_days=None schaltet den Decay ab.
+        Ausstehende Einträge werden höchstens flush_timeout Sekunden abgewartet
+        (0 = nur bereits eingebettete durchsuchen).
+        """
+        if self._pending or self._writing:
+            self.flush(flush_timeout)
+        col   = self.collection()
+        total = col.count()
+        if not total:
+            return []
+        flt = _where(where, since_days)
+
+        records: Dict[str, Dict] = {}
+
+        def hit(doc_id: str, rank: int) -> Dict:
+            record = records.setdefault(doc_id, {
+                "id": doc_id, "text": None, "metadata": {},
+                "score": 0.0, "distance": None, "bm25": None,
+            })
+            record["score"] += 1.0 / (RRF_K + rank)
+            return record
+
+        vector = col.query(
+            query_embeddings=self.embed([text]), n_results=min(candidates, total),
+            include=["documents", "metadatas", "distances"], where=flt,
+        )
+        ranked = zip(vector["ids"][0], vector["documents"][0],
+                     vector["metadatas"][0], vector["distances"][0])
+        rank = 0
+        for doc_id, document, metadata, distance in ranked:
+            if distance >= MAX_VECTOR_DISTANCE:
+                continue
+            rank  += 1
+            record = hit(doc_id, rank)
+            record.update(text=document, metadata=metadata or {}, distance=distance)
+
+        index = self.keyword_index()
+        for rank, (doc_id, bm25) in enumerate(index.search(text, candidates), 1):
+            hit(doc_id, rank)["bm25"] = bm25
+
+        # Nur-BM25-Treffer: Text nachladen – der Filter gilt auch hier
+        missing = [r["id"] for r in records.values() if r["text"] is None]
+        if missing:
+            data = col.get(ids=missing, where=flt, include=["documents", "metadatas"])
+            for doc_id, document, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+                records[doc_id].update(text=document, metadata=metadata or {})
+
+        results = [r for r in records.values() if r["text"] is not None]
+        if not results:
+            return []
+        now = time.time()
+        for r in results:
+            meta = r["metadata"]
+            if rerank:
+                # Leichtgewichtig: Treffer, die die Suchbegriffe wörtlich enthalten, nach vorn
+                r["score"] *= 1.0 + index.coverage(text, r["id"])
+            if half_life_days and isinstance(meta.get("ts"), (int, float)):
+                age_days    = max(0.0, now - meta["ts"]) / 86400
+                r["score"] *= 0.5 ** (age_days / half_life_days)
+            r["score"] *= 0.5 + float(meta.get("importance", 0.5))
+
+        results.sort(key=lambda r: -r["score"])
+        best = results[0]["score"]
+        return [r for r in results[:k] if r["score"] >= best * MIN_RELATIVE_SCORE]
+
+    def find(self, where: Optional[Dict] = None, since_days: Optional[float] = None,
+             limit: int = 100) -> List[Dict]:
+        """
+        Reine Metadaten-Abfrage (kein Embedding), z.B. find({"source": "goal"},
+        since_days=7). Bis zu limit Treffer, neueste zuerst.
+
+        Chroma liefert Treffer in Einfügereihenfolge, nicht nach Zeit. Statt
+        alles zu durchlaufen, wird die Zeitgrenze als where-Filter übergeben
+        und das Zeitfenster von jetzt aus schrittweise erweitert
+        (FIND_WINDOWS_DAYS) – Schluss, sobald limit Treffer beisammen sind.
+        Alt-Einträge ohne "ts" (nur "timestamp", siehe _entry_ts) erfasst ein
+        zweiter Durchgang über höchstens LEGACY_SCAN Einträge.
+        """
+        limit = max(1, int(limit))
+        if self._pending or self._writing:
+            self.flush()
+        now   = time.time()
+        spans = [d for d in FIND_WINDOWS_DAYS if since_days is None or d < since_days]
+        spans.append(since_days)   # None = ohne Untergrenze
+        found: Dict[str, Dict] = {}
+        before = None
+        for days in spans:
+            flt  = _where(where, days, before=before, now=now)
+            data = self.collection().get(where=flt, limit=limit - len(found),
+                                         include=["documents", "metadatas"])
+            for doc_id, document, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+                found[doc_id] = {"id": doc_id, "text": document, "metadata": metadata or {}}
+            if len(found) >= limit or days is None:
+                break
+            before = now - days * 86400
+
+        if len(found) < limit:
+            cutoff = now - since_days * 86400 if since_days is not None else 0.0
+            data   = self.collection().get(where=_where(where, None), limit=LEGACY_SCAN,
+                                           include=["documents", "metadatas"])
+            for doc_id, document, metadata in zip(data["ids"], data["documents"], data["metadatas"]):
+                metadata = metadata or {}
+                if "ts" in metadata or doc_id in found or _entry_ts(metadata) < cutoff:
+                    continue
+                found[doc_id] = {"id": doc_id, "text": document, "metadata": metadata}
+
+        newest = sorted(found.values(), key=lambda e: _entry_ts(e["metadata"]), reverse=True)
+        return newest[:limit]
+
+    def page(self, offset: int = 0, limit: int = 50, where: Optional[Dict] = None,
+             include: Sequence[str] = DEFAULT_INCLUDE) -> Dict:
+        """
+        Eine Seite der Sammlung (Cursor über offset/limit).
+        Embeddings kommen als float32-Zeilen einer numpy-Matrix pro Seite
+        (Listen erst beim JSON-Export, siehe memory_export).
+        Returns: {"items": [...], "offset", "next_offset" (None am Ende), "total"}
+        """
+        limit = max(1, min(int(limit), PAGE_LIMIT))
+        data  = self.collection().get(
+            where=where, offset=int(offset), limit=limit, include=list(include),
+        )
+        vectors = None
+        if "embeddings" in include and len(data["ids"]):
+            import numpy as np
+            vectors = np.asarray(data["embeddings"], dtype=np.float32)
+        items = []
+        for n, doc_id in enumerate(data["ids"]):
+            item = {"id": doc_id}
+            if "documents" in include:
+                item["text"] = data["documents"][n]
+            if "metadatas" in include:
+                item["metadata"] = data["metadatas"][n] or {}
+            if "embeddings" in include:
+                item["embedding"] = vectors[n]
+            items.append(item)
+        total = self.count() if where is None else None
+        more  = len(items) == limit and (total is None or offset + limit < total)
+        return {
+            "items":       items,
+            "offset":      offset,
+            "next_offset": offset + len(items) if more else None,
+            "total":       total,
+        }
+
+    def iter_all(self, where: Optional[Dict] = None, batch: int = PAGE_LIMIT,
+                 include: Sequence[str] = DEFAULT_INCLUDE, flush: bool = True) -> Iterator[Dict]:
+        """
+        Alle Einträge seitenweise – nie mehr als eine Seite im Speicher.
+        flush=False liest ohne auf ausstehende Write-behind-Einträge zu warten.
+        """
+        if flush and (self._pending or self._writing):
+            self.flush()
+        offset = 0
+        while offset is not None:
+            result = self.page(offset, batch, where=where, include=include)
+            yield from result["items"]
+            offset = result["next_offset"]
+
+    def count(self) -> int:
+        """Anzahl gespeicherter Einträge – ohne das Embedding-Modell zu laden."""
+        try:
+            return self.collection().count()
+        except Exception:
+            return 0
+
+    @property
+    def warm(self) -> bool:
+        if self.shared is not None:
+            return self.shared.warm
+        return self._ef is not None
+
+    def stats(self) -> Dict:
+        base = self.shared or self   # Client, Modell und Cache gehören ggf. dem Haupt-Dienst
+        return {
+            "state":        "warm" if self.warm else "cold",
+            "client_open":  base._client is not None,
+            "model":        self.model_name,
+            "model_load_s": round(base._model_load_s, 2) if base._model_load_s else None,
+            "collection":   self.collection_name,
+            "embed_cache":  base._cache.stats() if base._cache else None,
+            "write_queue":  len(self._pending) + self._writing,
+            "written":      self.written,
+            "write_errors": self.write_errors,
+        }
+
+
+# ── Singleton ──────────────────────────────────────────────────
+
+_service: Optional[MemoryService] = None
+_service_lock = threading.Lock()
+
+def get_memory_service() -> MemoryService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = MemoryService()
+                # Ausstehende Einträge beim Beenden nicht verlieren
+                atexit.register(_service.flush)
+    return _service
+
+
+_documents: Optional[MemoryService] = None
+
+def get_document_store() -> MemoryService:
+    """Eigene Sammlung für Dokument-Abschnitte (teilt Client und Modell mit get_memory_service)."""
+    global _documents
+    if _documents is None:
+        memory = get_memory_service()
+        with _service_lock:
+            if _documents is None:
+                _documents = MemoryService(collection_name=DOCUMENT_COLLECTION, shared=memory)
+                atexit.register(_documents.flush)
+    return _documents
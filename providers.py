@@ -8,6 +8,8 @@ Unterstützt: Claude (Anthropic), ChatGPT (OpenAI), Gemini (Google), Ollama (lok
 
 import logging
 import os
+import threading
+import time
 from typing import Optional, Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
@@ -199,6 +201,64 @@ class OllamaProvider(LLMProvider):
             raise ProviderError(str(e))
 
 
+class RateLimiter:
+    """
+    Prozessweit geteilte Drosselung für LLM-Aufrufe.
+      - max_concurrent: maximale Anzahl gleichzeitiger Aufrufe
+      - min_interval:   Mindestabstand zwischen zwei Aufrufen (Sekunden)
+      - cooldown:       nach einem RateLimitError pausieren ALLE Aufrufer
+    """
+
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 0.0,
+                 cooldown: float = 30.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval   = min_interval
+        self.cooldown       = cooldown
+        self._slots         = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock          = threading.Lock()
+        self._next_call     = 0.0
+        self._blocked_until = 0.0
+
+    def acquire(self) -> None:
+        self._slots.acquire()
+        with self._lock:
+            now  = time.time()
+            wait = max(self._next_call, self._blocked_until) - now
+            self._next_call = max(now, self._next_call, self._blocked_until) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def report_rate_limit(self) -> None:
+        """Vom Provider gemeldetes Rate-Limit → globale Pause."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.time() + self.cooldown)
+        logger.warning(f"⏳ Rate-Limit – alle LLM-Aufrufe pausieren {self.cooldown:.0f}s")
+
+
+class RateLimitedProvider:
+    """Hüllt einen Provider ein, sodass sich alle Nutzer einen RateLimiter teilen."""
+
+    def __init__(self, provider: LLMProvider, limiter: RateLimiter):
+        self._provider = provider
+        self.limiter   = limiter
+
+    def __getattr__(self, name):
+        return getattr(self._provider, name)
+
+    def chat(self, messages: List[Dict], force_json: bool = False) -> str:
+        self.limiter.acquire()
+        try:
+            return self._provider.chat(messages, force_json=force_json)
+        except RateLimitError:
+            self.limiter.report_rate_limit()
+            raise
+        finally:
+            self.limiter.release()
+
+
 def select_provider(preference: str = "auto") -> Tuple[str, LLMProvider]:
     """
     Wählt den ersten verfügbaren Provider aus.
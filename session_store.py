@@ -0,0 +1,117 @@
+"""
+Ilija Full_Autonomy_Edition – Session Store
+============================================
+Begrenzter Speicher für Web-Sessions.
+
+Bisher baute jede Browser-Session einen vollständigen Kernel: Provider-
+Probe, eigener SkillManager, alle Skill-Module neu importiert – und das
+dict web_server.kernels wurde nie aufgeräumt.
+
+Jetzt:
+  SessionStore  → LRU + TTL: höchstens max_sessions Einträge, unbenutzte
+                  Sessions verfallen nach ttl_seconds.
+  ProviderPool  → ein Provider pro Name ("auto", "claude", …), von allen
+                  Sessions geteilt; die Provider-Probe läuft einmal.
+
+Pro Session bleibt nur der Chat-Zustand (Kernel mit geteiltem SkillManager
+und geteiltem Provider) – der Speicher wächst nicht mit der Zahl der Sessions.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_SESSIONS = 200
+SESSION_TTL  = 3600   # Sekunden ohne Zugriff bis eine Session verfällt
+
+
+class SessionStore:
+    """Thread-sicherer LRU/TTL-Speicher: Session-ID → Objekt."""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl_seconds: float = SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.ttl_seconds  = ttl_seconds
+        self.evicted      = 0
+        self._items: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict_locked(self, now: float) -> None:
+        # Älteste Zugriffe stehen vorn – abgelaufene Sessions liegen daher am Anfang
+        while self._items:
+            key, (_, last) = next(iter(self._items.items()))
+            if now - last < self.ttl_seconds and len(self._items) <= self.max_sessions:
+                break
+            self._items.popitem(last=False)
+            self.evicted += 1
+            logger.debug(f"SessionStore: Session {key} verworfen")
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        """Objekt zur Session (None wenn unbekannt/abgelaufen); zählt als Zugriff."""
+        if not key:
+            return None
+        now = time.time()
+        with self._lock:
+            self._evict_locked(now)
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items[key] = (item[0], now)
+            self._items.move_to_end(key)
+            return item[0]
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = factory()
+        with self._lock:
+            # Parallel angelegt? Dann gewinnt der erste Eintrag
+            existing = self._items.get(key)
+            if existing is not None:
+                return existing[0]
+            self._items[key] = (value, time.time())
+            self._evict_locked(time.time())
+        return value
+
+    def pop(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._items.pop(key, None)
+        return item[0] if item else None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict:
+        return {
+            "sessions":     len(self._items),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds":  self.ttl_seconds,
+            "evicted":      self.evicted,
+        }
+
+
+class ProviderPool:
+    """Ein LLM-Provider pro angefragtem Namen, geteilt von allen Sessions."""
+
+    def __init__(self, select: Optional[Callable] = None):
+        if select is None:
+            from providers import select_provider as select
+        self._select = select
+        self._providers: Dict[str, Tuple[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str = "auto") -> Tuple[str, Any]:
+        """Returns: (provider_name, provider) – Probe nur beim ersten Aufruf je Name."""
+        pair = self._providers.get(name)
+        if pair is None:
+            with self._lock:
+                pair = self._providers.get(name)
+                if pair is None:
+                    pair = self._select(name)
+                    self._providers[name] = pair
+                    logger.info(f"ProviderPool: '{name}' → {pair[0]}")
+        return pair
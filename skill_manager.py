@@ -1,16 +1,29 @@
 """
 Skill Manager – verwaltet das dynamische Laden und Ausführen von Skills.
 (Zusammengeführte Version aus skill_manager.py und skill_manager_improved.py)
+
+Reload im Hintergrund: request_reload() liefert sofort eine Reload-ID;
+der Reload läuft in einem eigenen Thread gegen diese (geteilte) Registry,
+protokolliert Ladezeit und Fehler je Modul und tauscht die Registry am
+Ende atomar – alle Sessions sehen ab dann den neuen Stand.
 """
 import os
 import importlib.util
 import inspect
 import sys
 import logging
+import threading
+import time
+from contextlib import nullcontext
 from typing import Dict, List, Callable, Optional
 
+from event_bus import publish
+from skill_policy import exclusive_group
+
 logger = logging.getLogger(__name__)
 
+RELOAD_HISTORY = 20   # so viele Reload-Berichte bleiben abrufbar
+
 
 class SkillManager:
     """Verwaltet das dynamische Laden und Ausführen von Skills."""
@@ -20,36 +33,121 @@ class SkillManager:
         self.loaded_tools: Dict[str, Callable] = {}
         self.tool_definitions: List[str] = []
         self.skill_metadata: Dict[str, Dict] = {}
-
-    def load_skills(self) -> int:
+        self.registry_version = 0   # steigt bei jedem Reload – für abgeleitete Caches
+        self.names_version    = 0   # steigt nur, wenn sich die Menge der Skill-Namen ändert
+        # Reloads serialisieren; neue Registry wird erst komplett aufgebaut
+        # und dann atomar getauscht – laufende Ausführungen sehen nie einen halben Stand.
+        self._reload_lock = threading.RLock()
+        self._group_locks: Dict[str, threading.Lock] = {}
+        self._group_locks_guard = threading.Lock()
+        # Hintergrund-Reloads: id → Bericht; höchstens einer wartet hinter dem laufenden
+        self._reloads: Dict[int, Dict] = {}
+        self._reload_seq = 0
+        self._pending_reload: Optional[Dict] = None
+        self._reloads_guard = threading.Lock()
+
+    def load_skills(self, report: Optional[Dict] = None) -> int:
         """
         Lädt alle Python-Module aus dem skills/-Ordner neu.
+        report: wird mit Ladezeit und Fehler je Modul gefüllt (Hintergrund-Reload).
         Returns: Anzahl der erfolgreich registrierten Skill-Funktionen.
         """
-        self.loaded_tools.clear()
-        self.tool_definitions.clear()
-        self.skill_metadata.clear()
-
-        if not os.path.exists(self.skills_dir):
-            try:
-                os.makedirs(self.skills_dir)
-                logger.info(f"Skills-Verzeichnis erstellt: {self.skills_dir}")
-            except Exception as e:
-                logger.error(f"Fehler beim Erstellen des Skills-Verzeichnisses: {e}")
-                return 0
-
-        for filename in sorted(os.listdir(self.skills_dir)):
-            if filename.endswith(".py") and not filename.startswith("__"):
+        with self._reload_lock:
+            if not os.path.exists(self.skills_dir):
                 try:
-                    self._load_module_from_file(filename)
+                    os.makedirs(self.skills_dir)
+                    logger.info(f"Skills-Verzeichnis erstellt: {self.skills_dir}")
                 except Exception as e:
-                    logger.error(f"Fehler beim Laden von {filename}: {e}")
-
-        logger.info(f"Skills geladen: {len(self.loaded_tools)}")
-        return len(self.loaded_tools)
-
-    def _load_module_from_file(self, filename: str) -> bool:
-        """Lädt ein einzelnes Skill-Modul. Returns True bei Erfolg."""
+                    logger.error(f"Fehler beim Erstellen des Skills-Verzeichnisses: {e}")
+                    return 0
+
+            tools: Dict[str, Callable] = {}
+            definitions: List[str] = []
+            metadata: Dict[str, Dict] = {}
+            modules: List[Dict] = []
+
+            for filename in sorted(os.listdir(self.skills_dir)):
+                if filename.endswith(".py") and not filename.startswith("__"):
+                    entry = {"module": filename, "skills": 0, "ms": 0.0, "error": None}
+                    started = time.perf_counter()
+                    try:
+                        self._load_module_from_file(filename, tools, definitions, metadata, entry)
+                    except Exception as e:
+                        logger.error(f"Fehler beim Laden von {filename}: {e}")
+                        entry["error"] = str(e)
+                    entry["ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    modules.append(entry)
+
+            if tools.keys() != self.loaded_tools.keys():
+                self.names_version += 1
+            self.loaded_tools, self.tool_definitions, self.skill_metadata = tools, definitions, metadata
+            self.registry_version += 1
+            version = self.registry_version
+
+        logger.info(f"Skills geladen: {len(tools)}")
+        if report is not None:
+            report.update(modules=modules, skills=len(tools), registry_version=version,
+                          errors=sum(1 for m in modules if m["error"]))
+        publish("skills", {"registry_version": version, "skills": len(tools),
+                           "reload_id": report.get("id") if report else None})
+        return len(tools)
+
+    # ── Hintergrund-Reload ──────────────────────────────────────
+
+    def request_reload(self) -> Dict:
+        """
+        Reload im Hintergrund anstoßen. Läuft bereits einer, wird genau ein
+        weiterer eingereiht; weitere Anfragen bekommen dessen ID (sie würden
+        ohnehin denselben Stand laden).
+        Returns: Kopie des Reload-Berichts (id, status, ...).
+        """
+        with self._reloads_guard:
+            if self._pending_reload is not None:
+                return dict(self._pending_reload)
+            self._reload_seq += 1
+            report = {"id": self._reload_seq, "status": "pending", "requested_at": time.time()}
+            self._reloads[report["id"]] = report
+            while len(self._reloads) > RELOAD_HISTORY:
+                del self._reloads[min(self._reloads)]
+            self._pending_reload = report
+        threading.Thread(target=self._run_reload, args=(report,), daemon=True,
+                         name=f"skill-reload-{report['id']}").start()
+        return dict(report)
+
+    def _run_reload(self, report: Dict) -> None:
+        with self._reload_lock:   # wartet auf einen laufenden Reload
+            with self._reloads_guard:
+                if self._pending_reload is report:
+                    self._pending_reload = None
+                report.update(status="running", started_at=time.time())
+            started = time.perf_counter()
+            result  = {"id": report["id"]}   # erst am Ende übernehmen – reload_status liest parallel
+            try:
+                self.load_skills(report=result)
+                status = "done"
+            except Exception as e:
+                logger.error(f"Skill-Reload {report['id']} fehlgeschlagen: {e}", exc_info=True)
+                result["error"] = str(e)
+                status = "error"
+            with self._reloads_guard:
+                report.update(result, status=status, finished_at=time.time(),
+                              duration_ms=round((time.perf_counter() - started) * 1000, 1))
+        logger.info(f"Skill-Reload {report['id']}: {status} in {report['duration_ms']} ms")
+
+    def reload_status(self, reload_id: int) -> Optional[Dict]:
+        """Bericht eines Hintergrund-Reloads (None wenn unbekannt/verdrängt)."""
+        with self._reloads_guard:
+            report = self._reloads.get(reload_id)
+            return dict(report) if report else None
+
+    def _load_module_from_file(self, filename: str, tools: Dict[str, Callable],
+                               definitions: List[str], metadata: Dict[str, Dict],
+                               entry: Optional[Dict] = None) -> bool:
+        """
+        Lädt ein einzelnes Skill-Modul. Returns True bei Erfolg.
+        entry: Modul-Bericht – erhält Anzahl Skills bzw. die Fehlermeldung.
+        """
+        entry = entry if entry is not None else {}
         module_name = filename[:-3]
         file_path = os.path.join(self.skills_dir, filename)
 
@@ -57,6 +155,7 @@ class SkillManager:
             spec = importlib.util.spec_from_file_location(module_name, file_path)
             if not spec or not spec.loader:
                 logger.warning(f"Keine gültige Spezifikation für {filename}")
+                entry["error"] = "keine gültige Modul-Spezifikation"
                 return False
 
             module = importlib.util.module_from_spec(spec)
@@ -69,37 +168,42 @@ class SkillManager:
 
             # Skills können andere Skills per Name aufrufen
             # (z.B. webseiten_inhalt_lesen() in einem neuen Skill)
-            for skill_name, skill_func in self.loaded_tools.items():
+            for skill_name, skill_func in tools.items():
                 setattr(module, skill_name, skill_func)
 
             spec.loader.exec_module(module)
 
             if not hasattr(module, "AVAILABLE_SKILLS"):
                 logger.warning(f"⚠️  {filename} hat keine 'AVAILABLE_SKILLS' Liste.")
+                entry["error"] = "keine AVAILABLE_SKILLS-Liste"
                 return False
 
             skills_in_module = 0
             for func in module.AVAILABLE_SKILLS:
-                if callable(func) and self._register_tool(func, module_name):
+                if callable(func) and self._register_tool(func, module_name, tools, definitions, metadata):
                     skills_in_module += 1
 
+            entry["skills"] = skills_in_module
             logger.info(f"✓ {filename}: {skills_in_module} Skill(s) geladen")
             return skills_in_module > 0
 
         except SyntaxError as e:
             logger.error(f"Syntax-Fehler in {filename}: {e}")
             print(f"   ❌ Syntax-Fehler in {filename} (Zeile {e.lineno}): {e.msg}")
+            entry["error"] = f"SyntaxError Zeile {e.lineno}: {e.msg}"
             return False
         except Exception as e:
             logger.error(f"Fehler beim Laden von {filename}: {e}")
             print(f"   ❌ Fehler in {filename}: {e}")
+            entry["error"] = f"{type(e).__name__}: {e}"
             return False
 
-    def _register_tool(self, func: Callable, module_name: str) -> bool:
+    def _register_tool(self, func: Callable, module_name: str, tools: Dict[str, Callable],
+                       definitions: List[str], metadata: Dict[str, Dict]) -> bool:
         """Registriert eine Skill-Funktion. Returns True bei Erfolg."""
         try:
             name = func.__name__
-            if name in self.loaded_tools:
+            if name in tools:
                 logger.warning(f"Skill '{name}' wird überschrieben")
 
             doc = inspect.getdoc(func) or "Keine Beschreibung verfügbar."
@@ -124,9 +228,9 @@ class SkillManager:
                 f"- Skill: {name}({params_str})\n  Info: {doc}\n  Modul: {module_name}"
             )
 
-            self.loaded_tools[name] = func
-            self.tool_definitions.append(definition)
-            self.skill_metadata[name] = {
+            tools[name] = func
+            definitions.append(definition)
+            metadata[name] = {
                 "module": module_name,
                 "doc": doc,
                 "signature": str(sig),
@@ -143,18 +247,31 @@ class SkillManager:
             return "\nKeine Skills verfügbar. Nutze 'skill_erstellen' um neue Skills zu erstellen."
         return "\n" + "\n".join(self.tool_definitions)
 
+    def _exclusive_lock(self, skill_name: str):
+        """Lock für Skills mit nicht-reentranter Ressource (z.B. Selenium-Driver)."""
+        module = self.skill_metadata.get(skill_name, {}).get("module", "")
+        group = exclusive_group(module)
+        if group is None:
+            return nullcontext()
+        with self._group_locks_guard:
+            return self._group_locks.setdefault(group, threading.Lock())
+
     def execute_skill(self, skill_name: str, params: Dict) -> str:
         """Führt einen Skill mit den gegebenen Parametern aus."""
-        if skill_name not in self.loaded_tools:
+        func = self.loaded_tools.get(skill_name)
+        if func is None:
             error_msg = f"Skill '{skill_name}' nicht gefunden."
             logger.error(error_msg)
             return error_msg
 
+        with self._exclusive_lock(skill_name):
+            return self._run_skill(skill_name, func, params)
+
+    def _run_skill(self, skill_name: str, func: Callable, params: Dict) -> str:
         import time
         start_time = time.time()
 
         try:
-            func = self.loaded_tools[skill_name]
             sig = inspect.signature(func)
 
             # Überschüssige Parameter entfernen
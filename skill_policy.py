@@ -42,6 +42,26 @@ SAFE_SKILLS = {
     "whatsapp_lesen", "whatsapp_senden", "moltbook_autonom_starten",
 }
 
+# Skill-Module die sich eine nicht-reentrante Ressource teilen (z.B. den einen
+# Selenium-Driver aus browser_oeffnen). Skills derselben Gruppe laufen im
+# Multi-Goal-Betrieb nie gleichzeitig. "selenium" enthält nur Module, die den
+# Browser selbst steuern – jedes weitere serialisiert unnötig mit.
+EXCLUSIVE_GROUPS = {
+    "selenium": {
+        "browser_oeffnen", "whatsapp_lesen", "whatsapp_senden",
+        "whatsapp_autonomer_dialog",
+    },
+    "desktop": {"terminal_oeffnen_und_eintragen"},
+}
+
+
+def exclusive_group(module_name: str) -> Optional[str]:
+    """Gibt die Exklusiv-Gruppe eines Skill-Moduls zurück (None = reentrant)."""
+    for group, modules in EXCLUSIVE_GROUPS.items():
+        if module_name in modules:
+            return group
+    return None
+
 
 class SkillPolicy:
     """
@@ -20,6 +20,7 @@ import os
 import json
 import time
 import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, List
 
@@ -34,6 +35,7 @@ class SkillScoring:
     def __init__(self, scores_file: str = SCORES_FILE):
         self.scores_file = scores_file
         self.scores: Dict = self._load()
+        self._lock = threading.Lock()
 
     def _load(self) -> Dict:
         """Lädt Scores aus JSON-Datei."""
@@ -74,13 +76,14 @@ class SkillScoring:
             skill_name: Name des Skills
             duration_s: Ausführungsdauer in Sekunden
         """
-        self._ensure_skill(skill_name)
-        s = self.scores[skill_name]
-        s["executions"]   += 1
-        s["successes"]    += 1
-        s["total_time_s"] += duration_s
-        s["last_used"]     = datetime.now().isoformat()
-        self._save()
+        with self._lock:
+            self._ensure_skill(skill_name)
+            s = self.scores[skill_name]
+            s["executions"]   += 1
+            s["successes"]    += 1
+            s["total_time_s"] += duration_s
+            s["last_used"]     = datetime.now().isoformat()
+            self._save()
 
     def record_failure(self, skill_name: str, error: str = "", duration_s: float = 0.0):
         """
@@ -91,14 +94,15 @@ class SkillScoring:
             error: Fehlermeldung
             duration_s: Ausführungsdauer bis zum Fehler
         """
-        self._ensure_skill(skill_name)
-        s = self.scores[skill_name]
-        s["executions"]   += 1
-        s["failures"]     += 1
-        s["total_time_s"] += duration_s
-        s["last_error"]    = error[:200] if error else None
-        s["last_used"]     = datetime.now().isoformat()
-        self._save()
+        with self._lock:
+            self._ensure_skill(skill_name)
+            s = self.scores[skill_name]
+            s["executions"]   += 1
+            s["failures"]     += 1
+            s["total_time_s"] += duration_s
+            s["last_error"]    = error[:200] if error else None
+            s["last_used"]     = datetime.now().isoformat()
+            self._save()
 
     def get_score(self, skill_name: str) -> Optional[Dict]:
         """Gibt den Score eines Skills zurück."""
@@ -17,9 +17,11 @@ from typing import Optional, List, Dict, Any
 
 # Haupt-Skill-Code
 def analyse_und_visualisiere_skill_performance():
-    # 1. Alle Einträge zu Zielausführungen aus dem Langzeitgedächtnis abrufen.
-    #    Es wird angenommen, dass wissen_abrufen eine formatierte Zeichenkette der gefundenen Einträge zurückgibt.
-    all_goal_memories = wissen_abrufen(suchbegriff="Ziel ausgeführt")
+    # 1. Zielergebnisse der letzten 30 Tage aus dem Langzeitgedächtnis holen.
+    #    Metadaten-Filter (source=goal) statt Volltextsuche über die ganze Sammlung.
+    from memory_service import get_memory_service
+    eintraege = get_memory_service().find({"source": "goal"}, since_days=30, limit=500)
+    all_goal_memories = "\n".join(e["text"] for e in eintraege)
     
     report_content = ""
     if not all_goal_memories or "Keine Infos gefunden" in all_goal_memories:
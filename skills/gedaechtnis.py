@@ -1,72 +1,74 @@
-import chromadb
-from chromadb.utils import embedding_functions
-import uuid
-import os
+# Client + Embedding-Modell liegen im prozessweiten MemoryService:
+# wird erst bei Bedarf geladen und überlebt jeden Skill-Reload.
+from memory_service import get_memory_service, build_metadata
 
-# Konfiguration
-DB_PATH = "./memory/ilija_db"
-EF = embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
-CLIENT = chromadb.PersistentClient(path=DB_PATH)
-
-# WIR NUTZEN NUR NOCH EINE SAMMLUNG FÜR ALLES
-COLLECTION_NAME = "globales_wissen"
-
-def wissen_speichern(text: str):
+def wissen_speichern(text: str, quelle: str = "skill", wichtigkeit: float = 0.5):
     """
     Speichert eine wichtige Information im Langzeitgedächtnis.
+    quelle: goal, reflection, moltbook, user oder skill. wichtigkeit: 0.0 – 1.0
     """
     try:
-        col = CLIENT.get_or_create_collection(name=COLLECTION_NAME, embedding_function=EF)
-        
-        doc_id = str(uuid.uuid4())
-        col.add(
-            documents=[text],
-            metadatas=[{"type": "memory", "timestamp": str(os.path.getmtime(__file__))}], # Dummy Metadata
-            ids=[doc_id]
-        )
-        return f"✅ Info gespeichert: '{text}'"
+        # Write-behind: wird gebündelt im Hintergrund eingebettet und eingefügt
+        doc_id = get_memory_service().enqueue(text, build_metadata(quelle, importance=wichtigkeit))
+        return f"✅ Info gespeichert: '{text}' (ID {doc_id[:8]})"
     except Exception as e:
         return f"❌ Speicherfehler: {e}"
 
-def wissen_abrufen(suchbegriff: str):
+def wissen_abrufen(suchbegriff: str, anzahl: int = 3, quelle: str = "", tage: float = 0):
     """
-    Durchsucht das gesamte Gedächtnis nach dem Begriff.
+    Durchsucht das gesamte Gedächtnis nach dem Begriff (Bedeutung + exakte Begriffe).
+    Optional nur Einträge einer quelle bzw. der letzten tage.
     """
     print(f"🧠 KERNEL: Durchsuche 'One-Brain' nach '{suchbegriff}'...")
     
     try:
-        col = CLIENT.get_or_create_collection(name=COLLECTION_NAME, embedding_function=EF)
-        
-        # Wir holen uns die Top 3 Treffer
-        results = col.query(query_texts=[suchbegriff], n_results=3)
+        # Hybride Suche: Vektor-Ähnlichkeit + BM25 auf exakte Begriffe (Skill-Namen, IDs)
+        treffer = get_memory_service().search(
+            suchbegriff, k=int(anzahl),
+            where={"source": quelle} if quelle else None,
+            since_days=float(tage) if tage else None,
+        )
         
-        gefunden = []
-        if results['documents'] and results['documents'][0]:
-            for i, doc in enumerate(results['documents'][0]):
-                dist = results['distances'][0][i]
-                
-                # Debug-Ausgabe für dich im Terminal
-                print(f"   -> Gefunden: '{doc}' (Distanz: {dist:.4f})")
-                
-                # Distanz < 1.6 ist meistens ein guter Treffer. 
-                # Wir sind jetzt etwas toleranter.
-                if dist < 1.8: 
-                    gefunden.append(doc)
+        for t in treffer:
+            # Debug-Ausgabe für dich im Terminal
+            dist = f"{t['distance']:.4f}" if t['distance'] is not None else "–"
+            print(f"   -> Gefunden: '{t['text'][:80]}' (Score: {t['score']:.4f}, Distanz: {dist})")
         
-        if not gefunden:
+        if not treffer:
             return "Nichts passendes im Gedächtnis gefunden."
             
-        return "Gefundene Infos:\n" + "\n".join(gefunden)
+        return "Gefundene Infos:\n" + "\n".join(t['text'] for t in treffer)
 
     except Exception as e:
         return f"Suchfehler: {e}"
 
+def wissen_filtern(quelle: str = "", tage: float = 7, kategorie: str = "", anzahl: int = 20):
+    """
+    Listet Einträge nach Metadaten, neueste zuerst – z.B. Ziel-Ergebnisse
+    der letzten 7 Tage: wissen_filtern(quelle="goal", tage=7).
+    """
+    where = {}
+    if quelle:
+        where["source"] = quelle
+    if kategorie:
+        where["category"] = kategorie
+    try:
+        eintraege = get_memory_service().find(
+            where or None, since_days=float(tage) if tage else None, limit=int(anzahl),
+        )
+        if not eintraege:
+            return "Keine passenden Einträge gefunden."
+        return "\n".join(
+            f"[{e['metadata'].get('created_at', '?')}] {e['text']}" for e in eintraege
+        )
+    except Exception as e:
+        return f"Filterfehler: {e}"
+
 # Debug-Funktion für dich (nicht für die KI)
-def zeige_alles():
+def zeige_alles(offset: int = 0, limit: int = 100):
     try:
-        col = CLIENT.get_collection(name=COLLECTION_NAME, embedding_function=EF)
-        return col.get()
+        return get_memory_service().page(offset=offset, limit=limit)
     except:
         return "Leer."
 
-AVAILABLE_SKILLS = [wissen_speichern, wissen_abrufen]
+AVAILABLE_SKILLS = [wissen_speichern, wissen_abrufen, wissen_filtern]
@@ -237,11 +237,11 @@ def _transkribiere_audio(audio_url, driver):
         subprocess.run(["ffmpeg", "-y", "-i", tmp_path, wav_path],
                        capture_output=True, timeout=30)
         os.unlink(tmp_path)
-        import whisper
-        model = whisper.load_model("base", device="cpu")
-        result = model.transcribe(wav_path, language="de")
-        os.unlink(wav_path)
-        text = result.get("text", "").strip()
+        from transcription_service import get_transcription_service
+        try:
+            text = get_transcription_service().transcribe_file(wav_path)
+        finally:
+            os.unlink(wav_path)
         return f"[Sprachnachricht]: {text}" if text else ""
     except Exception as e:
         logger.warning(f"Audio-Transkription fehlgeschlagen: {e}")
@@ -1,22 +1,19 @@
 import sys, os
 sys.path.insert(0, '/ilija')
 os.chdir('/ilija')
-import chromadb
-from chromadb.utils import embedding_functions
+from memory_service import get_memory_service
 
 def wissen_komplett_abrufen():
     try:
-        ef = embedding_functions.SentenceTransformerEmbeddingFunction(model_name='all-MiniLM-L6-v2')
-        client = chromadb.PersistentClient(path='./memory/ilija_db')
-        col = client.get_or_create_collection('globales_wissen', embedding_function=ef)
-        count = col.count()
+        memory = get_memory_service()
+        count = memory.count()
         if count == 0:
             return 'Gedaechtnis leer.'
-        result = col.get()
-        docs = result.get('documents', [])
+        # Nur die angezeigte Seite laden – ohne Embeddings, ohne Modell
+        seite = memory.page(offset=0, limit=80, include=('documents',))
         out = str(count) + ' Eintraege:\n'
-        for i, d in enumerate(docs[:80]):
-            out += '[' + str(i+1) + '] ' + d + '\n'
+        for i, eintrag in enumerate(seite['items']):
+            out += '[' + str(i+1) + '] ' + (eintrag['text'] or '') + '\n'
         return out
     except Exception as e:
         return 'Fehler: ' + str(e)
@@ -0,0 +1,78 @@
+"""
+Gemeinsame Test-Einstellungen.
+
+Tests schreiben nichts ins Repo-Verzeichnis: der Kernel loggt nur auf die
+Konsole (KERNEL_LOG_FILE leer), Module liegen im Projektwurzelverzeichnis.
+FakeCollection ersetzt ChromaDB für MemoryService-Tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("KERNEL_LOG_FILE", "")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _matches(meta, flt) -> bool:
+    if not flt:
+        return True
+    if "$and" in flt:
+        return all(_matches(meta, c) for c in flt["$and"])
+    for key, cond in flt.items():
+        value = meta.get(key)
+        if isinstance(cond, dict):
+            for op, ref in cond.items():
+                if value is None:
+                    return False
+                if op == "$gte" and not value >= ref:
+                    return False
+                if op == "$lt" and not value < ref:
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+class FakeCollection:
+    """Chroma-Sammlung im Speicher (Einfügereihenfolge, where mit $and/$gte/$lt)."""
+
+    def __init__(self):
+        self.rows  = {}   # id → (dokument, metadaten)
+        self.calls = []   # (where, limit, Anzahl Treffer) je get()
+
+    def add(self, documents, metadatas, ids, embeddings=None):
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self.rows[doc_id] = (document, metadata)
+
+    upsert = add
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.rows.pop(doc_id, None)
+
+    def count(self):
+        return len(self.rows)
+
+    def get(self, ids=None, where=None, offset=0, limit=None, include=()):
+        hits = [(i, d, m) for i, (d, m) in self.rows.items()
+                if (ids is None or i in ids) and _matches(m, where)]
+        hits = hits[offset:offset + limit if limit is not None else None]
+        self.calls.append((where, limit, len(hits)))
+        return {
+            "ids":        [h[0] for h in hits],
+            "documents":  [h[1] for h in hits],
+            "metadatas":  [h[2] for h in hits],
+            "embeddings": [[0.0] for _ in hits],
+        }
+
+
+@pytest.fixture
+def memory():
+    """MemoryService mit FakeCollection, ohne Embedding-Modell."""
+    from memory_service import MemoryService
+    service = MemoryService(db_path="unused")
+    service._collection = FakeCollection()
+    service.embed       = lambda texts: [[0.0] for _ in texts]
+    return service
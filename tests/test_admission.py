@@ -0,0 +1,50 @@
+"""
+AdmissionController: Goal-Jobs teilen sich die globalen Slots mit dem Chat.
+"""
+
+import pytest
+
+from admission import AdmissionController, AdmittedProvider, Saturated
+from goal_jobs import GoalJobManager
+
+
+class EchoProvider:
+    name = "echo"
+
+    def __init__(self, admission):
+        self.admission = admission
+        self.seen      = []
+
+    def chat(self, messages, force_json=False):
+        self.seen.append(self.admission.in_flight)
+        return "ok"
+
+
+def test_admitted_provider_holds_a_slot_per_call():
+    admission = AdmissionController(max_in_flight=2, max_queue=0)
+    inner     = EchoProvider(admission)
+    provider  = AdmittedProvider(inner, admission)
+
+    assert provider.chat([{"role": "user", "content": "hi"}]) == "ok"
+    assert inner.seen == [1]
+    assert admission.in_flight == 0
+    assert provider.name == "echo"
+
+
+def test_check_rejects_when_slots_and_queue_are_full():
+    admission = AdmissionController(max_in_flight=1, max_queue=0)
+    admission.check()
+    with admission.admit():
+        with pytest.raises(Saturated) as info:
+            admission.check()
+    assert info.value.retry_after >= 1
+    assert admission.rejected == 1
+
+
+def test_goal_job_submit_is_rejected_when_saturated():
+    admission = AdmissionController(max_in_flight=1, max_queue=0)
+    jobs      = GoalJobManager(workers=1, admission=admission)
+    with admission.admit():
+        with pytest.raises(Saturated):
+            jobs.submit(kernel=None, goal="Test")
+    assert jobs.stats()["stored"] == 0
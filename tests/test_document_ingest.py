@@ -0,0 +1,40 @@
+"""
+Dokument-Abschnitte: eigene Sammlung, Suche wartet nicht auf den ganzen Upload.
+"""
+
+import time
+
+from document_ingest import ingest, relevant_chunks
+from memory_service import DOCUMENT_COLLECTION, MemoryService
+
+
+def test_document_store_shares_model_but_not_collection():
+    main      = MemoryService(db_path="unused")
+    main._ef  = object()
+    documents = MemoryService(collection_name=DOCUMENT_COLLECTION, shared=main)
+
+    assert documents.embedding_function() is main._ef
+    assert documents.warm
+    assert documents.collection_name != main.collection_name
+
+
+def test_ingest_writes_chunks_to_given_store(memory, tmp_path):
+    path = tmp_path / "notiz.txt"
+    path.write_text("Absatz über Ilija.\n" * 400, encoding="utf-8")
+
+    result = ingest(str(path), "notiz.txt", service=memory)
+    assert memory.flush(timeout=5)
+
+    rows = memory.collection().rows.values()
+    assert len(rows) == result["chunks"] > 1
+    assert {meta["doc_id"] for _, meta in rows} == {result["doc_id"]}
+    assert {meta["source"] for _, meta in rows} == {"document"}
+
+
+def test_relevant_chunks_does_not_wait_for_pending_writes(memory):
+    # Ausstehender Eintrag ohne Writer-Thread – ein voller flush() würde hängen
+    memory._pending.append(("offen", "noch nicht eingebettet", {}))
+
+    started = time.time()
+    assert relevant_chunks(["abc"], "Frage?", service=memory) == []
+    assert time.time() - started < 5
@@ -0,0 +1,28 @@
+"""
+EventBus: Weiterlesen ab einer Nummer (X-Event-Seq / Last-Event-ID) und resync.
+"""
+
+from event_bus import RESYNC, EventBus
+
+
+def test_wait_since_returns_only_newer_events():
+    bus  = EventBus(capacity=10)
+    bus.publish("skills", {"n": 1})
+    mark = bus.seq                       # Snapshot-Stand
+    bus.publish("session", {"n": 2})
+
+    events = bus.wait(mark, timeout=0)
+
+    assert [(topic, data) for _, topic, data, _ in events] == [("session", {"n": 2})]
+
+
+def test_reader_behind_the_ring_gets_resync_first():
+    bus = EventBus(capacity=3)
+    for n in range(6):
+        bus.publish("goals", n)
+
+    events = bus.wait(0, timeout=0)
+
+    assert events[0][1] == RESYNC
+    assert events[0][2] == {"missed": 3}
+    assert [e[2] for e in events[1:]] == [3, 4, 5]
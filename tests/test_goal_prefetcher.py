@@ -0,0 +1,76 @@
+"""
+GoalPrefetcher: Nachschub richtet sich nach sofort startbaren Zielen.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+from goal_engine import GeneratedGoal, GoalCategory
+from goal_prefetcher import GoalPrefetcher
+from goal_scheduler import GoalScheduler
+
+
+def _goal(n: int, not_before=None) -> GeneratedGoal:
+    return GeneratedGoal(id=f"g{n}", goal=f"Ziel {n}", category=GoalCategory.EXPLORE,
+                         priority=5, reasoning="test", not_before=not_before)
+
+
+class FakeEngine:
+    """Nur das, was der Prefetcher vom GoalEngine braucht."""
+
+    def __init__(self):
+        self.scheduler = GoalScheduler()
+        self.lock      = threading.Lock()
+        self.generated = 0
+
+    def ready_count(self) -> int:
+        with self.lock:
+            return self.scheduler.ready_count()
+
+    def generate_goals(self, count: int, use_llm: bool = True):
+        start = 100 + self.generated
+        self.generated += count
+        return [_goal(start + i) for i in range(count)]
+
+    def queue_goals(self, goals) -> None:
+        with self.lock:
+            for g in goals:
+                self.scheduler.push(g)
+
+
+def test_backoff_goals_do_not_block_top_up():
+    engine = FakeEngine()
+    later  = (datetime.now() + timedelta(hours=1)).isoformat()
+    for n in range(6):
+        engine.scheduler.push(_goal(n, not_before=later))
+    assert len(engine.scheduler) == 6
+    assert engine.scheduler.ready_count() == 0
+
+    prefetcher = GoalPrefetcher(engine, batch_size=3, low_water=6)
+    prefetcher._top_up()
+
+    assert engine.generated == 3
+    assert engine.scheduler.ready_count() == 3
+    assert prefetcher.generation == 1
+
+
+def test_in_flight_goals_are_not_ready():
+    scheduler = GoalScheduler()
+    scheduler.push(_goal(1))
+    scheduler.push(_goal(2))
+    assert scheduler.pop() is not None
+    assert len(scheduler) == 2
+    assert scheduler.ready_count() == 1
+
+
+def test_skipped_top_up_still_notifies_waiters():
+    engine = FakeEngine()
+    for n in range(6):
+        engine.scheduler.push(_goal(n))
+
+    prefetcher = GoalPrefetcher(engine, batch_size=3, low_water=6)
+    mark       = prefetcher.generation
+    prefetcher._top_up()
+
+    assert engine.generated == 0
+    assert prefetcher.wait_for_goals(mark, timeout=0.1)
@@ -0,0 +1,27 @@
+"""
+LogBroadcaster: Log-Zeilen bleiben im eigenen Puffer, nicht auf dem EventBus.
+"""
+
+import logging
+
+from event_bus import get_event_bus
+from log_tail import LogBroadcaster
+
+
+def test_log_burst_does_not_touch_event_bus():
+    bus         = get_event_bus()
+    before      = bus.seq
+    broadcaster = LogBroadcaster(capacity=10)
+    logger      = logging.getLogger("test.log_tail")
+    logger.addHandler(broadcaster)
+    logger.setLevel(logging.INFO)
+    try:
+        for n in range(50):
+            logger.info(f"Zeile {n}")
+    finally:
+        logger.removeHandler(broadcaster)
+
+    assert bus.seq == before
+    lines = broadcaster.wait(0, timeout=0)
+    assert len(lines) == 10
+    assert lines[-1][1].endswith("Zeile 49")
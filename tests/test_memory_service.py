@@ -0,0 +1,86 @@
+"""
+MemoryService: find (Zeitgrenze im where-Filter, Abbruch bei limit) und
+Keyword-Index bei gleichzeitigem Schreiben.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+def _put(memory, n: int, age_days: float, source: str = "goal", legacy: bool = False):
+    ts   = time.time() - age_days * 86400
+    meta = {"source": source}
+    if legacy:
+        meta["timestamp"] = datetime.fromtimestamp(ts).isoformat()
+    else:
+        meta["ts"] = ts
+    memory.collection().add(documents=[f"eintrag {n}"], metadatas=[meta], ids=[f"id{n}"])
+
+
+def test_find_returns_newest_first_without_full_scan(memory):
+    for n in range(200):
+        _put(memory, n, age_days=400 - n)            # alt → neu eingefügt
+    _put(memory, 999, age_days=0.5)
+
+    found = memory.find({"source": "goal"}, limit=3)
+
+    assert [e["id"] for e in found][0] == "id999"
+    assert len(found) == 3
+    # Keine Abfrage hat die ganze Sammlung geliefert
+    assert max(n for _, _, n in memory.collection().calls) <= 3
+
+
+def test_find_since_days_pushes_ts_filter(memory):
+    _put(memory, 1, age_days=10)
+    _put(memory, 2, age_days=2)
+    _put(memory, 3, age_days=1.5, source="user")
+
+    found = memory.find({"source": "goal"}, since_days=7)
+
+    assert [e["id"] for e in found] == ["id2"]
+    where = memory.collection().calls[0][0]
+    assert where["$and"][0] == {"source": "goal"}
+    assert "$gte" in where["$and"][1]["ts"]
+
+
+def test_find_includes_legacy_entries_in_bounded_pass(memory):
+    _put(memory, 1, age_days=3, legacy=True)
+    _put(memory, 2, age_days=30, legacy=True)
+    _put(memory, 3, age_days=1.5)
+
+    found = memory.find({"source": "goal"}, since_days=7, limit=10)
+
+    assert [e["id"] for e in found] == ["id3", "id1"]
+
+
+def test_add_during_first_index_build_is_not_lost(memory):
+    collection = memory.collection()
+    collection.add(documents=["alter eintrag"], metadatas=[{"ts": time.time()}], ids=["alt"])
+    page_read, proceed = threading.Event(), threading.Event()
+    original_get       = collection.get
+
+    def slow_get(*args, **kwargs):
+        result = original_get(*args, **kwargs)
+        if not page_read.is_set():
+            page_read.set()
+            proceed.wait(5)
+        return result
+
+    collection.get = slow_get
+    builder = threading.Thread(target=memory.keyword_index)
+    builder.start()
+    assert page_read.wait(5)
+
+    # Seite ist gelesen, Index noch nicht fertig – jetzt schreiben
+    writer = threading.Thread(target=memory.add,
+                              args=(["zebra im garten"], [{"ts": time.time()}], ["neu"]))
+    writer.start()
+    while "neu" not in collection.rows:
+        time.sleep(0.01)
+    proceed.set()
+    builder.join(5)
+    writer.join(5)
+
+    hits = [doc_id for doc_id, _ in memory.keyword_index().search("zebra", 5)]
+    assert hits == ["neu"]
@@ -0,0 +1,31 @@
+"""
+SkillManager: names_version steigt nur bei geänderter Skill-Menge.
+"""
+
+from skill_manager import SkillManager
+
+SKILL = '''
+def {name}():
+    """Test-Skill."""
+    return "ok"
+
+AVAILABLE_SKILLS = [{name}]
+'''
+
+
+def test_names_version_only_changes_with_skill_set(tmp_path):
+    (tmp_path / "test_skill_eins.py").write_text(SKILL.format(name="test_eins"), encoding="utf-8")
+    manager = SkillManager(skills_dir=str(tmp_path))
+
+    manager.load_skills()
+    first = manager.names_version
+    manager.load_skills()
+
+    assert manager.registry_version == 2
+    assert manager.names_version == first
+
+    (tmp_path / "test_skill_zwei.py").write_text(SKILL.format(name="test_zwei"), encoding="utf-8")
+    manager.load_skills()
+
+    assert set(manager.loaded_tools) == {"test_eins", "test_zwei"}
+    assert manager.names_version == first + 1
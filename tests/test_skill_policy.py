@@ -0,0 +1,24 @@
+"""
+skill_policy: die Selenium-Gruppe entspricht den Skills, die den Browser steuern.
+"""
+
+import os
+
+from skill_policy import EXCLUSIVE_GROUPS, exclusive_group
+
+SKILLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skills")
+
+
+def _drives_browser(module: str) -> bool:
+    with open(os.path.join(SKILLS_DIR, module + ".py"), encoding="utf-8", errors="replace") as f:
+        source = f.read()
+    return "selenium" in source or "webdriver" in source
+
+
+def test_selenium_group_matches_browser_skills():
+    modules = [name[:-3] for name in os.listdir(SKILLS_DIR)
+               if name.endswith(".py") and not name.startswith("__")]
+    browser = {m for m in modules if _drives_browser(m)}
+
+    assert EXCLUSIVE_GROUPS["selenium"] == browser
+    assert exclusive_group("outlook_posteingang_pruefen") is None
@@ -0,0 +1,61 @@
+"""
+TranscriptionService: der Whisper-Worker wartet nicht auf die Folge-Aktion.
+"""
+
+import threading
+
+from transcription_service import DONE, RETRY, TranscriptionService
+
+
+class Saturated(Exception):
+    retry_after = 7
+
+
+def _service() -> TranscriptionService:
+    service = TranscriptionService(workers=1)
+    service._transcribe_bytes = lambda data, suffix, digest: data.decode()
+    return service
+
+
+def _wait_finished(job, timeout: float = 2.0) -> None:
+    since = 0
+    while not job.finished:
+        events = job.wait_events(since, timeout=timeout)
+        assert events, "Job hängt"
+        since = events[-1][0]
+
+
+def test_slow_follow_up_does_not_block_next_transcription():
+    service = _service()
+    release = threading.Event()
+
+    def slow_chat(text):
+        release.wait(2)
+        return {"response": text}
+
+    first  = service.submit(b"eins", then=slow_chat)
+    second = service.submit(b"zwei")
+    _wait_finished(second)
+
+    assert second.status == DONE
+    assert not first.finished          # Folge-Aktion läuft noch
+    assert first.transcript == "eins"
+
+    release.set()
+    _wait_finished(first)
+    assert first.status == DONE
+    assert first.response == {"response": "eins"}
+
+
+def test_rejected_follow_up_ends_in_retry():
+    service = _service()
+
+    def busy(text):
+        raise Saturated("ausgelastet")
+
+    job = service.submit(b"hallo", then=busy)
+    _wait_finished(job)
+
+    assert job.status == RETRY
+    assert job.retry_after == 7
+    assert job.transcript == "hallo"
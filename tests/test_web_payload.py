@@ -0,0 +1,27 @@
+"""
+web_payload.trim: Artefakte nur auf Wunsch (history_entry), nie auf Lese-Pfaden.
+"""
+
+import web_payload
+from artifact_store import ArtifactStore
+
+
+def test_trim_does_not_store_by_default(monkeypatch):
+    def forbidden():
+        raise AssertionError("trim() darf ohne store=True nichts ablegen")
+    monkeypatch.setattr(web_payload, "get_artifact_store", forbidden)
+
+    out = web_payload.trim({"doc": "x" * 300, "kurz": "ok"}, limit=100)
+
+    assert out["doc"] == "x" * 100 + "… [+200 Zeichen]"
+    assert out["kurz"] == "ok"
+
+
+def test_history_entry_links_full_text(monkeypatch, tmp_path):
+    store = ArtifactStore(root=str(tmp_path))
+    monkeypatch.setattr(web_payload, "get_artifact_store", lambda: store)
+
+    out = web_payload.history_entry({"params": {"text": "y" * 300}, "artifact": None}, limit=100)
+
+    handle = out["params"]["text"].rsplit("/api/artifact/", 1)[1].rstrip("]")
+    assert store.get(handle) == "y" * 300
@@ -0,0 +1,337 @@
+"""
+Ilija Full_Autonomy_Edition – Transcription Service
+====================================================
+Prozessweiter Dienst für Sprach-Transkription (Whisper).
+
+Bisher lud /api/upload/audio bei jeder Sprachnachricht das Whisper-Modell
+neu (whisper.load_model) und transkribierte im Request-Thread. Jetzt:
+
+  - Modell wird einmal lazy geladen (optional beim Start: WHISPER_WARMUP)
+  - Begrenzte Job-Queue mit Worker-Threads (WHISPER_WORKERS); ist sie
+    voll, wird abgelehnt statt unbegrenzt zu stauen
+  - Transkript-Cache nach SHA-256 der Audiodaten (LRU) – dieselbe
+    Nachricht wird nie zweimal dekodiert
+  - Ohne lokales whisper: Fallback auf die OpenAI-API (whisper-1)
+
+Ein Job meldet seinen Fortschritt als nummerierte Events (transcript,
+response, status) – der Web-Server reicht sie per SSE weiter.
+Die Folge-Aktion (then, z.B. Chat-Antwort) läuft in einem eigenen Pool
+(FOLLOW_UP_WORKERS) – der Whisper-Worker transkribiert nur und ist sofort
+frei für die nächste Nachricht.
+Lehnt die Folge-Aktion mit retry_after ab (z.B. Admission Control), endet
+der Job im Status "retry" samt retry_after – das Transkript bleibt erhalten
+und kann ohne erneuten Upload nachgereicht werden.
+
+Verwendung:
+  service = get_transcription_service()
+  job = service.submit(audio_bytes, ".ogg", then=lambda text: kernel.chat(text))
+  text = service.transcribe_file("nachricht.wav")   # synchron, mit Cache
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import secrets
+import tempfile
+import threading
+import time
+import warnings
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "base"
+LANGUAGE   = "de"
+WORKERS    = 1
+MAX_QUEUE  = 16
+CACHE_SIZE = 256
+FOLLOW_UP_WORKERS = 4   # parallele Folge-Aktionen (Chat) – Admission begrenzt zusätzlich
+
+QUEUED  = "queued"
+RUNNING = "running"
+DONE    = "done"
+FAILED  = "failed"
+RETRY   = "retry"    # Transkript fertig, Folge-Aktion abgelehnt → später erneut senden
+
+
+class TranscriptionUnavailable(RuntimeError):
+    """Weder lokales whisper noch OpenAI-Key vorhanden."""
+
+
+class TranscriptionQueueFull(RuntimeError):
+    """Zu viele wartende Sprachnachrichten."""
+
+
+class TranscriptionJob:
+    """Eine Sprachnachricht: Transkript, optionale Folge-Antwort und Events."""
+
+    def __init__(self, digest: str):
+        self.id         = secrets.token_hex(8)
+        self.digest     = digest
+        self.status     = QUEUED
+        self.created_at = time.time()
+        self.transcript: Optional[str] = None
+        self.response: Optional[Dict]  = None
+        self.error: Optional[str]      = None
+        self.retry_after: Optional[int] = None   # gesetzt bei Status RETRY
+        self._seq    = 0
+        self._events: Deque[Tuple[int, str, Dict]] = deque(maxlen=50)
+        self._cond   = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, RETRY)
+
+    def push(self, kind: str, data: Dict) -> None:
+        with self._cond:
+            self._seq += 1
+            self._events.append((self._seq, kind, data))
+            self._cond.notify_all()
+
+    def wait_events(self, since: int = 0, timeout: float = 15.0) -> List[Tuple[int, str, Dict]]:
+        """Events mit Nummer > since; wartet bis zu timeout auf neue (leer = Keepalive)."""
+        with self._cond:
+            if self._seq <= since and not self.finished:
+                self._cond.wait(timeout)
+            return [e for e in self._events if e[0] > since]
+
+    def _set_status(self, status: str, error: Optional[str] = None) -> None:
+        with self._cond:
+            self.status = status
+            self.error  = error
+        self.push("status", {"status": status, "error": error, "retry_after": self.retry_after})
+
+    def status_dict(self) -> Dict:
+        return {
+            "job_id":      self.id,
+            "status":      self.status,
+            "transcript":  self.transcript,
+            "response":    self.response,
+            "error":       self.error,
+            "retry_after": self.retry_after,
+            "events":      self._seq,
+        }
+
+
+class TranscriptionService:
+    """Lazy geladenes Whisper-Modell + Worker-Queue + Transkript-Cache."""
+
+    def __init__(self, model_name: str = MODEL_NAME, language: str = LANGUAGE,
+                 workers: int = WORKERS, max_queue: int = MAX_QUEUE,
+                 cache_size: int = CACHE_SIZE, device: str = "cpu",
+                 follow_up_workers: int = FOLLOW_UP_WORKERS):
+        self.model_name = model_name
+        self.language   = language
+        self.workers    = workers
+        self.cache_size = cache_size
+        self.device     = device
+        self.hits       = 0
+        self.misses     = 0
+        self._model      = None
+        self._backend: Optional[str] = None   # "local" | "openai"
+        self._model_lock = threading.Lock()   # Laden + lokale Dekodierung serialisieren
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._jobs: "OrderedDict[str, TranscriptionJob]" = OrderedDict()
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._follow_up  = ThreadPoolExecutor(max_workers=follow_up_workers,
+                                              thread_name_prefix="whisper-then")
+
+    # ------------------------------------------------------------------
+    # Modell
+    # ------------------------------------------------------------------
+
+    def _ensure_backend(self) -> str:
+        if self._backend:
+            return self._backend
+        with self._model_lock:
+            if self._backend:
+                return self._backend
+            try:
+                import whisper
+                warnings.filterwarnings("ignore", category=UserWarning, module="whisper")
+                warnings.filterwarnings("ignore", category=UserWarning, module="torch")
+                started = time.time()
+                self._model   = whisper.load_model(self.model_name, device=self.device)
+                self._backend = "local"
+                logger.info(f"Whisper '{self.model_name}' geladen ({time.time() - started:.1f}s)")
+            except ImportError:
+                if not os.getenv("OPENAI_API_KEY"):
+                    raise TranscriptionUnavailable("Whisper nicht verfügbar – pip install openai-whisper")
+                self._backend = "openai"
+                logger.info("Whisper lokal nicht installiert – nutze OpenAI whisper-1")
+        return self._backend
+
+    def warm(self) -> None:
+        """Lädt das Modell im Hintergrund vor (Fehler werden nur geloggt)."""
+        def load():
+            try:
+                self._ensure_backend()
+            except Exception as e:
+                logger.warning(f"Whisper-Warmup fehlgeschlagen: {e}")
+        threading.Thread(target=load, name="whisper-warmup", daemon=True).start()
+
+    def _decode(self, path: str) -> str:
+        if self._ensure_backend() == "local":
+            with self._model_lock:
+                result = self._model.transcribe(path, language=self.language)
+            return result["text"].strip()
+
+        import openai
+        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        with open(path, "rb") as f:
+            result = client.audio.transcriptions.create(model="whisper-1", file=f, language=self.language)
+        return result.text.strip()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cached(self, digest: str) -> Optional[str]:
+        with self._cache_lock:
+            text = self._cache.get(digest)
+            if text is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(digest)
+            self.hits += 1
+            return text
+
+    def _remember(self, digest: str, text: str) -> None:
+        with self._cache_lock:
+            self._cache[digest] = text
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _transcribe_bytes(self, data: bytes, suffix: str, digest: str) -> str:
+        text = self._cached(digest)
+        if text is not None:
+            return text
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            tmp.write(data)
+            tmp_path = tmp.name
+        try:
+            text = self._decode(tmp_path)
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        if text:
+            self._remember(digest, text)
+        return text
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    def transcribe_file(self, path: str) -> str:
+        """Synchrone Transkription einer Datei (mit Cache)."""
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        text = self._cached(digest)
+        if text is None:
+            text = self._decode(path)
+            if text:
+                self._remember(digest, text)
+        return text
+
+    def submit(self, data: bytes, suffix: str = ".ogg",
+               then: Optional[Callable[[str], Dict]] = None) -> TranscriptionJob:
+        """
+        Reiht eine Sprachnachricht ein. then(transcript) läuft danach im
+        Folge-Pool (nicht im Whisper-Worker), sein Ergebnis wird als
+        'response'-Event gemeldet.
+        Raises: TranscriptionQueueFull
+        """
+        self._start_workers()
+        job = TranscriptionJob(hashlib.sha256(data).hexdigest())
+        try:
+            self._queue.put_nowait((job, data, suffix, then))
+        except queue.Full:
+            raise TranscriptionQueueFull(f"Zu viele wartende Sprachnachrichten (max. {self._queue.maxsize})")
+        self._jobs[job.id] = job
+        while len(self._jobs) > self._queue.maxsize * 8:
+            self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        return self._jobs.get(job_id)
+
+    def _start_workers(self) -> None:
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"whisper-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _work(self) -> None:
+        while True:
+            job, data, suffix, then = self._queue.get()
+            try:
+                job._set_status(RUNNING)
+                job.transcript = self._transcribe_bytes(data, suffix, job.digest)
+                job.push("transcript", {"transcript": job.transcript})
+                if not job.transcript:
+                    job._set_status(FAILED, "Transkription leer")
+                elif then:
+                    self._follow_up.submit(self._run_then, job, then)
+                else:
+                    job._set_status(DONE)
+            except Exception as e:
+                logger.error(f"Transkription {job.id} fehlgeschlagen: {e}")
+                job._set_status(FAILED, str(e))
+            finally:
+                self._queue.task_done()
+
+    def _run_then(self, job: TranscriptionJob, then: Callable[[str], Dict]) -> None:
+        """Folge-Aktion im eigenen Pool; Ablehnung mit retry_after → Status RETRY."""
+        try:
+            job.response = then(job.transcript)
+        except Exception as e:
+            if getattr(e, "retry_after", None) is not None:
+                job.retry_after = e.retry_after
+                job._set_status(RETRY, str(e))
+                return
+            logger.error(f"Folge-Aktion für Transkription {job.id} fehlgeschlagen: {e}")
+            job._set_status(FAILED, str(e))
+            return
+        job.push("response", job.response or {})
+        job._set_status(DONE)
+
+    def stats(self) -> Dict:
+        return {
+            "backend":    self._backend,
+            "model":      self.model_name,
+            "queued":     self._queue.qsize(),
+            "cached":     len(self._cache),
+            "cache_hits": self.hits,
+            "cache_miss": self.misses,
+        }
+
+
+# ── Singleton ──────────────────────────────────────────────────
+
+_service: Optional[TranscriptionService] = None
+_service_lock = threading.Lock()
+
+def get_transcription_service() -> TranscriptionService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = TranscriptionService(
+                    model_name=os.getenv("WHISPER_MODEL", MODEL_NAME),
+                    workers=int(os.getenv("WHISPER_WORKERS", str(WORKERS))),
+                )
+    return _service
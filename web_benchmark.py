@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Ilija Full_Autonomy_Edition – Web Benchmark
+============================================
+Durchsatz-Messung für /api/chat gegen einen Stand-in-Provider.
+
+Startet web_server.app im gewählten Server-Modus (waitress | dev) auf einem
+freien Port, ersetzt den Provider-Pool durch einen Stand-in mit fester
+Latenz (simuliert den LLM-Aufruf) und feuert N parallele Clients mit je
+eigener Session ab. Gemessen wird also der Web-Stack selbst: Server,
+Session-Store, Kernel.chat – nicht das LLM.
+
+Verwendung:
+  python web_benchmark.py --server waitress --clients 32 --requests 50 --latency 0.2
+  python web_benchmark.py --server dev      --clients 32 --requests 50 --latency 0.2
+
+Ausgabe: Requests/s, Latenz p50/p95/p99, abgelehnte (429) und fehlerhafte Requests.
+Erwartung: mit --latency L und T Server-Threads liegt die Obergrenze bei
+etwa T / L Requests/s; darüber stauen sich Verbindungen (Backpressure).
+"""
+
+import argparse
+import http.cookiejar
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+
+class StandInProvider:
+    """Antwortet nach fester Wartezeit mit einer gültigen Kernel-Antwort."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def chat(self, messages, force_json: bool = False) -> str:
+        time.sleep(self.latency)
+        return json.dumps({"antwort": "ok"})
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server auf Port {port} nicht erreichbar")
+
+
+def _client(url: str, count: int, latencies: List[float], errors: List[str],
+            rejected: List[float]) -> None:
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    opener.open(url + "/", timeout=30).read()   # Session-Cookie holen
+    body = json.dumps({"message": "Wie viele Skills hast du gerade?", "provider": "auto"}).encode()
+    for _ in range(count):
+        request = urllib.request.Request(url + "/api/chat", data=body,
+                                         headers={"Content-Type": "application/json"})
+        started = time.perf_counter()
+        try:
+            with opener.open(request, timeout=60) as response:
+                response.read()
+            latencies.append(time.perf_counter() - started)
+        except urllib.error.HTTPError as e:
+            if e.code != 429:
+                errors.append(str(e))
+                continue
+            # Admission Control: abgelehnt → Retry-After abwarten (wie ein Browser-Client)
+            rejected.append(time.perf_counter() - started)
+            time.sleep(float(e.headers.get("Retry-After", 1)))
+        except Exception as e:
+            errors.append(str(e))
+
+
+def run(server: str, clients: int, requests: int, latency: float) -> Dict:
+    import web_server
+    from session_store import ProviderPool
+    from web_serving import serve
+
+    provider = StandInProvider(latency)
+    web_server.provider_pool = ProviderPool(select=lambda name: ("stand-in", provider))
+    web_server.get_skill_registry()   # Skills vor der Messung laden
+
+    port = _free_port()
+    threading.Thread(target=serve, args=(web_server.app, "127.0.0.1", port, server), daemon=True).start()
+    _wait_for(port)
+
+    url       = f"http://127.0.0.1:{port}"
+    latencies: List[float] = []
+    errors:    List[str]   = []
+    rejected:  List[float] = []
+    threads   = [threading.Thread(target=_client, args=(url, requests, latencies, errors, rejected))
+                 for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies) or [0.0]
+    pick    = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "server":     server,
+        "clients":    clients,
+        "requests":   len(latencies),
+        "rejected":   len(rejected),   # 429 (Admission Control)
+        "errors":     len(errors),
+        "seconds":    round(elapsed, 2),
+        "rps":        round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms":     round(statistics.median(ordered) * 1000, 1),
+        "p95_ms":     round(pick(0.95) * 1000, 1),
+        "p99_ms":     round(pick(0.99) * 1000, 1),
+        "latency_ms": latency * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Durchsatz von /api/chat messen")
+    parser.add_argument("--server", default="waitress", choices=["waitress", "dev"])
+    parser.add_argument("--clients", type=int, default=32, help="parallele Clients (je eigene Session)")
+    parser.add_argument("--requests", type=int, default=50, help="Requests pro Client")
+    parser.add_argument("--latency", type=float, default=0.2, help="simulierte LLM-Latenz in Sekunden")
+    args = parser.parse_args()
+
+    result = run(args.server, args.clients, args.requests, args.latency)
+    print(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Ilija Full_Autonomy_Edition – Web Payload
+==========================================
+Kleinere API-Antworten für das Dashboard.
+
+/api/goal/<id>/result lieferte die komplette session.history inklusive
+aller Parameter (in die Vorgänger-Ergebnisse injiziert werden), und
+/api/debug/skills jeden Docstring – bei Web-Scraping-Zielen mehrere MB.
+
+  compress()     → after_request-Hook: gzip bzw. brotli (falls installiert)
+                   je nach Accept-Encoding, ab COMPRESS_MIN_BYTES;
+                   SSE-Streams bleiben unkomprimiert
+  select_fields()→ ?fields=status,result.summary – nur die angefragten
+                   Felder (Punkt-Notation für verschachtelte Felder)
+  paginate()     → ?offset=&limit= für Listen (History, Skills)
+  trim()         → lange Strings werden zur Vorschau gekürzt; mit store=True
+                   (nur history_entry) liegt der volle Text im ArtifactStore
+                   und ist über /api/artifact/<handle> abrufbar – reine
+                   Lese-Endpunkte schreiben so keine Artefakte
+"""
+
+import gzip
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Response
+
+from artifact_store import get_artifact_store
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIN_BYTES = 1024   # darunter lohnt der Aufwand nicht
+COMPRESS_MIMETYPES = ('application/json', 'text/plain', 'text/html', 'text/css', 'application/javascript')
+GZIP_LEVEL         = 6
+BROTLI_QUALITY     = 5      # schnell genug pro Request, deutlich kleiner als gzip
+TRIM_CHARS         = 500    # längere Strings → Vorschau + Artefakt-Link
+DEFAULT_LIMIT      = 50
+MAX_LIMIT          = 500
+
+
+def artifact_url(handle: Optional[str]) -> Optional[str]:
+    return f"/api/artifact/{handle}" if handle else None
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip() == coding:
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def compress(response: Response, accept_encoding: str) -> Response:
+    """Komprimiert eine fertige Antwort (brotli vor gzip)."""
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+
+    if brotli is not None and _accepts(accept_encoding, 'br'):
+        coding, body = 'br', brotli.compress(data, quality=BROTLI_QUALITY)
+    elif _accepts(accept_encoding, 'gzip'):
+        coding, body = 'gzip', gzip.compress(data, GZIP_LEVEL)
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = coding
+    # Andere Bytes als die unkomprimierte Variante → ETag nur noch schwach gültig
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _parse_fields(fields: Optional[str]) -> List[List[str]]:
+    return [f.strip().split('.') for f in (fields or '').split(',') if f.strip()]
+
+
+def select_fields(data: Dict, fields: Optional[str]) -> Dict:
+    """
+    Nur die angefragten Felder übernehmen. Leer → unverändert.
+    Beispiel: "status,result.summary" → {"status": ..., "result": {"summary": ...}}
+    """
+    paths = _parse_fields(fields)
+    if not paths:
+        return data
+    selected: Dict = {}
+    for path in paths:
+        source, target = data, selected
+        for i, key in enumerate(path):
+            if not isinstance(source, dict) or key not in source:
+                break
+            if i == len(path) - 1:
+                target[key] = source[key]
+            else:
+                source = source[key]
+                target = target.setdefault(key, {})
+    return selected
+
+
+def page_args(args, default_limit: int = DEFAULT_LIMIT) -> Tuple[int, int]:
+    """offset/limit aus den Query-Parametern (begrenzt auf MAX_LIMIT)."""
+    try:
+        offset = max(0, int(args.get('offset', 0)))
+        limit  = int(args.get('limit', default_limit))
+    except ValueError:
+        offset, limit = 0, default_limit
+    return offset, min(max(1, limit), MAX_LIMIT)
+
+
+def paginate(items: List, offset: int, limit: int) -> Tuple[List, Dict]:
+    """Returns: (Seite, {"total", "offset", "limit", "next_offset"})."""
+    page = items[offset:offset + limit]
+    end  = offset + len(page)
+    return page, {
+        "total":       len(items),
+        "offset":      offset,
+        "limit":       limit,
+        "next_offset": end if end < len(items) else None,
+    }
+
+
+def trim(value: Any, limit: int = TRIM_CHARS, store: bool = False) -> Any:
+    """
+    Kürzt lange Strings (auch in Listen/Dicts) auf eine Vorschau.
+    store=True legt den vollen Text im ArtifactStore ab (inhaltsadressiert –
+    wiederholtes Abrufen schreibt nichts neu); die Vorschau endet dann mit
+    dem Artefakt-Link.
+    """
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        if not store:
+            return value[:limit] + f"… [+{len(value) - limit} Zeichen]"
+        try:
+            handle = get_artifact_store().put(value)
+        except Exception as e:
+            logger.warning(f"Artefakt für gekürzten Wert nicht gespeichert: {e}")
+            return value[:limit] + f"… [+{len(value) - limit} Zeichen]"
+        return value[:limit] + f"… [+{len(value) - limit} Zeichen: {artifact_url(handle)}]"
+    if isinstance(value, dict):
+        return {k: trim(v, limit, store) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [trim(v, limit, store) for v in value]
+    return value
+
+
+def history_entry(entry: Dict, limit: int = TRIM_CHARS) -> Dict:
+    """Schritt aus session.history für die API: Parameter gekürzt, Artefakt-Link zum Ergebnis."""
+    out = trim(entry, limit, store=True)
+    out["artifact_url"] = artifact_url(entry.get("artifact"))
+    return out
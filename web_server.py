@@ -4,11 +4,14 @@ Offenes Leuchten v5.0 - Web Edition
 Flask Server für Web-Interface im lokalen Netzwerk
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 from flask_cors import CORS
 import os
+import json
+import hashlib
 import logging
 import secrets
+import time
 
 # Load environment variables
 try:
@@ -18,8 +21,21 @@ except ImportError:
     pass
 
 # Import Kernel (v5.0)
+from typing import Optional
+
 from kernel import Kernel
-from full_autonomy_loop import FullAutonomyLoop
+from skill_manager import SkillManager
+from session_store import SessionStore, ProviderPool
+from admission import Saturated, get_admission
+from goal_jobs import MAX_GOAL_ITERATIONS, MAX_ITERATIONS, JobQueueFull, get_goal_jobs
+from memory_service import get_document_store, get_memory_service
+from document_ingest import DocumentError, ingest as ingest_document
+from web_serving import STREAM_MAX_SECONDS, serve, stream_slots_from_env
+from event_bus import RESYNC, get_event_bus, publish
+from log_tail import get_log_broadcaster, read_from, tail_lines
+from transcription_service import TranscriptionQueueFull, get_transcription_service
+from artifact_store import get_artifact_store
+from web_payload import compress, history_entry, page_args, paginate, select_fields, trim
 
 # Flask App Setup
 app = Flask(__name__)
@@ -36,20 +52,89 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger(__name__)
+log_broadcaster = get_log_broadcaster()
+LOG_FILE = os.getenv('ILIJA_LOG_FILE', '/ilija/logs/ilija_full_autonomy.log')
+
+# Geteilte Laufzeit: eine Skill-Registry, ein Provider pro Name, begrenzte Sessions
+_skill_registry: Optional[SkillManager] = None
+
+
+def get_skill_registry() -> SkillManager:
+    """Geteilte Skill-Registry – beim ersten Zugriff geladen, sofern nicht übergeben."""
+    global _skill_registry
+    if _skill_registry is None:
+        manager = SkillManager()
+        manager.load_skills()
+        _skill_registry = manager
+    return _skill_registry
+
+
+def use_skill_registry(manager: SkillManager) -> None:
+    """Orchestrator übergibt seinen SkillManager – Web und Autonomie teilen eine Registry."""
+    global _skill_registry
+    _skill_registry = manager
+
+
+provider_pool  = ProviderPool()
+kernels        = SessionStore(
+    max_sessions=int(os.getenv('WEB_MAX_SESSIONS', '200')),
+    ttl_seconds=float(os.getenv('WEB_SESSION_TTL_MINUTES', '60')) * 60,
+)
+stream_slots   = stream_slots_from_env()
+admission      = get_admission()   # geteilt mit den Goal-Jobs
+if os.getenv('WHISPER_WARMUP', 'false').lower() == 'true':
+    get_transcription_service().warm()
+
+
+@app.after_request
+def _compress_response(response):
+    """gzip/brotli für JSON- und Text-Antworten (SSE bleibt unkomprimiert)."""
+    return compress(response, request.headers.get('Accept-Encoding', ''))
+
+
+def _sse_response(events) -> Response:
+    """
+    SSE-Antwort mit Stream-Obergrenze (503 wenn alle Slots belegt) und
+    begrenzter Lebensdauer. Der Slot wird beim Schließen der Verbindung frei.
+    """
+    if not stream_slots.try_acquire():
+        return jsonify({'error': 'Zu viele offene Streams', 'retry_after': 30}), 503, {'Retry-After': '30'}
 
-# Global Kernel Instance (eine Instanz pro Session)
-kernels = {}
+    def bounded():
+        deadline = time.time() + STREAM_MAX_SECONDS
+        for chunk in events:
+            yield chunk
+            if time.time() > deadline:
+                break
 
+    response = Response(stream_with_context(bounded()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(stream_slots.release)
+    return response
 
-def get_kernel(session_id: str, provider: str = "auto") -> Kernel:
-    """Holt oder erstellt Kernel für Session"""
-    if session_id not in kernels or kernels[session_id].provider_name != provider:
-        kernel = Kernel(provider=provider)
-        # WICHTIG: Skills laden!
-        kernel.load_skills()
-        logger.info(f"Kernel erstellt für Session {session_id}: {kernel.provider_name}, {len(kernel.manager.loaded_tools)} Skills")
-        kernels[session_id] = kernel
-    return kernels[session_id]
+
+def _too_busy(e: Saturated):
+    """429 mit Retry-After – Last bleibt vorhersagbar statt Anfragen zu stauen."""
+    return jsonify({'error': str(e), 'retry_after': e.retry_after}), 429, {'Retry-After': str(e.retry_after)}
+
+
+def get_kernel(session_id: str, provider: Optional[str] = None) -> Kernel:
+    """
+    Holt oder erstellt den Chat-Zustand einer Session.
+    provider=None behält den Provider der Session (neu: "auto").
+    """
+    def create() -> Kernel:
+        kernel = Kernel(manager=get_skill_registry(), provider_pair=provider_pool.get(provider or 'auto'))
+        kernel.requested_provider = provider or 'auto'
+        logger.info(f"Session {session_id}: {kernel.provider_name}, {len(kernel.manager.loaded_tools)} Skills")
+        return kernel
+
+    kernel = kernels.get_or_create(session_id, create)
+    if provider and kernel.requested_provider != provider:
+        # Provider-Wechsel: geteilten Provider tauschen, Chat-Verlauf bleibt
+        kernel.provider_name, kernel.provider = provider_pool.get(provider)
+        kernel.requested_provider = provider
+    return kernel
 
 
 @app.route('/')
@@ -82,18 +167,22 @@ def chat():
         
         # 🚀 ALLES AN DEN KERNEL DELEGIEREN!
         # Der Kernel übernimmt Intent-Erkennung, Prompt-Bau, Skill-Ausführung & LLM-Aufruf.
-        result = kernel.chat(message)
+        with admission.admit(kernel.chat_lock):
+            result = kernel.chat(message)
+        _publish_session(session_id, kernel)
         
-        # Das Ergebnis-Dict vom Kernel direkt an das Frontend senden
-        return jsonify({
+        # Das Ergebnis-Dict vom Kernel direkt an das Frontend senden (?fields= wählt aus)
+        return jsonify(select_fields({
             'response': result.get('response', '(keine Antwort)'),
             'intent': result.get('intent', 'UNKNOWN'),
             'provider': kernel.provider_name,
             'thought': result.get('thought'),
             'skill': result.get('skill'),
             'error': result.get('error', False)
-        })
+        }, request.args.get('fields')))
         
+    except Saturated as e:
+        return _too_busy(e)
     except Exception as e:
         logger.error(f"Chat error: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
@@ -137,9 +226,12 @@ def clear_history():
     """Lösche Chat-Historie"""
     try:
         session_id = session.get('session_id')
-        if session_id and session_id in kernels:
-            kernels[session_id].chat_history.clear()
-            kernels[session_id].recent_errors.clear()
+        kernel = kernels.get(session_id)
+        if kernel:
+            with kernel.chat_lock:
+                kernel.chat_history.clear()
+                kernel.recent_errors.clear()
+            _publish_session(session_id, kernel)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -147,103 +239,242 @@ def clear_history():
         return jsonify({'error': str(e)}), 500
 
 
+_skills_cache = (None, [])   # (registry_version, sortierte Skill-Namen)
+
+
+def _skills_list(manager: SkillManager) -> list:
+    """Sortierte Skill-Liste – nur nach einem Reload neu gebaut."""
+    global _skills_cache
+    version = manager.registry_version
+    if _skills_cache[0] != version:
+        _skills_cache = (version, sorted(manager.loaded_tools))
+    return _skills_cache[1]
+
+
+def _session_state(kernel: Kernel) -> dict:
+    return {
+        'provider': kernel.provider_name,
+        'history': len(kernel.chat_history),
+        'state': kernel.state.name,
+    }
+
+
+def _publish_session(session_id: str, kernel: Kernel) -> None:
+    publish('session', _session_state(kernel), session_id)
+
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
-    """Hole System-Statistiken"""
+    """
+    Hole System-Statistiken (Snapshot mit ETag – unverändert → 304).
+    Der Snapshot enthält nur, was /api/events danach ersetzt (Skills,
+    Session-Zustand) – Log-Zeilen und Laufzeit-Zähler ändern ihn nicht.
+    Zähler: /api/stats/runtime; Startpunkt für /api/events im Header X-Event-Seq.
+    """
     try:
         session_id = session.get('session_id')
         kernel = kernels.get(session_id)
         
         if kernel:
-            skills_list = list(kernel.manager.loaded_tools.keys())
-            return jsonify({
-                'provider': kernel.provider_name,
+            body = {
+                **_session_state(kernel),
                 'skills': len(kernel.manager.loaded_tools),
-                'skills_list': sorted(skills_list),  # Liste aller Skills
-                'history': len(kernel.chat_history),
-                'state': kernel.state.name  # GEFIXED: state statt agent_state
-            })
-        
+                'skills_list': _skills_list(kernel.manager),  # Liste aller Skills
+                'registry_version': kernel.manager.registry_version,
+            }
+        else:
+            registry = get_skill_registry()
+            body = {
+                'provider': 'none',
+                'skills': len(registry.loaded_tools),
+                'skills_list': _skills_list(registry),
+                'history': 0,
+                'state': 'IDLE',
+                'registry_version': registry.registry_version,
+            }
+
+        response = jsonify(body)
+        response.set_etag(hashlib.sha1(response.get_data()).hexdigest())
+        response.headers['X-Event-Seq'] = str(get_event_bus().seq)   # auch bei 304 aktuell
+        return response.make_conditional(request)
+    except Exception as e:
+        logger.error(f"Stats error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/stats/runtime', methods=['GET'])
+def get_runtime_stats():
+    """Laufzeit-Zähler (ändern sich ständig – ohne ETag): Gedächtnis, Sessions, Admission."""
+    try:
         return jsonify({
-            'provider': 'none',
-            'skills': 0,
-            'skills_list': [],
-            'history': 0,
-            'state': 'IDLE'
+            'memory':    get_memory_service().stats(),
+            'documents': get_document_store().stats(),
+            'sessions':  kernels.stats(),
+            'admission': admission.stats(),
+            'streams':   stream_slots.stats(),
+            'events':    get_event_bus().seq,
         })
     except Exception as e:
-        logger.error(f"Stats error: {e}")
+        logger.error(f"Runtime stats error: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events für das Dashboard: skills, goals, session, job
+    (Log-Zeilen: /api/log/stream).
+    ?topics=skills,session schränkt ein; Session-Events nur für die eigene Session.
+    "resync" (verpasste Events) kommt immer – der Client lädt dann /api/stats neu.
+    """
+    bus        = get_event_bus()
+    session_id = session.get('session_id')
+    topics     = set(filter(None, request.args.get('topics', '').split(','))) or None
+    since      = int(request.headers.get('Last-Event-ID') or request.args.get('since', bus.seq))
+
+    def stream():
+        last = since
+        yield "retry: 3000\n\n"
+        while True:
+            events = bus.wait(last, timeout=15)
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for seq, topic, data, owner in events:
+                last = seq
+                if topics and topic not in topics and topic != RESYNC:
+                    continue
+                if owner is not None and owner != session_id:
+                    continue
+                yield f"id: {seq}\nevent: {topic}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+    return _sse_response(stream())
+
+
 @app.route('/api/debug/skills', methods=['GET'])
 def debug_skills():
-    """Debug: Zeige alle geladenen Skills"""
+    """
+    Debug: geladene Skills, seitenweise (?offset=&limit=) mit gekürzter
+    Beschreibung; ?full=1 liefert die vollständigen Docstrings,
+    /api/debug/skills/<name> einen einzelnen Skill.
+    """
     try:
-        session_id = session.get('session_id')
-        kernel = kernels.get(session_id)
-        
-        if kernel:
-            skills = {}
-            for name, func in kernel.manager.loaded_tools.items():
-                skills[name] = {
-                    'name': name,
-                    'doc': func.__doc__ or 'Keine Beschreibung',
-                    'file': func.__code__.co_filename if hasattr(func, '__code__') else 'unknown'
-                }
-            
-            return jsonify({
-                'total': len(skills),
-                'skills': skills,
-                'skills_directory': os.path.abspath('skills')
-            })
-        
-        return jsonify({'error': 'Kein Kernel gefunden'}), 404
+        manager = get_skill_registry()
+        tools   = manager.loaded_tools
+        full    = request.args.get('full', '').lower() in ('1', 'true')
+        names, page = paginate(sorted(tools), *page_args(request.args))
+
+        skills = {}
+        for name in names:
+            func = tools[name]
+            doc  = func.__doc__ or 'Keine Beschreibung'
+            skills[name] = {
+                'name': name,
+                'doc': doc if full else trim(doc.strip().split('\n\n')[0], 200),
+                'file': func.__code__.co_filename if hasattr(func, '__code__') else 'unknown',
+                'url': f'/api/debug/skills/{name}',
+            }
+
+        return jsonify(select_fields({
+            'total': len(tools),
+            'page': page,
+            'skills': skills,
+            'skills_directory': os.path.abspath(manager.skills_dir),
+            'registry_version': manager.registry_version,
+        }, request.args.get('fields')))
     except Exception as e:
         logger.error(f"Debug error: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/debug/skills/<name>', methods=['GET'])
+def debug_skill(name):
+    """Debug: ein Skill mit vollständigem Docstring und Signatur."""
+    manager = get_skill_registry()
+    func    = manager.loaded_tools.get(name)
+    if not func:
+        return jsonify({'error': 'Skill nicht gefunden'}), 404
+    return jsonify({
+        'name': name,
+        'doc': func.__doc__ or 'Keine Beschreibung',
+        'file': func.__code__.co_filename if hasattr(func, '__code__') else 'unknown',
+        **(manager.get_skill_info(name) or {}),
+    })
+
+
+@app.route('/api/artifact/<handle>', methods=['GET'])
+def get_artifact(handle):
+    """Vollständiger Text zu einem Artefakt-Link (inhaltsadressiert → unveränderlich)."""
+    text = get_artifact_store().get(handle)
+    if text is None:
+        return jsonify({'error': 'Artefakt nicht gefunden'}), 404
+    return Response(text, mimetype='text/plain',
+                    headers={'Cache-Control': 'public, max-age=31536000, immutable'})
+
+
+def _job_event_stream(job) -> Response:
+    """SSE-Antwort für einen Job mit wait_events() (Goal-, Audio-Jobs)."""
+    since = int(request.headers.get('Last-Event-ID') or request.args.get('since', 0))
+
+    def stream():
+        last = since
+        yield "retry: 3000\n\n"   # sofort senden – Header gehen raus, Client ist verbunden
+        while True:
+            events = job.wait_events(last, timeout=15)
+            if not events:
+                if job.finished:
+                    break
+                yield ": keepalive\n\n"
+                continue
+            for seq, kind, data in events:
+                last = seq
+                if kind == 'step':
+                    data = history_entry(data)
+                yield f"id: {seq}\nevent: {kind}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+        yield "event: end\ndata: {}\n\n"
+
+    return _sse_response(stream())
+
+
 @app.route('/api/goal', methods=['POST'])
 def run_goal():
     """
-    Autonomy Loop Endpoint.
-    Startet einen vollständigen Goal→Plan→Execute→Evaluate-Zyklus.
+    Autonomy Loop als Hintergrund-Job.
+    Startet einen Goal→Plan→Execute→Evaluate-Zyklus und antwortet sofort (202).
     POST body: { "goal": "Erstelle eine Python-Datei mit den ersten 10 Primzahlen" }
+    Fortschritt: /api/goal/<job_id>/events (SSE), Ergebnis: /api/goal/<job_id>/result
     """
     try:
-        data    = request.json
+        data    = request.json or {}
         goal    = data.get('goal', '').strip()
         provider = data.get('provider', 'auto')
 
         if not goal:
             return jsonify({'error': 'Kein Ziel angegeben'}), 400
+        try:
+            max_iterations = int(data.get('max_iterations', MAX_ITERATIONS))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'max_iterations muss eine ganze Zahl sein'}), 400
+        max_iterations = max(1, min(max_iterations, MAX_GOAL_ITERATIONS))
 
         session_id = session.get('session_id', secrets.token_hex(8))
         session['session_id'] = session_id
         kernel = get_kernel(session_id, provider)
 
-        logger.info(f"Autonomy Loop gestartet – Ziel: {goal}")
-
-        loop = AutonomyLoop(kernel, max_iterations=10, verbose=False)
-        goal_session = loop.run(goal)
-
-        # Ergebnis in Chat-History übernehmen
-        kernel.chat_history.append({'role': 'user',      'content': f"[Autonomy Loop] {goal}"})
-        kernel.chat_history.append({'role': 'assistant', 'content': goal_session.final_summary or ""})
-
+        job = get_goal_jobs().submit(kernel, goal, session_id=session_id,
+                                     max_iterations=max_iterations)
         return jsonify({
-            'status':      goal_session.status.value,
-            'goal':        goal_session.goal,
-            'summary':     goal_session.final_summary,
-            'iterations':  goal_session.iteration,
-            'steps_total': len(goal_session.plan),
-            'steps_done':  sum(1 for s in goal_session.plan
-                               if s.status.value == 'done'),
-            'history':     goal_session.history,
-            'provider':    kernel.provider_name,
-        })
-
+            'job_id':     job.id,
+            'status':     job.status,
+            'status_url': f'/api/goal/{job.id}',
+            'events_url': f'/api/goal/{job.id}/events',
+            'result_url': f'/api/goal/{job.id}/result',
+        }), 202
+
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '30'}
+    except Saturated as e:
+        return _too_busy(e)
     except Exception as e:
         logger.error(f"Goal endpoint error: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
@@ -251,103 +482,162 @@ def run_goal():
 
 @app.route('/api/goal/status', methods=['GET'])
 def goal_status():
-    """Gibt den aktuellen Loop-Status zurück (für Polling im Frontend)."""
+    """Status des letzten Jobs dieser Session (für Polling im Frontend)."""
     try:
-        session_id = session.get('session_id')
-        kernel = kernels.get(session_id)
-        if kernel and hasattr(kernel, 'autonomy_loop'):
-            return jsonify(kernel.autonomy_loop.get_status_dict())
+        job = get_goal_jobs().latest_for_session(session.get('session_id'))
+        if job:
+            return jsonify(select_fields(job.status_dict(), request.args.get('fields')))
         return jsonify({'status': 'idle', 'goal': None})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/goal/<job_id>', methods=['GET'])
+def goal_job_status(job_id):
+    job = get_goal_jobs().get(job_id)
+    if not job:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    return jsonify(select_fields(job.status_dict(), request.args.get('fields')))
+
+
+@app.route('/api/goal/<job_id>/result', methods=['GET'])
+def goal_job_result(job_id):
+    """
+    Ergebnis eines Goal-Jobs. History seitenweise (?offset=&limit=), lange
+    Parameter gekürzt, volle Schritt-Ergebnisse über artifact_url.
+    ?fields=status,result.summary wählt einzelne Felder.
+    """
+    job = get_goal_jobs().get(job_id)
+    if not job:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    if not job.finished:
+        return jsonify(job.status_dict()), 202
+    result = dict(job.result or {})
+    if 'history' in result:
+        steps, page = paginate(result['history'], *page_args(request.args))
+        result['history']      = [history_entry(step) for step in steps]
+        result['history_page'] = page
+    return jsonify(select_fields({**job.status_dict(), 'result': result}, request.args.get('fields')))
+
+
+@app.route('/api/goal/<job_id>/cancel', methods=['POST'])
+def goal_job_cancel(job_id):
+    job = get_goal_jobs().cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    return jsonify(job.status_dict())
+
+
+@app.route('/api/goal/<job_id>/events', methods=['GET'])
+def goal_job_events(job_id):
+    """Server-Sent Events: plan, step, evaluation, status, finished."""
+    job = get_goal_jobs().get(job_id)
+    if not job:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    return _job_event_stream(job)
+
 
 # ─── Neue Endpoints: Reload, Audio-Upload, Datei-Upload ───────
 
 @app.route('/api/reload', methods=['POST'])
 def reload_skills():
-    """Skills neu laden"""
+    """
+    Skills im Hintergrund neu laden (202) – gegen die geteilte Registry,
+    also für alle Sessions. Fortschritt: /api/reload/<reload_id>.
+    """
     try:
-        session_id = session.get('session_id')
-        kernel = kernels.get(session_id)
-        if not kernel:
-            return jsonify({'error': 'Kein aktiver Kernel'}), 400
-        count = kernel.load_skills()
-        skills = list(kernel.manager.loaded_tools.keys())
-        logger.info(f"Skills neu geladen: {count}")
-        return jsonify({'success': True, 'count': count, 'skills': skills})
+        report = get_skill_registry().request_reload()
+        logger.info(f"Skill-Reload {report['id']} angestoßen")
+        return jsonify({
+            'success':    True,
+            'reload_id':  report['id'],
+            'status':     report['status'],
+            'status_url': f"/api/reload/{report['id']}",
+        }), 202
     except Exception as e:
         logger.error(f"Reload error: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/reload/<int:reload_id>', methods=['GET'])
+def reload_status(reload_id):
+    """Status, Ladezeit und Fehler je Modul eines Hintergrund-Reloads."""
+    report = get_skill_registry().reload_status(reload_id)
+    if not report:
+        return jsonify({'error': 'Reload nicht gefunden'}), 404
+    return jsonify(report)
+
+
 @app.route('/api/upload/audio', methods=['POST'])
 def upload_audio():
-    """Sprachnachricht transkribieren und an Kernel senden"""
-    import tempfile, os, warnings
+    """
+    Sprachnachricht einreihen (202) – Transkription und Kernel-Antwort laufen
+    im TranscriptionService. Ergebnis: /api/upload/audio/<job_id>/events (SSE).
+    """
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'Keine Datei'}), 400
         file = request.files['file']
-        suffix = os.path.splitext(file.filename)[1] or '.ogg'
-
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            file.save(tmp.name)
-            tmp_path = tmp.name
-
-        # Transkribieren
-        transcript = ""
-        try:
-            import whisper
-            warnings.filterwarnings("ignore", category=UserWarning, module="whisper")
-            warnings.filterwarnings("ignore", category=UserWarning, module="torch")
-            model = whisper.load_model("base", device="cpu")
-            result = model.transcribe(tmp_path, language="de")
-            transcript = result["text"].strip()
-        except ImportError:
-            openai_key = os.getenv("OPENAI_API_KEY")
-            if openai_key:
-                import openai
-                client = openai.OpenAI(api_key=openai_key)
-                with open(tmp_path, "rb") as f:
-                    result = client.audio.transcriptions.create(
-                        model="whisper-1", file=f, language="de"
-                    )
-                transcript = result.text.strip()
-            else:
-                return jsonify({'error': 'Whisper nicht verfügbar – pip install openai-whisper'}), 500
-        finally:
-            try: os.unlink(tmp_path)
-            except: pass
-
-        if not transcript:
-            return jsonify({'error': 'Transkription leer'}), 400
+        suffix = os.path.splitext(file.filename or '')[1] or '.ogg'
 
-        # An Kernel senden
         session_id = session.get('session_id', secrets.token_hex(8))
         session['session_id'] = session_id
         kernel = get_kernel(session_id)
-        result = kernel.chat(f"[Sprachnachricht transkribiert]: {transcript}")
 
+        def answer(transcript: str) -> dict:
+            # An Kernel senden – Saturated (mit retry_after) beendet den Job im
+            # Status "retry"; das Transkript kann dann per /api/chat nachgereicht werden
+            with admission.admit(kernel.chat_lock):
+                result = kernel.chat(f"[Sprachnachricht transkribiert]: {transcript}")
+            _publish_session(session_id, kernel)
+            return {
+                'response': result.get('response', ''),
+                'intent': result.get('intent', 'UNKNOWN'),
+                'skill': result.get('skill'),
+                'thought': result.get('thought'),
+                'provider': kernel.provider_name
+            }
+
+        job = get_transcription_service().submit(file.read(), suffix, then=answer)
         return jsonify({
-            'transcript': transcript,
-            'response': result.get('response', ''),
-            'intent': result.get('intent', 'UNKNOWN'),
-            'skill': result.get('skill'),
-            'thought': result.get('thought'),
-            'provider': kernel.provider_name
-        })
-
+            'job_id':     job.id,
+            'status':     job.status,
+            'status_url': f'/api/upload/audio/{job.id}',
+            'events_url': f'/api/upload/audio/{job.id}/events',
+        }), 202
+
+    except TranscriptionQueueFull as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '10'}
     except Exception as e:
         logger.error(f"Audio upload error: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/upload/audio/<job_id>', methods=['GET'])
+def audio_job_status(job_id):
+    job = get_transcription_service().get(job_id)
+    if not job:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    return jsonify(job.status_dict())
+
+
+@app.route('/api/upload/audio/<job_id>/events', methods=['GET'])
+def audio_job_events(job_id):
+    """Server-Sent Events: transcript, response, status."""
+    job = get_transcription_service().get(job_id)
+    if not job:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    return _job_event_stream(job)
+
+
 @app.route('/api/upload/file', methods=['POST'])
 def upload_file():
-    """Datei hochladen, Inhalt extrahieren, an Kernel senden"""
-    import tempfile, os
+    """
+    Datei hochladen, streamend extrahieren und in Abschnitte zerlegen, an Kernel senden.
+    Große Dokumente landen abschnittsweise im Gedächtnis; der Kernel holt pro
+    Frage die passenden Abschnitte (Formularfeld index=false schaltet das ab).
+    """
+    import tempfile
     from pathlib import Path
     try:
         if 'file' not in request.files:
@@ -355,6 +645,7 @@ def upload_file():
         file = request.files['file']
         filename = file.filename or 'upload'
         caption = request.form.get('caption', '').strip()
+        index = request.form.get('index', os.getenv('DOCUMENT_INDEX', 'true')).lower() != 'false'
         suffix = Path(filename).suffix.lower()
 
         with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
@@ -362,27 +653,41 @@ def upload_file():
             tmp_path = tmp.name
 
         try:
-            content = _extract_file_content(tmp_path, filename)
+            doc = ingest_document(tmp_path, filename, index=index)
+        except DocumentError as e:
+            return jsonify({'error': str(e)}), 400
         finally:
             try: os.unlink(tmp_path)
             except: pass
 
-        if content.startswith('[') and 'nicht verfügbar' in content:
-            return jsonify({'error': content}), 400
-
         # An Kernel senden
         session_id = session.get('session_id', secrets.token_hex(8))
         session['session_id'] = session_id
         kernel = get_kernel(session_id)
 
+        if doc['complete']:
+            content = doc['preview']
+        else:
+            if doc['indexed']:
+                kernel.add_document(doc['doc_id'], filename)
+            content = (f"{doc['preview']}\n\n[… Dokument hat {doc['chunks']} Abschnitte / {doc['chars']} Zeichen"
+                       + ("; alle Abschnitte sind indiziert, relevante werden je Frage ergänzt]"
+                          if doc['indexed'] else "; nur der Anfang ist enthalten]"))
+
         msg = (f"[Datei: {filename}]\n{content}\n\nAufgabe: {caption}"
                if caption else f"[Datei: {filename}]\nBitte analysiere:\n\n{content}")
 
-        result = kernel.chat(msg)
+        with admission.admit(kernel.chat_lock):
+            result = kernel.chat(msg)
+        _publish_session(session_id, kernel)
 
         return jsonify({
             'filename': filename,
-            'content_preview': content[:200] + '...' if len(content) > 200 else content,
+            'content_preview': doc['preview'][:200] + '...' if len(doc['preview']) > 200 else doc['preview'],
+            'doc_id': doc['doc_id'],
+            'chunks': doc['chunks'],
+            'chars': doc['chars'],
+            'indexed': doc['indexed'],
             'response': result.get('response', ''),
             'intent': result.get('intent', 'UNKNOWN'),
             'skill': result.get('skill'),
@@ -390,61 +695,60 @@ def upload_file():
             'provider': kernel.provider_name
         })
 
+    except Saturated as e:
+        return _too_busy(e)
     except Exception as e:
         logger.error(f"File upload error: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
-def _extract_file_content(file_path: str, filename: str) -> str:
-    """Textextraktion aus PDF, Word, Text und Codedateien."""
-    from pathlib import Path
-    suffix = Path(filename).suffix.lower()
-    try:
-        if suffix == '.pdf':
-            try:
-                import PyPDF2
-                with open(file_path, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
-                    text = '\n'.join(page.extract_text() or '' for page in reader.pages)
-                return text[:8000] if text.strip() else '[PDF enthält keinen lesbaren Text]'
-            except ImportError:
-                try:
-                    import pdfplumber
-                    with pdfplumber.open(file_path) as pdf:
-                        text = '\n'.join(page.extract_text() or '' for page in pdf.pages)
-                    return text[:8000]
-                except ImportError:
-                    return '[PDF-Extraktion nicht verfügbar – pip install PyPDF2]'
-        elif suffix in ('.docx', '.doc'):
-            try:
-                import docx
-                doc = docx.Document(file_path)
-                return '\n'.join(p.text for p in doc.paragraphs)[:8000]
-            except ImportError:
-                return '[Word-Extraktion nicht verfügbar – pip install python-docx]'
-        elif suffix in ('.txt', '.md', '.py', '.js', '.ts', '.json', '.csv',
-                        '.xml', '.html', '.yaml', '.yml', '.sh', '.ini'):
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                return f.read(8000)
-        else:
-            return f"[Dateityp '{suffix}' nicht direkt lesbar – unterstützt: PDF, DOCX, TXT, MD, PY, JSON, CSV]"
-    except Exception as e:
-        return f'[Extraktion fehlgeschlagen: {e}]'
-
+def _log_file() -> Optional[str]:
+    for path in (LOG_FILE, "logs/ilija_full_autonomy.log"):
+        if os.path.exists(path):
+            return path
+    return None
 
 
-@app.route("/api/log")
+@app.route('/api/log', methods=['GET'])
 def get_log():
+    """
+    Letzte Log-Zeilen (vom Dateiende gelesen).
+    ?offset=N liefert nur Zeilen ab Byte N – den neuen Offset führt der Client mit.
+    """
     try:
-        lines = []
-        logfile = "/ilija/logs/ilija_full_autonomy.log"
-        if os.path.exists(logfile):
-            with open(logfile, "r") as f:
-                lines = f.readlines()[-60:]
-        return jsonify({"lines": [l.strip() for l in lines]})
+        logfile = _log_file()
+        if not logfile:
+            return jsonify({"lines": [], "offset": 0})
+        count = min(int(request.args.get('lines', 60)), 500)
+        if request.args.get('offset') is None:
+            lines, offset = tail_lines(logfile, count)
+            return jsonify({"lines": lines, "offset": offset})
+        lines, offset, reset = read_from(logfile, int(request.args['offset']), count)
+        return jsonify({"lines": lines, "offset": offset, "reset": reset})
     except Exception as e:
         return jsonify({"lines": [], "error": str(e)})
 
+
+@app.route('/api/log/stream', methods=['GET'])
+def stream_log():
+    """Server-Sent Events: neue Log-Zeilen direkt aus dem Logging-Handler."""
+    since = int(request.headers.get('Last-Event-ID') or request.args.get('since', log_broadcaster.seq))
+
+    def stream():
+        last = since
+        yield "retry: 3000\n\n"   # sofort senden – Header gehen raus, Client ist verbunden
+        while True:
+            lines = log_broadcaster.wait(last, timeout=15)
+            if not lines:
+                yield ": keepalive\n\n"
+                continue
+            for seq, line in lines:
+                last = seq
+                yield f"id: {seq}\nevent: log\ndata: {json.dumps(line, ensure_ascii=False)}\n\n"
+
+    return _sse_response(stream())
+
+
 if __name__ == '__main__':
     print("╔═══════════════════════════════════════════════════════╗")
     print("║   Offenes Leuchten v5.0 - Web Edition               ║")
@@ -505,10 +809,5 @@ if __name__ == '__main__':
     print("Zum Beenden: Ctrl+C")
     print()
     
-    # Starte Server (erreichbar im Netzwerk)
-    app.run(
-        host='0.0.0.0',  # Erreichbar im Netzwerk
-        port=5000,
-        debug=False,
-        threaded=True
-    )
+    # Starte Server (erreichbar im Netzwerk; waitress wenn installiert)
+    serve(app, host='0.0.0.0', port=5000)
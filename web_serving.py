@@ -0,0 +1,103 @@
+"""
+Ilija Full_Autonomy_Edition – Web Serving
+==========================================
+Startet das Web-Interface mit einem produktionstauglichen Server.
+
+Bisher lief Flasks Entwicklungs-Server (app.run) in einem Daemon-Thread –
+ohne Worker-Verwaltung, ohne Verbindungsgrenze, ohne Timeouts.
+
+Modi (WEB_SERVER):
+  waitress  → Standard wenn installiert. Multi-Threaded WSGI-Server im
+              selben Prozess: alle Worker-Threads teilen Sessions,
+              Skill-Registry, Provider-Pool und Job-Queues des Orchestrators.
+              Begrenzung über WEB_THREADS / WEB_CONNECTION_LIMIT,
+              Verbindungs-Timeout über WEB_CHANNEL_TIMEOUT.
+  dev       → Flask-Entwicklungs-Server (Fallback ohne waitress)
+
+SSE-Streams (/api/events, /api/log/stream, Job-Events) belegen je einen
+Worker-Thread für ihre ganze Lebensdauer; die Keepalives verhindern, dass
+WEB_CHANNEL_TIMEOUT sie schließt. StreamSlots begrenzt sie daher auf
+WEB_MAX_STREAMS (Standard: halbe Thread-Zahl) – darüber 503 mit Retry-After,
+das Dashboard fällt dann auf Polling zurück. Zusätzlich endet jeder Stream
+nach STREAM_MAX_SECONDS; EventSource verbindet sich mit Last-Event-ID neu.
+
+Mehrere Prozesse (z.B. gunicorn --workers 4) sind bewusst nicht der
+Standard: Sessions, Goal-Jobs und Log-Stream liegen im Speicher des
+Prozesses. Für einen separaten Web-Prozess daher:
+  gunicorn -k gthread --workers 1 --threads 16 --timeout 120 web_server:app
+"""
+
+import logging
+import os
+import threading
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+THREADS          = 16     # parallele Requests (SSE-Streams belegen je einen Thread)
+CONNECTION_LIMIT = 200    # darüber nimmt der Server keine Verbindungen mehr an
+CHANNEL_TIMEOUT  = 120    # Sekunden Inaktivität bis eine Verbindung geschlossen wird
+STREAM_MAX_SECONDS = 300  # danach endet ein SSE-Stream (Client verbindet neu)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class StreamSlots:
+    """Obergrenze für gleichzeitig offene SSE-Streams (je einer belegt einen Worker-Thread)."""
+
+    def __init__(self, limit: int):
+        self.limit    = max(1, limit)
+        self.active   = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.active >= self.limit:
+                self.rejected += 1
+                return False
+            self.active += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.active = max(0, self.active - 1)
+
+    def stats(self) -> Dict:
+        return {"active": self.active, "limit": self.limit, "rejected": self.rejected}
+
+
+def stream_slots_from_env() -> StreamSlots:
+    """WEB_MAX_STREAMS, sonst halbe Thread-Zahl – es bleiben immer Threads für /api/chat."""
+    threads = _env_int("WEB_THREADS", THREADS)
+    return StreamSlots(min(_env_int("WEB_MAX_STREAMS", threads // 2), threads - 1))
+
+
+def serve(app, host: str = "0.0.0.0", port: int = 5000, mode: str = None) -> None:
+    """Blockiert bis der Server beendet wird."""
+    mode = (mode or os.getenv("WEB_SERVER", "waitress")).lower()
+    if mode == "waitress":
+        try:
+            from waitress import serve as waitress_serve
+        except ImportError:
+            logger.warning("waitress nicht installiert – Fallback auf Flask-Dev-Server (pip install waitress)")
+            mode = "dev"
+        else:
+            threads = _env_int("WEB_THREADS", THREADS)
+            logger.info(f"Web-Server: waitress auf {host}:{port} ({threads} Threads)")
+            waitress_serve(
+                app, host=host, port=port,
+                threads=threads,
+                connection_limit=_env_int("WEB_CONNECTION_LIMIT", CONNECTION_LIMIT),
+                channel_timeout=_env_int("WEB_CHANNEL_TIMEOUT", CHANNEL_TIMEOUT),
+                ident="ilija",
+            )
+            return
+
+    logger.info(f"Web-Server: Flask-Dev-Server auf {host}:{port}")
+    app.run(host=host, port=port, debug=False, threaded=True)